@@ -0,0 +1,6 @@
+"""
+Circle detection and roundness measurement for machined parts.
+
+The modules are imported on use rather than here, so the command line tools
+only load what they need.
+"""
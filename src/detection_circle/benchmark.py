@@ -0,0 +1,334 @@
+import os
+import sys
+import json
+import glob
+import time
+import shutil
+import argparse
+import platform
+import tempfile
+import numpy as np
+import cv2
+from .image_processor import ImageProcessor
+from .contour_processor import ContourProcessor
+from .circle_detector import CircleDetector
+from .roundness_calculator import RoundnessCalculator, METHOD_NAMES
+from .visualizer import Visualizer
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Stages timed for every image, in pipeline order
+STAGES = (('load_image', 'preprocess', 'detect_edges', 'extract_contours', 'filter_contours',
+           'detect_circles', 'single_line_processing')
+          + tuple(f'roundness_{method}' for method in METHOD_NAMES)
+          + ('roundness_all', 'render', 'encode'))
+
+class Benchmark:
+    """
+    Class for timing every stage of the pipeline over a set of images.
+
+    Each image is processed once untimed to warm up caches and lazy imports,
+    then `repeat` times with each stage timed separately. Roundness stages
+    cover all parts of an image, so their timings are per image. The stage
+    runs time every roundness method; throughput is measured on separate
+    end-to-end passes that measure with the configured method only, as a
+    production run does.
+    """
+
+    def __init__(self, repeat=5, min_area=100, min_perimeter=100, method='min_zone'):
+        """
+        Initialize the benchmark.
+
+        Args:
+            repeat (int): Number of timed runs per image.
+            min_area (float): Minimum contour area passed to filter_contours.
+            min_perimeter (float): Minimum contour perimeter passed to filter_contours.
+            method (str): Roundness method of the end-to-end passes (a key of
+                METHOD_NAMES), or 'all'.
+        """
+        if method not in METHOD_NAMES and method != 'all':
+            raise ValueError(f"Unknown roundness method: {method}")
+        self.repeat = repeat
+        self.min_area = min_area
+        self.min_perimeter = min_perimeter
+        self.method = method
+        self.image_processor = ImageProcessor()
+        self.contour_processor = ContourProcessor()
+        self.circle_detector = CircleDetector()
+        self.roundness_calculator = RoundnessCalculator()
+        self.visualizer = Visualizer()
+
+    def run_image(self, image_path):
+        """
+        Run the pipeline once on an image, timing each stage.
+
+        Args:
+            image_path (str): Path to the image.
+
+        Returns:
+            dict: Seconds spent in each stage, keyed by stage name.
+        """
+        timings = {}
+
+        def timed(stage, function, *args):
+            start = time.perf_counter()
+            result = function(*args)
+            timings[stage] = time.perf_counter() - start
+            return result
+
+        self._process(image_path, list(METHOD_NAMES) + ['all'], timed)
+        return timings
+
+    def run_pass(self, image_path):
+        """
+        Run the pipeline once on an image with the configured method only.
+
+        Args:
+            image_path (str): Path to the image.
+
+        Returns:
+            float: Seconds for the whole pass.
+        """
+        start = time.perf_counter()
+        self._process(image_path, [self.method], lambda stage, function, *args: function(*args))
+        return time.perf_counter() - start
+
+    def _process(self, image_path, methods, timed):
+        """Run the pipeline stages through timed(stage, function, *args), measuring each of the methods."""
+        image = timed('load_image', self.image_processor.load_image, image_path)
+        processed_image = timed('preprocess', self.image_processor.preprocess, image)
+        edges = timed('detect_edges', self.image_processor.detect_edges, processed_image)
+        contours = timed('extract_contours', self.image_processor.extract_contours, edges)
+        filtered_contours = timed('filter_contours', self.contour_processor.filter_contours,
+                                  contours, self.min_area, self.min_perimeter)
+        detections = timed('detect_circles', self.circle_detector.detect, filtered_contours)
+
+        points = timed('single_line_processing', lambda: [
+            self.contour_processor.single_line_processing(detection.contour) for detection in detections])
+        for method in methods:
+            results = timed(f'roundness_{method}', lambda: [
+                self.roundness_calculator.measure(part, method) for part in points])
+
+        measurements = []
+        for i, measurement in enumerate(results):
+            for method, (inner_circle, outer_circle, roundness) in measurement.items():
+                measurements.append((inner_circle, outer_circle, f"#{i} {method}: {roundness:.2f}"))
+        canvas = timed('render', self.visualizer.render_overlay, image, filtered_contours,
+                       [detection.circle for detection in detections], measurements)
+        timed('encode', cv2.imencode, '.jpg', canvas)
+
+    def run(self, image_paths):
+        """
+        Time every stage over a set of images.
+
+        Args:
+            image_paths (list): Paths of the images.
+
+        Returns:
+            dict: Per-stage statistics in milliseconds, the method and throughput of
+                the end-to-end passes, and peak memory.
+        """
+        samples = {stage: [] for stage in STAGES}
+        totals = []
+        for image_path in image_paths:
+            self.run_image(image_path)
+            for _ in range(self.repeat):
+                timings = self.run_image(image_path)
+                for stage, seconds in timings.items():
+                    samples[stage].append(seconds)
+            for _ in range(self.repeat):
+                totals.append(self.run_pass(image_path))
+
+        stages = {}
+        for stage, values in samples.items():
+            values = np.asarray(values) * 1000
+            stages[stage] = {
+                'median_ms': float(np.median(values)),
+                'p95_ms': float(np.percentile(values, 95)),
+                'mean_ms': float(np.mean(values)),
+                'samples': len(values),
+            }
+        return {
+            'environment': environment(),
+            'images': [os.path.basename(path) for path in image_paths],
+            'repeat': self.repeat,
+            'stages': stages,
+            'method': self.method,
+            'images_per_sec': len(totals) / sum(totals) if totals else 0.0,
+            'peak_rss_mb': peak_rss_mb(),
+        }
+
+def environment():
+    """
+    Describe the machine and library versions, to tell whether two results are comparable.
+
+    Returns:
+        dict: Platform, CPU count, thread count and versions.
+    """
+    return {
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'cpu_count': os.cpu_count(),
+        'opencv_threads': cv2.getNumThreads(),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'opencv': cv2.__version__,
+    }
+
+def peak_rss_mb():
+    """
+    Get the peak resident set size of this process.
+
+    Returns:
+        float: Peak RSS in megabytes, or None where it is not available.
+    """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in kilobytes elsewhere
+    return peak / (1 << 20) if sys.platform == 'darwin' else peak / 1024
+
+def synthetic_images(output_dir, count=4, size=(2048, 2048), parts=12, seed=0):
+    """
+    Write reproducible synthetic plates of slightly out-of-round parts.
+
+    Args:
+        output_dir (str): Directory to write the images to.
+        count (int): Number of images.
+        size (tuple): Image height and width.
+        parts (int): Number of parts per image.
+        seed (int): Seed of the random generator.
+
+    Returns:
+        list: Paths of the images.
+    """
+    rng = np.random.default_rng(seed)
+    height, width = size
+    cells = int(np.ceil(np.sqrt(parts)))
+    cell_size = min(height, width) // cells
+    paths = []
+    for k in range(count):
+        image = np.full((height, width, 3), 40, dtype=np.uint8)
+        for part in range(parts):
+            row, column = divmod(part, cells)
+            center = ((column + 0.5) * cell_size, (row + 0.5) * cell_size)
+            radius = cell_size * rng.uniform(0.25, 0.4)
+            # Radius with a few lobes of small amplitude
+            angles = np.linspace(0, 2 * np.pi, 720, endpoint=False)
+            lobes = rng.integers(2, 6)
+            radii = radius * (1 + rng.uniform(0.005, 0.02) * np.cos(lobes * angles + rng.uniform(0, 2 * np.pi)))
+            polygon = np.stack([center[0] + radii * np.cos(angles), center[1] + radii * np.sin(angles)], axis=1)
+            cv2.fillPoly(image, [np.round(polygon).astype(np.int32)], (200, 200, 200))
+        noise = rng.normal(0, 6, image.shape)
+        image = np.clip(image + noise, 0, 255).astype(np.uint8)
+        path = os.path.join(output_dir, f'synthetic_{k}.jpg')
+        cv2.imwrite(path, image)
+        paths.append(path)
+    return paths
+
+def compare(results, baseline, threshold=0.2, min_delta_ms=0.1):
+    """
+    Compare results against a baseline and list the regressions.
+
+    A stage regresses when its median time grows by more than `threshold`
+    (relative) and `min_delta_ms` (absolute, so that noise on stages that
+    take microseconds is not flagged). Throughput and peak memory regress
+    when they get worse by more than `threshold`; throughput is only
+    compared if both were measured with the same roundness method.
+
+    Args:
+        results (dict): Results from Benchmark.run().
+        baseline (dict): Earlier results.
+        threshold (float): Allowed relative slowdown.
+        min_delta_ms (float): Allowed absolute slowdown of a stage median.
+
+    Returns:
+        list: One message per regression.
+    """
+    regressions = []
+    for stage, stats in results['stages'].items():
+        if stage not in baseline.get('stages', {}):
+            continue
+        current = stats['median_ms']
+        previous = baseline['stages'][stage]['median_ms']
+        if current > previous * (1 + threshold) and current - previous > min_delta_ms:
+            regressions.append(f"{stage}: median {previous:.3f} ms -> {current:.3f} ms "
+                               f"(+{(current / previous - 1) * 100:.0f}%)")
+
+    if (baseline.get('images_per_sec') and baseline.get('method') == results.get('method')
+            and results['images_per_sec'] < baseline['images_per_sec'] / (1 + threshold)):
+        regressions.append(f"images_per_sec: {baseline['images_per_sec']:.2f} -> {results['images_per_sec']:.2f}")
+    if (baseline.get('peak_rss_mb') and results['peak_rss_mb']
+            and results['peak_rss_mb'] > baseline['peak_rss_mb'] * (1 + threshold)):
+        regressions.append(f"peak_rss_mb: {baseline['peak_rss_mb']:.1f} -> {results['peak_rss_mb']:.1f}")
+    return regressions
+
+def parse_args(argv=None):
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description='Benchmark every stage of the circle detection pipeline')
+    parser.add_argument('--dataset', type=str, default='dataset',
+                        help='Directory of .jpg images to benchmark (skipped if missing)')
+    parser.add_argument('--synthetic', type=int, default=4,
+                        help='Number of synthetic 2048x2048 plates to add to the dataset images')
+    parser.add_argument('--repeat', type=int, default=5, help='Timed runs per image')
+    parser.add_argument('--method', type=str, default='min_zone', choices=list(METHOD_NAMES) + ['all'],
+                        help='Roundness method of the end-to-end passes that measure throughput')
+    parser.add_argument('--threads', type=int, default=None,
+                        help='OpenCV threads; fixing it makes results comparable across machines')
+    parser.add_argument('--output', type=str, default=None, help='JSON file to write the results to')
+    parser.add_argument('--baseline', type=str, default=None,
+                        help='JSON results of an earlier run to compare against')
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help='Relative slowdown beyond which a stage is flagged as a regression')
+    parser.add_argument('--min_delta_ms', type=float, default=0.1,
+                        help='Absolute slowdown of a stage median below which it is never flagged')
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    """
+    Run the benchmark and print the results as JSON.
+
+    Returns:
+        int: 1 if a regression against the baseline was found, otherwise 0.
+    """
+    args = parse_args(argv)
+    if args.threads is not None:
+        cv2.setNumThreads(args.threads)
+
+    image_paths = sorted(glob.glob(os.path.join(args.dataset, '*.jpg')))
+    synthetic_dir = tempfile.mkdtemp(prefix='benchmark_')
+    try:
+        image_paths += synthetic_images(synthetic_dir, args.synthetic)
+        if not image_paths:
+            print("No images to benchmark", file=sys.stderr)
+            return 1
+        results = Benchmark(args.repeat, method=args.method).run(image_paths)
+    finally:
+        shutil.rmtree(synthetic_dir)
+
+    status = 0
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if baseline.get('images') != results['images']:
+            print("Warning: the baseline was measured on different images", file=sys.stderr)
+        if baseline.get('method') != results['method']:
+            print("Warning: the baseline throughput was measured with another method; it is not compared",
+                  file=sys.stderr)
+        results['regressions'] = compare(results, baseline, args.threshold, args.min_delta_ms)
+        for regression in results['regressions']:
+            print(f"Regression: {regression}", file=sys.stderr)
+        status = 1 if results['regressions'] else 0
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output + '\n')
+    print(output)
+    return status
+
+if __name__ == "__main__":
+    sys.exit(main())
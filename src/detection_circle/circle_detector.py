@@ -0,0 +1,227 @@
+import cv2
+import numpy as np
+from .contour_batch import ContourBatch
+
+class Detection:
+    """
+    A circle detected from a contour, together with the contour it came from.
+    """
+    
+    def __init__(self, contour_index, contour, circle, centroid, area, perimeter):
+        """
+        Initialize the detection.
+        
+        Args:
+            contour_index (int): Index of the contour in the list passed to the detector.
+            contour (numpy.ndarray): The contour the circle was fitted to.
+            circle (tuple): Fitted circle (center_x, center_y, radius).
+            centroid (tuple): Mean of the contour points (x, y).
+            area (float): Contour area.
+            perimeter (float): Contour perimeter.
+        """
+        self.contour_index = contour_index
+        self.contour = contour
+        self.circle = circle
+        self.centroid = centroid
+        self.area = area
+        self.perimeter = perimeter
+
+class CircleDetector:
+    """
+    Class for detecting circles from contours.
+    """
+    
+    # Minimum circularity of the contours passed to detect(), see ContourProcessor.filter_contours
+    CONTOUR_CIRCULARITY = 0.7
+    # Default circularity above which detect() fits a contour as a circle
+    CIRCULARITY = 0.8
+    
+    def detect_circles(self, contours):
+        """
+        Detect circles from contours.
+        
+        Args:
+            contours (list): List of contours.
+            
+        Returns:
+            list: List of detected circles, each represented as (center_x, center_y, radius).
+        """
+        return [detection.circle for detection in self.detect(contours)]
+    
+    def detect(self, contours, circularity_threshold=CIRCULARITY):
+        """
+        Detect circles from contours, keeping track of the contour of each circle.
+        
+        Args:
+            contours (list or ContourBatch): Contours; the area, perimeter and
+                centroid of a batch are reused rather than computed again.
+            circularity_threshold (float): Threshold for circularity (0 to 1).
+            
+        Returns:
+            list: List of Detection objects, in contour order.
+        """
+        batch = ContourBatch.from_contours(contours)
+        indices = np.flatnonzero(batch.circularities > circularity_threshold)
+        candidates = batch.select(indices)
+        
+        # Fit circles to all circular contours at once
+        points, offsets = candidates.flatten()
+        centers, radii = self.fit_circles_batch(points, offsets)
+        
+        detections = []
+        for k, i in enumerate(indices):
+            center, centroid = centers[k], candidates.centroids[k]
+            detections.append(Detection(int(i), contours[i], (center[0], center[1], radii[k]),
+                                        (centroid[0], centroid[1]),
+                                        float(candidates.areas[k]), float(candidates.perimeters[k])))
+        
+        return detections
+    
+    def fit_circles_batch(self, points, offsets):
+        """
+        Fit circles to many point segments at once using least squares.
+        
+        Solves the same algebraic fit as fit_circle for every segment: the
+        normal equations are accumulated with segmented reductions and all
+        3x3 systems are solved in a single batched call. Segments with fewer
+        than three points or collinear points fall back to OpenCV's
+        minEnclosingCircle.
+        
+        Args:
+            points (numpy.ndarray): Flat array of points (N, 2).
+            offsets (numpy.ndarray): Segment boundaries (K + 1,), with offsets[0] == 0
+                and offsets[-1] == N.
+            
+        Returns:
+            tuple: Centers (K, 2) and radii (K,).
+        """
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        offsets = np.asarray(offsets, dtype=np.intp)
+        counts = np.diff(offsets)
+        if np.any(counts <= 0):
+            raise ValueError("Segments must not be empty")
+        if len(counts) == 0:
+            return np.empty((0, 2)), np.empty(0)
+        starts = offsets[:-1]
+        
+        # Shift every segment to its own mean for better precision
+        means = np.add.reduceat(points, starts, axis=0) / counts[:, None]
+        shifted = points - np.repeat(means, counts, axis=0)
+        x = shifted[:, 0]
+        y = shifted[:, 1]
+        z = x * x + y * y
+        
+        # Normal equations of [2x, 2y, 1] . (a, b, c) = x^2 + y^2 per segment
+        sums = np.add.reduceat(np.column_stack((x * x, x * y, y * y, x, y, x * z, y * z, z)),
+                               starts, axis=0)
+        sxx, sxy, syy, sx, sy, sxz, syz, sz = sums.T
+        n = counts.astype(np.float64)
+        M = np.empty((len(counts), 3, 3))
+        M[:, 0, 0] = 4 * sxx
+        M[:, 0, 1] = M[:, 1, 0] = 4 * sxy
+        M[:, 1, 1] = 4 * syy
+        M[:, 0, 2] = M[:, 2, 0] = 2 * sx
+        M[:, 1, 2] = M[:, 2, 1] = 2 * sy
+        M[:, 2, 2] = n
+        rhs = np.column_stack((2 * sxz, 2 * syz, sz))
+        
+        # Collinear or tiny segments have a (near) singular scatter matrix
+        scatter_det = sxx * syy - sxy * sxy
+        degenerate = (counts < 3) | (scatter_det <= 1e-12 * np.maximum(sxx * syy, 1e-300))
+        M[degenerate] = np.eye(3)
+        
+        solution = np.linalg.solve(M, rhs[:, :, None])[:, :, 0]
+        centers = means + solution[:, :2]
+        radii_sq = solution[:, 0]**2 + solution[:, 1]**2 + solution[:, 2]
+        degenerate |= ~(radii_sq > 0)
+        radii = np.sqrt(np.where(degenerate, 0, radii_sq))
+        
+        for i in np.flatnonzero(degenerate):
+            segment = points[offsets[i]:offsets[i + 1]]
+            (center_x, center_y), radius = cv2.minEnclosingCircle(np.array(segment, dtype=np.int32))
+            centers[i] = (center_x, center_y)
+            radii[i] = radius
+        
+        return centers, radii
+    
+    def shape_properties(self, contour):
+        """
+        Calculate the area and perimeter of a closed contour.
+        
+        Args:
+            contour (numpy.ndarray): Input contour.
+            
+        Returns:
+            tuple: Area and perimeter.
+        """
+        return cv2.contourArea(contour), cv2.arcLength(contour, True)
+    
+    def fit_circle(self, points):
+        """
+        Fit a circle to a set of points using least squares method.
+        
+        Args:
+            points (numpy.ndarray): Array of points (N, 2).
+            
+        Returns:
+            tuple: Center coordinates (x, y) and radius.
+        """
+        # Convert points to float for better precision
+        points = np.array(points, dtype=np.float64)
+        
+        # Calculate mean of x and y coordinates
+        mean_x = np.mean(points[:, 0])
+        mean_y = np.mean(points[:, 1])
+        
+        # Shift coordinates to origin
+        shifted_x = points[:, 0] - mean_x
+        shifted_y = points[:, 1] - mean_y
+        
+        # Calculate the coefficients of the circle equation
+        # (x - a)^2 + (y - b)^2 = r^2
+        # x^2 + y^2 - 2ax - 2by + a^2 + b^2 - r^2 = 0
+        # x^2 + y^2 - 2ax - 2by + c = 0, where c = a^2 + b^2 - r^2
+        
+        # Formulate as a linear system
+        A = np.column_stack((2 * shifted_x, 2 * shifted_y, np.ones_like(shifted_x)))
+        b = shifted_x**2 + shifted_y**2
+        
+        # Solve the system using least squares
+        try:
+            solution, residuals, rank, s = np.linalg.lstsq(A, b, rcond=None)
+            a, b, c = solution
+            
+            # Calculate center and radius
+            center_x = mean_x + a
+            center_y = mean_y + b
+            radius = np.sqrt(a**2 + b**2 + c)
+            
+            return (center_x, center_y), radius
+        except np.linalg.LinAlgError:
+            # Fallback to OpenCV's minEnclosingCircle if least squares fails
+            (center_x, center_y), radius = cv2.minEnclosingCircle(np.array(points, dtype=np.int32))
+            return (center_x, center_y), radius
+    
+    def is_circle(self, contour, circularity_threshold=CIRCULARITY):
+        """
+        Check if a contour is approximately a circle.
+        
+        Args:
+            contour (numpy.ndarray): Input contour.
+            circularity_threshold (float): Threshold for circularity (0 to 1).
+            
+        Returns:
+            bool: True if the contour is a circle, False otherwise.
+        """
+        # Calculate area and perimeter
+        area, perimeter = self.shape_properties(contour)
+        
+        # Calculate circularity (4*pi*area/perimeter^2)
+        # A perfect circle has circularity = 1
+        if perimeter == 0:
+            return False
+        
+        circularity = 4 * np.pi * area / (perimeter * perimeter)
+        
+        # Check if circularity is above threshold
+        return circularity > circularity_threshold
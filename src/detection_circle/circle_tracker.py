@@ -0,0 +1,193 @@
+import numpy as np
+from .roundness_calculator import RoundnessCalculator, METHOD_NAMES
+
+class Track:
+    """
+    A part followed across frames, with its last measurement.
+    """
+
+    def __init__(self, track_id, circle, points, measurements, work):
+        """
+        Initialize the track.
+
+        Args:
+            track_id (int): Identifier of the track, unique within a tracker.
+            circle (numpy.ndarray): Fitted circle (center_x, center_y, radius) in the last frame.
+            points (numpy.ndarray): Single-line points (N, 2) measured in the last frame.
+            measurements (dict): Roundness results of the last frame, as returned by
+                RoundnessCalculator.measure().
+            work (dict): Solver work of the last measurement per method.
+        """
+        self.track_id = track_id
+        self.circle = circle
+        self.points = points
+        self.measurements = measurements
+        self.work = work
+        # Work of the first, cold-started measurement: the reference for warm starts
+        self.cold_work = dict(work)
+        self.missed = 0
+
+class CircleTracker:
+    """
+    Class for measuring the roundness of parts followed over consecutive frames.
+
+    Circles are associated with the tracks of the previous frame by center
+    distance and radius, closest pairs first. A part whose single-line
+    points are those of its previous frame, up to a translation and within
+    `tolerance` pixels, reuses the previous measurement moved along with it.
+    Otherwise its solvers start from the previous optimal centers, moved by
+    the displacement of the fitted circle. New parts are measured cold.
+
+    `stats` counts the measurements of each kind and the solver evaluations
+    spent and saved. A reused measurement saves the evaluations it took; a
+    warm start saves the difference to the first, cold-started measurement
+    of its track, which estimates the cost of a cold start on the part.
+    """
+
+    def __init__(self, roundness_calculator=None, max_distance=20.0, max_radius_change=0.1, tolerance=0.0,
+                 max_missed=2):
+        """
+        Initialize the tracker.
+
+        Args:
+            roundness_calculator (RoundnessCalculator): Calculator used for measuring.
+            max_distance (float): Maximum distance in pixels a center moves between frames.
+            max_radius_change (float): Maximum relative change of the radius between frames.
+            tolerance (float): Maximum deviation in pixels of the points from their
+                translated previous positions for the previous measurement to be
+                reused; 0 reuses it only for identical, translated points. Zone
+                widths change by at most twice the tolerance.
+            max_missed (int): Number of consecutive frames a track is kept without a match.
+        """
+        self.roundness_calculator = roundness_calculator or RoundnessCalculator()
+        self.max_distance = max_distance
+        self.max_radius_change = max_radius_change
+        self.tolerance = tolerance
+        self.max_missed = max_missed
+        self.tracks = []
+        self._next_id = 0
+        self.stats = {'frames': 0, 'cold': 0, 'warm_started': 0, 'reused': 0,
+                      'evaluations': 0, 'evaluations_saved': 0}
+
+    def update(self, circles, points, method='min_zone'):
+        """
+        Measure the parts of the next frame.
+
+        Args:
+            circles (list): Fitted circle (center_x, center_y, radius) of each part.
+            points (list): Single-line points (N, 2) of each part, in contour order.
+            method (str): Method for roundness calculation (a key of METHOD_NAMES), or 'all'.
+
+        Returns:
+            list: Track identifier and measurements (see RoundnessCalculator.measure())
+                of each part, in input order.
+        """
+        self.stats['frames'] += 1
+        circles = np.asarray(circles, dtype=np.float64).reshape(-1, 3)
+        matches = self._associate(circles)
+
+        results = []
+        tracks = []
+        for j, circle in enumerate(circles):
+            part_points = np.asarray(points[j], dtype=np.float64).reshape(-1, 2)
+            track = matches.get(j)
+            if track is not None and self._covers(track, method):
+                shift = self._translation(track.points, part_points)
+                if shift is not None:
+                    # Unchanged up to a translation: move the previous measurement along
+                    measurements = self._translate(track.measurements, shift)
+                    self.stats['reused'] += 1
+                    self.stats['evaluations_saved'] += sum(track.work.values())
+                    # The reference points stay those measured, so deviations do not accumulate
+                    track.circle, track.points, track.measurements = circle, track.points + shift, measurements
+                    track.missed = 0
+                    results.append((track.track_id, measurements))
+                    tracks.append(track)
+                    continue
+
+                displacement = circle[:2] - track.circle[:2]
+                initial_centers = {key: np.add(track.measurements[key][0][:2], displacement)
+                                   for key in ('min_zone', 'max_inscribed') if key in track.measurements}
+                measurements, work = self._measure(part_points, method, initial_centers)
+                warm_starts = self.roundness_calculator.warm_starts
+                self.stats['warm_started' if warm_starts else 'cold'] += 1
+                self.stats['evaluations_saved'] += sum(max(0, track.cold_work[key] - work[key])
+                                                       for key in warm_starts
+                                                       if key in work and key in track.cold_work)
+                for key, value in work.items():
+                    track.cold_work.setdefault(key, value)
+                track.circle, track.points, track.measurements, track.work = circle, part_points, measurements, work
+                track.missed = 0
+            else:
+                measurements, work = self._measure(part_points, method)
+                self.stats['cold'] += 1
+                track = Track(self._next_id, circle, part_points, measurements, work)
+                self._next_id += 1
+            results.append((track.track_id, measurements))
+            tracks.append(track)
+
+        # Keep unmatched tracks for a few frames, e.g. through a missed detection
+        matched = {id(track) for track in tracks}
+        for track in self.tracks:
+            if id(track) not in matched:
+                track.missed += 1
+                if track.missed <= self.max_missed:
+                    tracks.append(track)
+        self.tracks = tracks
+        return results
+
+    def _measure(self, points, method, initial_centers=None):
+        """Measure roundness and count the solver work."""
+        measurements = self.roundness_calculator.measure(points, method, initial_centers)
+        work = dict(self.roundness_calculator.iterations)
+        self.stats['evaluations'] += sum(work.values())
+        return measurements, work
+
+    def _associate(self, circles):
+        """
+        Match circles with tracks, closest pairs first.
+
+        Returns:
+            dict: Track of each matched circle, by circle position.
+        """
+        if not self.tracks or not len(circles):
+            return {}
+        previous = np.array([track.circle for track in self.tracks])
+        distances = np.hypot(previous[:, None, 0] - circles[None, :, 0], previous[:, None, 1] - circles[None, :, 1])
+        radius_change = np.abs(circles[None, :, 2] - previous[:, None, 2])
+        valid = (distances <= self.max_distance) & (radius_change <= self.max_radius_change * previous[:, None, 2])
+
+        matches = {}
+        used = set()
+        for t, j in zip(*np.unravel_index(np.argsort(distances, axis=None), distances.shape)):
+            if valid[t, j] and t not in used and j not in matches:
+                matches[j] = self.tracks[t]
+                used.add(t)
+        return matches
+
+    def _covers(self, track, method):
+        """Whether the track's last measurement holds the requested methods."""
+        return set(METHOD_NAMES if method == 'all' else [method]) <= set(track.measurements)
+
+    def _translation(self, previous, points):
+        """
+        Find the translation from the previous points to the points, if they are
+        the same points moved.
+
+        Returns:
+            numpy.ndarray: The translation (dx, dy), or None if the points changed
+                by more than the tolerance.
+        """
+        if len(previous) != len(points):
+            return None
+        difference = points - previous
+        shift = np.round(np.median(difference, axis=0))
+        if np.max(np.abs(difference - shift)) > self.tolerance:
+            return None
+        return shift
+
+    def _translate(self, measurements, shift):
+        """Move the circles of measurements by a translation."""
+        dx, dy = shift
+        return {key: ((inner[0] + dx, inner[1] + dy, inner[2]), (outer[0] + dx, outer[1] + dy, outer[2]), roundness)
+                for key, (inner, outer, roundness) in measurements.items()}
@@ -0,0 +1,179 @@
+import numpy as np
+
+class ContourBatch:
+    """
+    Contours stored as arrays: one flat point buffer with a start and a
+    point count per contour.
+
+    The area, perimeter and circularity of every contour, and separately
+    its bounding box and centroid, are computed once on first use, for all
+    contours together, and kept.
+    Selecting contours (e.g. filtering) gives a new batch that shares the
+    point buffer and the computed properties instead of copying them, and
+    a single contour is a view into the buffer, shaped (N, 1, 2) like the
+    contours of cv2.findContours.
+
+    Areas and perimeters equal those of cv2.contourArea and cv2.arcLength
+    (closed), so thresholds select the same contours.
+    """
+
+    def __init__(self, points, starts, counts):
+        """
+        Initialize the batch.
+
+        Args:
+            points (numpy.ndarray): Point buffer (N, 2), int32.
+            starts (numpy.ndarray): Index of the first point of each contour (K,).
+            counts (numpy.ndarray): Number of points of each contour (K,), at least 1.
+        """
+        self.points = points
+        self.starts = np.asarray(starts, dtype=np.intp)
+        self.counts = np.asarray(counts, dtype=np.intp)
+        # Property arrays by name, computed in groups on first use
+        self._properties = {}
+
+    @classmethod
+    def from_contours(cls, contours):
+        """
+        Pack a list of contours into a batch, copying their points once.
+
+        Args:
+            contours (list): List of contours, as returned by cv2.findContours.
+
+        Returns:
+            ContourBatch: The batch; a batch is returned unchanged.
+        """
+        if isinstance(contours, cls):
+            return contours
+        counts = np.array([len(contour) for contour in contours], dtype=np.intp)
+        starts = np.concatenate(([0], np.cumsum(counts)[:-1])).astype(np.intp)
+        if len(contours) == 0:
+            return cls(np.empty((0, 2), dtype=np.int32), starts[:0], counts)
+        points = np.concatenate(contours).reshape(-1, 2).astype(np.int32, copy=False)
+        return cls(points, starts, counts)
+
+    def __len__(self):
+        return len(self.counts)
+
+    def __getitem__(self, index):
+        """
+        Get one contour as a view into the point buffer.
+
+        Args:
+            index (int): Position of the contour in the batch.
+
+        Returns:
+            numpy.ndarray: The contour (N, 1, 2), int32.
+        """
+        start = self.starts[index]
+        return self.points[start:start + self.counts[index]].reshape(-1, 1, 2)
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+    def select(self, selection):
+        """
+        Select contours, sharing the point buffer and the properties computed so far.
+
+        Args:
+            selection (numpy.ndarray): Boolean mask or indices over the contours.
+
+        Returns:
+            ContourBatch: The selected contours, in the order of `selection`.
+        """
+        selected = ContourBatch(self.points, self.starts[selection], self.counts[selection])
+        selected._properties = {name: values[selection] for name, values in self._properties.items()}
+        return selected
+
+    def flatten(self):
+        """
+        Get the points of the batch as one contiguous array with segment offsets.
+
+        Returns:
+            tuple: Points (N, 2) and offsets (K + 1,); contour i occupies
+                points[offsets[i]:offsets[i + 1]]. The point buffer itself is
+                returned if it holds exactly the contours of the batch, in order.
+        """
+        offsets = np.concatenate(([0], np.cumsum(self.counts))).astype(np.intp)
+        if offsets[-1] == len(self.points) and np.array_equal(self.starts, offsets[:-1]):
+            return self.points, offsets
+        # Gather the selected segments
+        index = np.repeat(self.starts - offsets[:-1], self.counts) + np.arange(offsets[-1])
+        return self.points[index], offsets
+
+    @property
+    def areas(self):
+        """numpy.ndarray: Area of each contour."""
+        return self._property('area', self._shape_properties)
+
+    @property
+    def perimeters(self):
+        """numpy.ndarray: Perimeter of each closed contour."""
+        return self._property('perimeter', self._shape_properties)
+
+    @property
+    def circularities(self):
+        """numpy.ndarray: 4*pi*area/perimeter^2 of each contour, 0 for a zero perimeter."""
+        return self._property('circularity', self._shape_properties)
+
+    @property
+    def bounding_boxes(self):
+        """numpy.ndarray: Bounding box (x, y, width, height) of each contour, as cv2.boundingRect."""
+        return self._property('bounding_box', self._extent_properties)
+
+    @property
+    def centroids(self):
+        """numpy.ndarray: Mean of the points (x, y) of each contour."""
+        return self._property('centroid', self._extent_properties)
+
+    def _property(self, name, compute):
+        """Get a property, computing its group for all contours on first use."""
+        if name not in self._properties:
+            self._properties.update(compute(*self.flatten()))
+        return self._properties[name]
+
+    def _shape_properties(self, points, offsets):
+        """Compute the area, perimeter and circularity of all contours."""
+        if len(self) == 0:
+            return {'area': np.empty(0), 'perimeter': np.empty(0), 'circularity': np.empty(0)}
+        starts = offsets[:-1]
+        ends = offsets[1:]
+        x = np.ascontiguousarray(points[:, 0])
+        y = np.ascontiguousarray(points[:, 1])
+
+        # Previous point of each point, wrapping around within its contour
+        x_previous = np.empty_like(x)
+        x_previous[1:] = x[:-1]
+        x_previous[starts] = x[ends - 1]
+        y_previous = np.empty_like(y)
+        y_previous[1:] = y[:-1]
+        y_previous[starts] = y[ends - 1]
+
+        # Shoelace formula with exact integer sums, as in cv2.contourArea. The
+        # products fit in int32 unless coordinates reach 2**15.
+        if np.max(np.abs(points)) >= 1 << 15:
+            x, y = x.astype(np.int64), y.astype(np.int64)
+            x_previous, y_previous = x_previous.astype(np.int64), y_previous.astype(np.int64)
+        cross = x_previous * y - y_previous * x
+        area = np.abs(np.add.reduceat(cross, starts, dtype=np.int64).astype(np.float64)) * 0.5
+
+        # Edge lengths in single precision, summed in double precision from the
+        # closing edge on, as in cv2.arcLength
+        dx = (x - x_previous).astype(np.float32)
+        dy = (y - y_previous).astype(np.float32)
+        perimeter = np.add.reduceat(np.sqrt(dx * dx + dy * dy), starts, dtype=np.float64)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            circularity = np.where(perimeter > 0, 4 * np.pi * area / (perimeter * perimeter), 0.0)
+        return {'area': area, 'perimeter': perimeter, 'circularity': circularity}
+
+    def _extent_properties(self, points, offsets):
+        """Compute the bounding box and centroid of all contours."""
+        if len(self) == 0:
+            return {'bounding_box': np.empty((0, 4), dtype=np.int64), 'centroid': np.empty((0, 2))}
+        starts = offsets[:-1]
+        low = np.minimum.reduceat(points, starts, axis=0).astype(np.int64)
+        high = np.maximum.reduceat(points, starts, axis=0).astype(np.int64)
+        centroid = np.add.reduceat(points, starts, axis=0, dtype=np.int64) / self.counts[:, None]
+        return {'bounding_box': np.column_stack((low, high - low + 1)), 'centroid': centroid}
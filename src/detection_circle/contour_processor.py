@@ -0,0 +1,89 @@
+import cv2
+import numpy as np
+from .contour_batch import ContourBatch
+
+class ContourProcessor:
+    """
+    Class for processing and filtering contours.
+    """
+    
+    # Default size limits of filter_contours(), for full-size images
+    MIN_AREA = 100
+    MIN_PERIMETER = 100
+    
+    def filter_contours(self, contours, min_area=MIN_AREA, min_perimeter=MIN_PERIMETER, min_circularity=0.7):
+        """
+        Filter contours based on shape properties.
+        
+        The properties of all contours are computed at once by a ContourBatch.
+        
+        Args:
+            contours (list or ContourBatch): Contours to filter.
+            min_area (float): Minimum contour area.
+            min_perimeter (float): Minimum contour perimeter.
+            min_circularity (float): Minimum circularity (0 to 1); 0 keeps every shape.
+            
+        Returns:
+            list or ContourBatch: The contours that pass, as a list of the given
+                contour arrays, or for a batch as a batch sharing its point buffer.
+        """
+        batch = ContourBatch.from_contours(contours)
+        
+        # Circularity is 4*pi*area/perimeter^2; a perfect circle has circularity = 1
+        keep = ((batch.areas > min_area) & (batch.perimeters > min_perimeter)
+                & (batch.circularities > min_circularity))
+        
+        if isinstance(contours, ContourBatch):
+            return contours.select(keep)
+        return [contours[i] for i in np.flatnonzero(keep)]
+    
+    def single_line_processing(self, contour):
+        """
+        Convert contour to single-line representation.
+        
+        Args:
+            contour (numpy.ndarray or ContourBatch): Input contour, or a batch of contours.
+            
+        Returns:
+            numpy.ndarray or ContourBatch: Single-line contour (N, 2), or for a batch
+                a batch of the approximated contours.
+        """
+        if isinstance(contour, ContourBatch):
+            return self._single_line_batch(contour)
+        
+        # Approximate the contour to reduce the number of points
+        epsilon = 0.005 * cv2.arcLength(contour, True)
+        approx_contour = self.approximate_contour(contour, epsilon)
+        
+        # Convert to single line (remove nested structure)
+        single_line = approx_contour.reshape(-1, 2)
+        
+        return single_line
+    
+    def approximate_contour(self, contour, epsilon):
+        """
+        Approximate a contour using the Douglas-Peucker algorithm.
+        
+        Args:
+            contour (numpy.ndarray): Input contour.
+            epsilon (float): Maximum distance from contour to approximated contour.
+            
+        Returns:
+            numpy.ndarray: Approximated contour.
+        """
+        approx_contour = cv2.approxPolyDP(contour, epsilon, True)
+        return approx_contour
+    
+    def _single_line_batch(self, batch):
+        """
+        Approximate every contour of a batch, reusing the perimeters of the batch.
+        
+        Args:
+            batch (ContourBatch): Input contours.
+            
+        Returns:
+            ContourBatch: The approximated contours, in one new point buffer.
+        """
+        approximations = [self.approximate_contour(contour, 0.005 * perimeter)
+                          for contour, perimeter in zip(batch, batch.perimeters)]
+        return ContourBatch.from_contours(approximations)
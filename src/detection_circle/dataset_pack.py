@@ -0,0 +1,187 @@
+import os
+import sys
+import json
+import argparse
+import tempfile
+import numpy as np
+import cv2
+from .image_processor import ImageProcessor
+from .image_loader import LoadedImage
+from .stage_cache import StageCache
+
+# Image files packed from a directory
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png')
+
+class DatasetPack:
+    """
+    Class for a directory of images decoded once into one memory-mapped file.
+
+    The pack file holds the grayscale detection image of every file back to
+    back, each starting on a page boundary. A JSON index next to it
+    (`<pack>.json`) records the name, shape and offset of each image, how it
+    was decoded and the content hash of its source file. Opening a pack maps
+    the file read-only, so an image is a view into the mapping: it takes no
+    decoding and no copy, any image is found in constant time, and worker
+    processes that open the same pack share one copy in the OS page cache.
+
+    The pack is a snapshot: images edited after packing are not seen until
+    the pack is built again.
+    """
+
+    EXTENSION = '.pack'
+    VERSION = 1
+    # Image offsets are multiples of the page size
+    ALIGNMENT = 4096
+
+    def __init__(self, path):
+        """
+        Open a pack.
+
+        Args:
+            path (str): Path to the pack file; its index is read from `<path>.json`.
+        """
+        with open(self.index_path(path)) as f:
+            index = json.load(f)
+        if index.get('version') != self.VERSION:
+            raise ValueError(f"Unsupported pack version: {index.get('version')}")
+        self.path = path
+        self.decode = index['decode']
+        self.source_dir = index['source_dir']
+        self.entries = index['images']
+        self.names = [entry['name'] for entry in self.entries]
+        self._positions = {name: i for i, name in enumerate(self.names)}
+        size = os.path.getsize(path)
+        # np.memmap cannot map an empty file
+        self.data = np.memmap(path, dtype=np.uint8, mode='r') if size else np.zeros(0, dtype=np.uint8)
+
+    @staticmethod
+    def index_path(path):
+        """Path of the index of a pack file."""
+        return path + '.json'
+
+    @classmethod
+    def build(cls, directory, path, decode='color', image_processor=None):
+        """
+        Decode the images of a directory into a new pack.
+
+        Args:
+            directory (str): Directory of .jpg, .jpeg and .png images.
+            path (str): Path of the pack file to write.
+            decode (str): 'color' stores the grayscale conversion of the BGR image,
+                which gives the same results as the default pipeline; 'gray' decodes
+                straight to grayscale, as with --decode gray.
+            image_processor (ImageProcessor): Processor used to decode the files.
+
+        Returns:
+            DatasetPack: The opened pack.
+        """
+        if decode not in ('color', 'gray'):
+            raise ValueError(f"Unknown decode mode: {decode}")
+        image_processor = image_processor or ImageProcessor()
+        names = sorted(f for f in os.listdir(directory) if f.lower().endswith(IMAGE_EXTENSIONS))
+
+        entries = []
+        offset = 0
+        # Write the images and the index atomically, the index last so a
+        # reader never sees an index pointing past the end of the data
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                for name in names:
+                    source = os.path.join(directory, name)
+                    image = image_processor.load_image(source, decode == 'gray')
+                    if image.ndim == 3:
+                        image = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+                    padding = -offset % cls.ALIGNMENT
+                    f.write(b'\0' * padding)
+                    offset += padding
+                    f.write(np.ascontiguousarray(image).tobytes())
+                    entries.append({'name': name, 'shape': list(image.shape), 'offset': offset,
+                                    'key': StageCache.image_key(source)})
+                    offset += image.size
+            os.replace(temp_path, path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+
+        index = {'version': cls.VERSION, 'decode': decode, 'source_dir': os.path.abspath(directory),
+                 'images': entries}
+        index_path = cls.index_path(path)
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(index_path)), suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(index, f, indent=1)
+            os.replace(temp_path, index_path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+        return cls(path)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, name):
+        return name in self._positions
+
+    def __getitem__(self, key):
+        """
+        Get an image as a read-only view into the pack.
+
+        Args:
+            key (int or str): Position or name of the image.
+
+        Returns:
+            numpy.ndarray: The grayscale image (height, width), uint8.
+        """
+        entry = self.entries[key if isinstance(key, (int, np.integer)) else self._position(key)]
+        height, width = entry['shape']
+        start = entry['offset']
+        return self.data[start:start + height * width].reshape(height, width)
+
+    def load(self, name, image_processor=None):
+        """
+        Get an image of the pack as a LoadedImage, for the pipeline.
+
+        The detection image is the view into the pack. The BGR image used for
+        drawing is decoded from the source file, only if it is used.
+
+        Args:
+            name (str): Name of the image.
+            image_processor (ImageProcessor): Processor used to decode the source file.
+
+        Returns:
+            LoadedImage: The image.
+        """
+        entry = self.entries[self._position(name)]
+        return LoadedImage(os.path.join(self.source_dir, name), True, 1, image_processor,
+                           image=self[name], key=entry['key'])
+
+    def _position(self, name):
+        """Position of an image in the pack, by name."""
+        try:
+            return self._positions[name]
+        except KeyError:
+            raise KeyError(f"Image not in pack {self.path}: {name}") from None
+
+def parse_args(argv=None):
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description='Decode a directory of images into a memory-mapped pack '
+                                                 'for repeated runs')
+    parser.add_argument('directory', type=str, help='Directory of images to pack')
+    parser.add_argument('pack', type=str, help=f'Pack file to write, e.g. dataset{DatasetPack.EXTENSION}')
+    parser.add_argument('--decode', type=str, default='color', choices=['color', 'gray'],
+                        help='Decode as the pipeline does with --decode color (default) or --decode gray')
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    """Build a pack and print a summary."""
+    args = parse_args(argv)
+    if not args.pack.endswith(DatasetPack.EXTENSION):
+        print(f"The pack file must end in {DatasetPack.EXTENSION}", file=sys.stderr)
+        return 1
+    pack = DatasetPack.build(args.directory, args.pack, args.decode)
+    print(f"Packed {len(pack)} images ({pack.data.size / (1 << 20):.1f} MB) into {args.pack}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,157 @@
+import importlib.util
+import numpy as np
+
+# Backends of DistanceKernels; 'numba' needs the optional numba package
+BACKENDS = ('numpy', 'numba')
+
+# Kernels compiled by numba, by name, shared by all instances of a process
+_compiled = {}
+
+def _zone_width_loop(x, y, center_x, center_y):
+    """Difference of the largest and smallest distance to the center, in one pass without temporaries."""
+    low = np.inf
+    high = 0.0
+    for i in range(x.shape[0]):
+        dx = x[i] - center_x
+        dy = y[i] - center_y
+        squared = dx * dx + dy * dy
+        if squared < low:
+            low = squared
+        if squared > high:
+            high = squared
+    return np.sqrt(high) - np.sqrt(low)
+
+def _min_radius_loop(x, y, center_x, center_y):
+    """Smallest distance to the center: the max-inscribed objective, negated by the caller."""
+    low = np.inf
+    for i in range(x.shape[0]):
+        dx = x[i] - center_x
+        dy = y[i] - center_y
+        squared = dx * dx + dy * dy
+        if squared < low:
+            low = squared
+    return np.sqrt(low)
+
+class DistanceKernels:
+    """
+    Class for the distance computations of the roundness methods.
+
+    Each method reduces the distances of the points to a center to their
+    minimum and maximum, and the optimizer-based methods do so hundreds of
+    times per part. The 'numpy' backend, the default, computes squared
+    distances into buffers allocated once per point set. The 'numba' backend
+    compiles the optimizer objectives into loops that fuse the distances
+    with the reductions and allocate nothing; one-off distance ranges stay
+    on NumPy, where compiling would cost more than it saves. Both take the
+    square root of the two extremes only, which gives the same values as
+    taking it for every point: the square root is monotonic and correctly
+    rounded.
+
+    Numba is only imported, and the objectives compiled or loaded from its
+    on-disk cache, when the 'numba' backend is chosen and an optimizer runs.
+    """
+
+    def __init__(self, backend='numpy'):
+        """
+        Initialize the kernels.
+
+        Args:
+            backend (str): 'numpy' or 'numba'.
+        """
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown kernel backend: {backend}")
+        if backend == 'numba' and importlib.util.find_spec('numba') is None:
+            raise ValueError('The numba backend needs the numba package (pip install ".[jit]")')
+        self.backend = backend
+
+    def radius_range(self, points, center):
+        """
+        Find the smallest and largest distance of the points to a center.
+
+        Args:
+            points (numpy.ndarray): Array of points (N, 2).
+            center (tuple): Center (x, y).
+
+        Returns:
+            tuple: Smallest and largest distance.
+        """
+        return self.range_function(points)(center)
+
+    def range_function(self, points):
+        """
+        Prepare points for finding their distance range to many centers.
+
+        Args:
+            points (numpy.ndarray): Array of points (N, 2).
+
+        Returns:
+            callable: Maps a center (x, y) to the smallest and largest distance.
+        """
+        return self._function(points, 'radius_range', 'numpy')
+
+    def min_zone_objective(self, points):
+        """
+        Prepare the min-zone objective of points.
+
+        Args:
+            points (numpy.ndarray): Array of points (N, 2).
+
+        Returns:
+            callable: Maps a center (x, y) to the difference of the largest and
+                smallest distance.
+        """
+        return self._function(points, 'zone_width')
+
+    def max_inscribed_objective(self, points):
+        """
+        Prepare the max-inscribed objective of points, for minimizing.
+
+        Args:
+            points (numpy.ndarray): Array of points (N, 2).
+
+        Returns:
+            callable: Maps a center (x, y) to the negated smallest distance.
+        """
+        min_radius = self._function(points, 'min_radius')
+        return lambda center: -min_radius(center)
+
+    def _function(self, points, kernel, backend=None):
+        """Bind a kernel to points, on the given backend or that of the kernels."""
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        x = np.ascontiguousarray(points[:, 0])
+        y = np.ascontiguousarray(points[:, 1])
+        if (backend or self.backend) == 'numba':
+            compiled = _compile(kernel)
+            return lambda center: compiled(x, y, float(center[0]), float(center[1]))
+
+        squared = np.empty_like(x)
+        buffer = np.empty_like(x)
+
+        def squared_distances(center):
+            np.subtract(x, center[0], out=squared)
+            np.multiply(squared, squared, out=squared)
+            np.subtract(y, center[1], out=buffer)
+            np.multiply(buffer, buffer, out=buffer)
+            return np.add(squared, buffer, out=squared)
+
+        if kernel == 'radius_range':
+            def radius_range(center):
+                distances = squared_distances(center)
+                return np.sqrt(np.min(distances)), np.sqrt(np.max(distances))
+            return radius_range
+        if kernel == 'zone_width':
+            def zone_width(center):
+                distances = squared_distances(center)
+                return np.sqrt(np.max(distances)) - np.sqrt(np.min(distances))
+            return zone_width
+        return lambda center: np.sqrt(np.min(squared_distances(center)))
+
+# Loop kernels by name, compiled by numba for the 'numba' backend
+_LOOPS = {'zone_width': _zone_width_loop, 'min_radius': _min_radius_loop}
+
+def _compile(kernel):
+    """Compile a loop kernel with numba, once per process and cached on disk."""
+    if kernel not in _compiled:
+        import numba
+        _compiled[kernel] = numba.njit(cache=True)(_LOOPS[kernel])
+    return _compiled[kernel]
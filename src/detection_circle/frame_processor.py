@@ -0,0 +1,95 @@
+import cv2
+import numpy as np
+from .image_processor import ImageProcessor
+
+class FrameProcessor(ImageProcessor):
+    """
+    Image processor for streams of same-size frames that reuses its buffers.
+
+    The grayscale, blurred, Canny and edge images are written into arrays
+    allocated once for the frame size (again only if the size changes), so
+    steady-state processing allocates no image-sized arrays.
+
+    The returned images are overwritten by later calls: the preprocessed
+    image by the next preprocess(), and each edge image after `edge_buffers`
+    further calls to detect_edges(). Callers that keep edge images longer,
+    e.g. in a queue, must size `edge_buffers` accordingly or copy them.
+    """
+
+    def __init__(self, edge_buffers=1):
+        """
+        Initialize the processor.
+
+        Args:
+            edge_buffers (int): Number of edge images cycled through, i.e. how many
+                returned edge images can be alive at the same time.
+        """
+        self.edge_buffers = edge_buffers
+        self.shape = None
+        # Number of times buffers were allocated
+        self.allocations = 0
+        self._gray = None
+        self._blurred = None
+        self._canny = None
+        self._edges = []
+        self._next_edges = 0
+
+    def preprocess(self, image):
+        """
+        Preprocess the image for edge detection into a reused buffer.
+
+        Args:
+            image (numpy.ndarray): The input BGR or grayscale image.
+
+        Returns:
+            numpy.ndarray: The preprocessed image, valid until the next call.
+        """
+        if image.ndim != 2 and (image.ndim != 3 or image.shape[2] != 3):
+            raise ValueError(f"Expected a BGR or grayscale image, got shape {image.shape}")
+        self._allocate(image.shape[:2])
+
+        # Convert to grayscale
+        if image.ndim == 2:
+            gray = image
+        else:
+            gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY, dst=self._gray)
+
+        # Apply Gaussian blur to reduce noise
+        return cv2.GaussianBlur(gray, (self.BLUR_SIZE, self.BLUR_SIZE), 0, dst=self._blurred)
+
+    def detect_edges(self, image):
+        """
+        Detect edges in the preprocessed image into a reused buffer.
+
+        Args:
+            image (numpy.ndarray): The preprocessed image.
+
+        Returns:
+            numpy.ndarray: The edge image, valid for `edge_buffers` calls.
+        """
+        self._allocate(image.shape[:2])
+
+        # Apply Canny edge detection
+        canny = cv2.Canny(image, *self.CANNY_THRESHOLDS, edges=self._canny)
+
+        # Close gaps in the edges (a dilation followed by an erosion)
+        edges = self._edges[self._next_edges]
+        self._next_edges = (self._next_edges + 1) % self.edge_buffers
+        return cv2.morphologyEx(canny, cv2.MORPH_CLOSE, self.CLOSE_KERNEL, dst=edges)
+
+    def _allocate(self, shape):
+        """
+        Allocate the buffers for a frame size, unless already allocated.
+
+        Args:
+            shape (tuple): Frame height and width.
+        """
+        if shape == self.shape:
+            return
+        self._gray = np.empty(shape, dtype=np.uint8)
+        self._blurred = np.empty(shape, dtype=np.uint8)
+        self._canny = np.empty(shape, dtype=np.uint8)
+        self._edges = [np.empty(shape, dtype=np.uint8) for _ in range(self.edge_buffers)]
+        self._next_edges = 0
+        self.shape = shape
+        self.allocations += 1
@@ -0,0 +1,166 @@
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from .image_processor import ImageProcessor
+
+class LoadedImage:
+    """
+    An image file, or the bytes of one, that is decoded on first use.
+
+    The detection image is decoded as configured (grayscale and/or reduced
+    size). The full-size BGR image needed for drawing is decoded separately,
+    and only if it is used, unless both are the same image. An image taken
+    from a DatasetPack comes with its detection image already decoded.
+    """
+
+    def __init__(self, path, grayscale=False, reduction=1, image_processor=None, data=None, image=None, key=None):
+        """
+        Initialize the image.
+
+        Args:
+            path (str): Path to the image file, or a name for the image if data is given.
+            grayscale (bool): Decode the detection image straight to grayscale.
+            reduction (int): Decode the detection image at 1/reduction of the full size.
+            image_processor (ImageProcessor): Processor used to decode the file.
+            data (bytes): Content of the image file, decoded instead of reading the path.
+            image (numpy.ndarray): The detection image, if already decoded.
+            key (str): Content hash of the image file, if already known; keys the stage cache.
+        """
+        self.path = path
+        self.data = data
+        self.grayscale = grayscale
+        self.reduction = reduction
+        self.key = key
+        self.image_processor = image_processor or ImageProcessor()
+        self._image = image
+        self._color = None
+        self._error = None
+
+    @property
+    def image(self):
+        """
+        numpy.ndarray: The image used for detection.
+        """
+        if self._error is not None:
+            raise self._error
+        if self._image is None:
+            self._image = self._decode(self.grayscale, self.reduction)
+        return self._image
+
+    @property
+    def color(self):
+        """
+        numpy.ndarray: The full-size BGR image, for visualization.
+        """
+        if not self.grayscale and self.reduction == 1:
+            return self.image
+        if self._color is None:
+            self._color = self._decode(False, 1)
+        return self._color
+
+    def prefetch(self):
+        """
+        Decode the detection image, keeping a decoding error for the consumer.
+        """
+        try:
+            self.image
+        except Exception as e:
+            self._error = e
+
+    def _decode(self, grayscale, reduction):
+        """Decode the image from its bytes or its file."""
+        if self.data is not None:
+            return self.image_processor.decode_image(self.data, grayscale, reduction)
+        return self.image_processor.load_image(self.path, grayscale, reduction)
+
+class ImageLoader:
+    """
+    Class for loading images ahead of the code that processes them.
+
+    cv2.imread releases the GIL while decoding, so a small thread pool can
+    decode the next images while the current one is being processed.
+    """
+
+    def __init__(self, grayscale=False, reduction=1, prefetch=2, workers=2, image_processor=None, pack=None):
+        """
+        Initialize the loader.
+
+        Args:
+            grayscale (bool): Decode detection images straight to grayscale.
+            reduction (int): Decode detection images at 1/reduction of the full size; 1, 2, 4 or 8.
+            prefetch (int): Number of images decoded ahead of the consumer; 0 decodes on use.
+            workers (int): Number of decoding threads.
+            image_processor (ImageProcessor): Processor used to decode the files.
+            pack (DatasetPack): Pack to take images from by name instead of decoding
+                files; its decode mode replaces `grayscale` and `reduction` must be 1.
+        """
+        if reduction not in (1, 2, 4, 8):
+            raise ValueError(f"Unsupported reduction: {reduction}")
+        if pack is not None:
+            if reduction != 1:
+                raise ValueError("Images of a pack are stored at full size")
+            grayscale = pack.decode == 'gray'
+        self.pack = pack
+        self.grayscale = grayscale
+        self.reduction = reduction
+        self.prefetch = prefetch
+        self.workers = workers
+        self.image_processor = image_processor or ImageProcessor()
+
+    def load(self, path):
+        """
+        Create a lazily decoded image.
+
+        Args:
+            path (str): Path to the image file, or the name of the image in the pack.
+
+        Returns:
+            LoadedImage: The image, decoded on first use.
+        """
+        if self.pack is not None:
+            return self.pack.load(path, self.image_processor)
+        return LoadedImage(path, self.grayscale, self.reduction, self.image_processor)
+
+    def decode(self, data, name='<bytes>'):
+        """
+        Create a lazily decoded image from the bytes of an image file.
+
+        Args:
+            data (bytes): Content of the image file.
+            name (str): Name of the image, used in place of a path.
+
+        Returns:
+            LoadedImage: The image, decoded on first use.
+        """
+        return LoadedImage(name, self.grayscale, self.reduction, self.image_processor, data)
+
+    def iterate(self, paths):
+        """
+        Load images in order, decoding up to `prefetch` images ahead.
+
+        Decoding errors are raised when the image of the failing file is used.
+        Images of a pack need no decoding and are not prefetched.
+
+        Args:
+            paths (iterable): Paths of the image files.
+
+        Yields:
+            LoadedImage: Each image, with its detection image already decoded.
+        """
+        if self.prefetch <= 0 or self.pack is not None:
+            for path in paths:
+                yield self.load(path)
+            return
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            pending = deque()
+            for path in paths:
+                loaded = self.load(path)
+                pending.append((loaded, executor.submit(loaded.prefetch)))
+                if len(pending) > self.prefetch:
+                    loaded, future = pending.popleft()
+                    future.result()
+                    yield loaded
+            while pending:
+                loaded, future = pending.popleft()
+                future.result()
+                yield loaded
@@ -0,0 +1,125 @@
+import cv2
+import numpy as np
+
+# cv2.imread flags by (grayscale, reduction)
+READ_FLAGS = {
+    (False, 1): cv2.IMREAD_COLOR,
+    (False, 2): cv2.IMREAD_REDUCED_COLOR_2,
+    (False, 4): cv2.IMREAD_REDUCED_COLOR_4,
+    (False, 8): cv2.IMREAD_REDUCED_COLOR_8,
+    (True, 1): cv2.IMREAD_GRAYSCALE,
+    (True, 2): cv2.IMREAD_REDUCED_GRAYSCALE_2,
+    (True, 4): cv2.IMREAD_REDUCED_GRAYSCALE_4,
+    (True, 8): cv2.IMREAD_REDUCED_GRAYSCALE_8,
+}
+
+class ImageProcessor:
+    """
+    Class for processing images to prepare them for contour detection.
+    """
+    
+    # Size of the Gaussian blur kernel of preprocess()
+    BLUR_SIZE = 5
+    # Low and high hysteresis thresholds of the Canny edge detector
+    CANNY_THRESHOLDS = (50, 150)
+    # Structuring element of the closing that bridges gaps in the edges
+    CLOSE_KERNEL = np.ones((3, 3), np.uint8)
+    # cv2.findContours modes: outer contours only, with straight runs compressed
+    CONTOUR_RETRIEVAL = cv2.RETR_EXTERNAL
+    CONTOUR_APPROXIMATION = cv2.CHAIN_APPROX_SIMPLE
+    
+    def load_image(self, image_path, grayscale=False, reduction=1):
+        """
+        Load an image from a file path.
+        
+        Args:
+            image_path (str): Path to the image file.
+            grayscale (bool): Decode straight to grayscale instead of BGR. For JPEG
+                files this skips the color conversion of the decoder, but the
+                gray levels can differ slightly from converting the BGR image.
+            reduction (int): Decode at 1/reduction of the full size; 1, 2, 4 or 8.
+                JPEG files are decoded at the reduced size directly.
+            
+        Returns:
+            numpy.ndarray: The loaded image.
+        """
+        if (grayscale, reduction) not in READ_FLAGS:
+            raise ValueError(f"Unsupported reduction: {reduction}")
+        image = cv2.imread(image_path, READ_FLAGS[(grayscale, reduction)])
+        if image is None:
+            raise ValueError(f"Failed to load image from {image_path}")
+        return image
+    
+    def decode_image(self, data, grayscale=False, reduction=1):
+        """
+        Decode an image from the bytes of an image file.
+        
+        Args:
+            data (bytes): Content of a JPEG, PNG or other image file.
+            grayscale (bool): Decode straight to grayscale instead of BGR.
+            reduction (int): Decode at 1/reduction of the full size; 1, 2, 4 or 8.
+            
+        Returns:
+            numpy.ndarray: The decoded image.
+        """
+        if (grayscale, reduction) not in READ_FLAGS:
+            raise ValueError(f"Unsupported reduction: {reduction}")
+        image = cv2.imdecode(np.frombuffer(data, dtype=np.uint8), READ_FLAGS[(grayscale, reduction)])
+        if image is None:
+            raise ValueError("Failed to decode image data")
+        return image
+    
+    def preprocess(self, image):
+        """
+        Preprocess the image for edge detection.
+        
+        Args:
+            image (numpy.ndarray): The input BGR or grayscale image.
+            
+        Returns:
+            numpy.ndarray: The preprocessed image.
+        """
+        # Convert to grayscale
+        if image.ndim == 2:
+            gray = image
+        else:
+            gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+        
+        # Apply Gaussian blur to reduce noise
+        blurred = cv2.GaussianBlur(gray, (self.BLUR_SIZE, self.BLUR_SIZE), 0)
+        
+        return blurred
+    
+    def detect_edges(self, image):
+        """
+        Detect edges in the preprocessed image.
+        
+        Args:
+            image (numpy.ndarray): The preprocessed image.
+            
+        Returns:
+            numpy.ndarray: The edge image.
+        """
+        # Apply Canny edge detection
+        edges = cv2.Canny(image, *self.CANNY_THRESHOLDS)
+        
+        # Close gaps in the edges (a dilation followed by an erosion)
+        edges = cv2.morphologyEx(edges, cv2.MORPH_CLOSE, self.CLOSE_KERNEL)
+        
+        return edges
+    
+    def extract_contours(self, edge_image):
+        """
+        Extract contours from the edge image.
+        
+        Args:
+            edge_image (numpy.ndarray): The edge image.
+            
+        Returns:
+            list: List of contours.
+        """
+        # Find contours in the edge image
+        contours, _ = cv2.findContours(edge_image, self.CONTOUR_RETRIEVAL, self.CONTOUR_APPROXIMATION)
+        
+        # Ensure we return a list
+        return list(contours)
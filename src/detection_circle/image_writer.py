@@ -0,0 +1,99 @@
+import queue
+import threading
+import cv2
+
+# Tells a writer thread to exit
+_STOP = object()
+
+class ImageWriter:
+    """
+    Class for encoding and writing images in background threads.
+
+    Images are queued and written by a small pool of threads, so JPEG
+    encoding and disk I/O overlap with the processing of the next image.
+    The queue is bounded: submitting blocks while it is full, which keeps
+    the number of images held in memory bounded. OpenCV releases the GIL
+    while encoding, so the writers run in parallel with the caller.
+    """
+
+    def __init__(self, workers=2, queue_size=8):
+        """
+        Initialize the writer and start its threads.
+
+        Args:
+            workers (int): Number of writer threads.
+            queue_size (int): Maximum number of images waiting to be written.
+        """
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.errors = []
+        self.written = 0
+        self._lock = threading.Lock()
+        self.threads = [threading.Thread(target=self._worker, name=f'image-writer-{i}', daemon=True)
+                        for i in range(workers)]
+        for thread in self.threads:
+            thread.start()
+
+    def submit(self, image, filename):
+        """
+        Queue an image for writing, waiting while the queue is full.
+
+        The image must not be modified after it has been submitted.
+
+        Args:
+            image (numpy.ndarray): The image to write.
+            filename (str): Path to write the image to.
+        """
+        if not self.threads:
+            raise RuntimeError("The image writer is closed")
+        self.queue.put((image, filename))
+
+    def flush(self):
+        """
+        Wait until all queued images have been written.
+
+        Returns:
+            list: Error messages of the writes that failed since the last flush.
+        """
+        self.queue.join()
+        with self._lock:
+            errors = self.errors
+            self.errors = []
+        return errors
+
+    def close(self):
+        """
+        Write the remaining images and stop the threads.
+
+        Returns:
+            list: Error messages of the writes that failed since the last flush.
+        """
+        errors = self.flush()
+        for _ in self.threads:
+            self.queue.put(_STOP)
+        for thread in self.threads:
+            thread.join()
+        self.threads = []
+        return errors
+
+    def _worker(self):
+        """
+        Write queued images until told to stop.
+        """
+        while True:
+            item = self.queue.get()
+            try:
+                if item is _STOP:
+                    return
+                image, filename = item
+                try:
+                    ok = cv2.imwrite(filename, image)
+                    error = None if ok else f"Failed to write {filename}"
+                except cv2.error as e:
+                    error = f"Failed to write {filename}: {e}"
+                with self._lock:
+                    if error is None:
+                        self.written += 1
+                    else:
+                        self.errors.append(error)
+            finally:
+                self.queue.task_done()
@@ -0,0 +1,780 @@
+import os
+import argparse
+import importlib.util
+import inspect
+import logging
+import cProfile
+import pstats
+from concurrent.futures import ProcessPoolExecutor
+import cv2
+import numpy as np
+from .image_processor import ImageProcessor
+from .contour_processor import ContourProcessor
+from .circle_detector import CircleDetector, Detection
+from .ransac_detector import RansacCircleDetector
+from .roundness_calculator import RoundnessCalculator, METHOD_NAMES
+from .visualizer import Visualizer
+from .stream_pipeline import FrameSource, StreamPipeline, VIDEO_EXTENSIONS
+from .tiled_processor import TiledProcessor
+from .pyramid_detector import PyramidDetector
+from .stage_cache import StageCache
+from .image_writer import ImageWriter
+from .image_loader import ImageLoader
+from .metrics import Metrics, null_timer
+from .dataset_pack import DatasetPack
+from .contour_batch import ContourBatch
+from .point_decimator import PointDecimator
+
+logger = logging.getLogger(__name__)
+
+# Output images written by process_image, from none to all
+RENDER_LEVELS = ('none', 'thumbnails', 'preview', 'summary', 'full')
+
+def parse_args():
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description='Circle Detection and Roundness Calculation')
+    parser.add_argument('--image_path', type=str, required=True,
+                        help='Path to the input image, image directory or dataset pack (.pack, see dataset_pack.py)')
+    parser.add_argument('--method', type=str, default='min_zone', 
+                        choices=list(METHOD_NAMES) + ['all'],
+                        help='Method for roundness calculation, or all to evaluate every method in one pass')
+    parser.add_argument('--output_dir', type=str, default='output', help='Directory to save output images')
+    parser.add_argument('--show', action='store_true', help='Show visualization')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Number of worker processes for directory input (0 uses all cores)')
+    parser.add_argument('--stream', action='store_true',
+                        help='Treat image_path as a stream: a video file or a directory watched for new images')
+    parser.add_argument('--queue_size', type=int, default=4,
+                        help='Maximum number of frames queued in front of each streaming stage')
+    parser.add_argument('--track', action='store_true',
+                        help='For streams, follow parts from frame to frame: solvers start from the previous '
+                             'optimal centers and unchanged parts reuse their previous measurement')
+    parser.add_argument('--idle_timeout', type=float, default=None,
+                        help='Stop watching a stream directory after this many seconds without new images')
+    parser.add_argument('--tile_size', type=int, default=0,
+                        help='Process large images in overlapping tiles of this size (0 disables tiling)')
+    parser.add_argument('--tile_overlap', type=int, default=256,
+                        help='Tile overlap in pixels; should exceed the largest part diameter')
+    parser.add_argument('--pyramid_levels', type=int, default=0,
+                        help='Detect circles on an image downsampled 2**levels times and refine them '
+                             'at full resolution only around each circle (0 disables the pyramid)')
+    parser.add_argument('--pyramid_tolerance', type=float, default=None,
+                        help='Check pyramid results against full-frame processing and warn when a '
+                             'roundness differs by more than this many pixels')
+    parser.add_argument('--detector', type=str, default='circularity', choices=['circularity', 'ransac'],
+                        help='Circle detection engine: keep contours that pass the circularity test, or '
+                             'also find circles in broken or merged contours with RANSAC (not used with '
+                             '--pyramid_levels)')
+    parser.add_argument('--kernels', type=str, default='numpy', choices=['numpy', 'numba'],
+                        help='Distance kernels of the roundness optimizers: NumPy, or compiled with the '
+                             'optional numba package, which pays off for long runs but takes seconds to '
+                             'compile on first use')
+    parser.add_argument('--decimate', type=float, default=None,
+                        help='Measure roundness on the full contour, decimated to the points needed to keep '
+                             'the roundness error within this many pixels, and report the bound achieved')
+    parser.add_argument('--render', type=str, default='full', choices=RENDER_LEVELS,
+                        help='Output images to write: none, an annotated thumbnail per part, a '
+                             'downscaled annotated preview, one full-size annotated summary image, '
+                             'or all intermediate and per-circle images')
+    parser.add_argument('--preview_scale', type=float, default=0.25,
+                        help='Scale of the preview image for --render preview')
+    parser.add_argument('--decode', type=str, default='color', choices=['color', 'gray'],
+                        help='Decode images for detection in color, or straight to grayscale (faster; '
+                             'gray levels of JPEG images can differ slightly)')
+    parser.add_argument('--decode_reduction', type=int, default=1, choices=[1, 2, 4, 8],
+                        help='Decode images for detection at 1/N of their size, for parts that do not '
+                             'need full resolution')
+    parser.add_argument('--prefetch', type=int, default=2,
+                        help='Number of images a directory batch decodes ahead (0 disables prefetching)')
+    parser.add_argument('--cache_dir', type=str, default=None,
+                        help='Directory of an on-disk cache of edges, contours and detections '
+                             'shared across runs (disabled if not given)')
+    parser.add_argument('--cache_size_mb', type=int, default=1024,
+                        help='Maximum size of the cache; least recently used entries are evicted')
+    parser.add_argument('--metrics', type=str, default=None,
+                        help='Record stage timings and item counts of every image (not for streams) and write them to this '
+                             'file: Prometheus text if it ends in .prom, JSON lines otherwise')
+    parser.add_argument('--profile', type=str, default=None,
+                        help='Profile processing of a single image with cProfile and dump the pstats to '
+                             'this file (background image writes are not included)')
+    args = parser.parse_args()
+    # Images and streams both build their roundness calculator from --kernels
+    if args.kernels == 'numba' and importlib.util.find_spec('numba') is None:
+        parser.error('--kernels numba needs the numba package; install it with pip install ".[jit]"')
+    return args
+
+def create_components(options=None):
+    """
+    Create the pipeline components used by process_image.
+    
+    Args:
+        options (dict): Pipeline options. 'tile_size' > 0 enables tiled contour
+            extraction with 'tile_overlap' pixels of overlap and 'tile_workers' threads.
+            'pyramid_levels' > 0 enables coarse-to-fine detection, checked against
+            full-frame processing when 'pyramid_tolerance' is set; it takes
+            precedence over tiling. 'cache_dir' enables the stage cache, limited
+            to 'cache_size_mb' megabytes. 'writer_workers' and 'writer_queue_size'
+            configure the background image writer and 'preview_scale' the size of
+            preview images. 'decode' ('color' or 'gray') and 'decode_reduction'
+            select how images are decoded for detection and 'prefetch' how many
+            images a batch decodes ahead. 'metrics_path' enables instrumentation.
+            'detector' selects the detection engine, 'circularity' or 'ransac'.
+            'pack' is the path of a DatasetPack to take images from by name.
+            'kernels' selects the distance kernels of the roundness calculator,
+            'numpy' or 'numba'. 'decimate' is a roundness error budget in pixels: parts are measured on
+            their full contours, decimated by a PointDecimator within the budget.
+    
+    Returns:
+        dict: Component instances keyed by name.
+    """
+    options = options or {}
+    image_processor = ImageProcessor()
+    contour_processor = ContourProcessor()
+    circle_detector = CircleDetector()
+    components = {
+        'image_processor': image_processor,
+        'contour_processor': contour_processor,
+        'circle_detector': RansacCircleDetector() if options.get('detector') == 'ransac' else circle_detector,
+        'roundness_calculator': RoundnessCalculator(options.get('kernels', 'numpy')),
+        'visualizer': Visualizer(options.get('preview_scale', 0.25)),
+        'tiled_processor': None,
+        'pyramid_detector': None,
+        'stage_cache': None,
+        'image_writer': ImageWriter(options.get('writer_workers', 2), options.get('writer_queue_size', 8)),
+        'image_loader': ImageLoader(options.get('decode') == 'gray', options.get('decode_reduction', 1),
+                                    options.get('prefetch', 2), image_processor=image_processor,
+                                    pack=DatasetPack(options['pack']) if options.get('pack') else None),
+        'metrics': Metrics() if options.get('metrics_path') else None,
+        'point_decimator': None,
+    }
+    if options.get('tile_size', 0) > 0:
+        components['tiled_processor'] = TiledProcessor(options['tile_size'], options.get('tile_overlap', 256),
+                                                       options.get('tile_workers'), image_processor)
+    if options.get('pyramid_levels', 0) > 0:
+        components['pyramid_detector'] = PyramidDetector(options['pyramid_levels'],
+                                                         tolerance=options.get('pyramid_tolerance'),
+                                                         image_processor=image_processor,
+                                                         contour_processor=contour_processor,
+                                                         circle_detector=circle_detector)
+    if options.get('decimate'):
+        components['point_decimator'] = PointDecimator(options['decimate'],
+                                                       roundness_calculator=components['roundness_calculator'])
+    if options.get('cache_dir'):
+        components['stage_cache'] = StageCache(options['cache_dir'], options.get('cache_size_mb', 1024) << 20)
+    return components
+
+def process_image(image_path, method='min_zone', output_dir='output', show=False, components=None,
+                  render='full', loaded_image=None):
+    """
+    Process an image to detect circles and calculate roundness.
+    
+    Args:
+        image_path (str): Path to the input image.
+        method (str): Method for roundness calculation, or 'all' for every method.
+        output_dir (str): Directory to save output images.
+        show (bool): Whether to show visualization.
+        components (dict): Pipeline components from create_components() to reuse
+            across images. New components are created if not given. Images
+            are written by the components' image writer in the background;
+            call its flush() before relying on the files. With instrumentation
+            enabled, the record of the image is left in the components' metrics.
+        render (str): Output images to write: 'none'; 'thumbnails' for an annotated
+            crop around each part; 'preview' for a downscaled annotated image;
+            'summary' for a full-size annotated image; or 'full' for the edge,
+            contour and circle images and one image per circle and method.
+        loaded_image (LoadedImage): The image, if already loaded by the components'
+            image loader, e.g. prefetched.
+        
+    Returns:
+        dict: Results including circles and roundness.
+    """
+    if render not in RENDER_LEVELS:
+        raise ValueError(f"Unknown render level: {render}")
+    
+    # Create output directory if it doesn't exist
+    if render != 'none':
+        os.makedirs(output_dir, exist_ok=True)
+    
+    # Initialize components
+    owns_components = components is None
+    if owns_components:
+        components = create_components()
+    contour_processor = components['contour_processor']
+    roundness_calculator = components['roundness_calculator']
+    visualizer = components['visualizer']
+    image_writer = components.get('image_writer')
+    point_decimator = components.get('point_decimator')
+    metrics = components.get('metrics')
+    timer = metrics.timer if metrics is not None else null_timer
+    if metrics is not None:
+        metrics.begin(image_path)
+    
+    def save(image, filename):
+        path = os.path.join(output_dir, filename)
+        if image_writer is not None:
+            image_writer.submit(image, path)
+        else:
+            visualizer.save_image(image, path)
+        return path
+    
+    # Detect circles, reusing cached stages where possible
+    if loaded_image is None:
+        loaded_image = components['image_loader'].load(image_path)
+    edges, filtered_contours, detections = detect_stages(image_path, loaded_image, components, render == 'full')
+    circles = [detection.circle for detection in detections]
+    
+    # The color image is only decoded if something is drawn
+    if render != 'none' or show:
+        with timer('decode_color'):
+            image = loaded_image.color
+    else:
+        image = None
+    
+    if render == 'full':
+        # Draw contours and circles
+        with timer('render'):
+            contour_image = visualizer.draw_contours(image, filtered_contours)
+            circle_image = visualizer.draw_circles(contour_image, circles)
+        
+        # Save intermediate results
+        save(edges, 'edges.jpg')
+        save(contour_image, 'contours.jpg')
+        save(circle_image, 'circles.jpg')
+    
+    # Process each detected circle
+    results = []
+    for i, detection in enumerate(detections):
+        center_x, center_y, radius = detection.circle
+        
+        # Calculate roundness using the specified method(s), on the single-line
+        # representation of the contour the circle was fitted to, or on the
+        # whole contour decimated within the error budget
+        bounds = None
+        if point_decimator is not None:
+            points = detection.contour.reshape(-1, 2)
+            with timer('roundness'):
+                measurements, bounds = point_decimator.measure(points, method)
+        else:
+            with timer('single_line_processing'):
+                points = contour_processor.single_line_processing(detection.contour)
+            with timer('roundness'):
+                measurements = roundness_calculator.measure(points, method)
+        if metrics is not None:
+            metrics.count('contour_points', len(points))
+            if point_decimator is not None:
+                metrics.count('decimated_points', point_decimator.stats['kept'])
+            for method_key, iterations in roundness_calculator.iterations.items():
+                metrics.count(f'{method_key}_solver_work', iterations)
+        
+        for method_key, (inner_circle, outer_circle, roundness) in measurements.items():
+            method_name = METHOD_NAMES[method_key]
+            result_filename = None
+            
+            if render == 'full' or show:
+                # Visualize roundness
+                with timer('render'):
+                    result_image = visualizer.visualize_roundness(image, inner_circle, outer_circle, method_name)
+                
+                # Save result
+                if render == 'full':
+                    result_filename = save(result_image, f'result_{i}_{method_key}.jpg')
+                
+                # Show result if requested
+                if show:
+                    visualizer.display_image(result_image, f"Circle {i} - {method_name}")
+            
+            # Store result
+            results.append({
+                'circle_index': i,
+                'contour_index': detection.contour_index,
+                'center': (center_x, center_y),
+                'radius': radius,
+                'inner_circle': inner_circle,
+                'outer_circle': outer_circle,
+                'roundness': roundness,
+                'method': method_key,
+                'result_image_path': result_filename
+            })
+            if bounds is not None:
+                results[-1]['error_bound'] = bounds[method_key]
+    
+    if render in ('summary', 'preview', 'thumbnails'):
+        # Draw every part and its roundness onto one canvas
+        measurements = []
+        for i in range(len(detections)):
+            circle_results = [result for result in results if result['circle_index'] == i]
+            label = "\n".join(f"#{i} {result['method']}: {result['roundness']:.2f}" for result in circle_results)
+            for result in circle_results:
+                measurements.append((result['inner_circle'], result['outer_circle'], label))
+                label = ""
+        scale = visualizer.preview_scale if render == 'preview' else 1.0
+        with timer('render'):
+            canvas = visualizer.render_overlay(image, filtered_contours, circles, measurements, scale)
+        
+        if render == 'thumbnails':
+            for i, thumbnail in enumerate(visualizer.thumbnails(canvas, circles, scale)):
+                thumbnail_filename = save(thumbnail, f'part_{i}.jpg')
+                for result in results:
+                    if result['circle_index'] == i:
+                        result['result_image_path'] = thumbnail_filename
+        else:
+            summary_filename = save(canvas, f'{render}.jpg')
+            for result in results:
+                result['result_image_path'] = summary_filename
+    
+    if metrics is not None:
+        metrics.end()
+    
+    if owns_components and image_writer is not None:
+        errors = image_writer.close()
+        if errors:
+            raise ValueError("; ".join(errors))
+    
+    return results
+
+def stage_params(components):
+    """
+    Describe the parameters of each cached pipeline stage.
+    
+    The values are read from the processor constants and components, so
+    tuning a default there invalidates the cached results that depend on it.
+    
+    Args:
+        components (dict): Pipeline components from create_components().
+        
+    Returns:
+        dict: JSON-serializable parameters keyed by stage name.
+    """
+    pyramid_detector = components.get('pyramid_detector')
+    tiled_processor = components.get('tiled_processor')
+    if pyramid_detector is not None:
+        mode = ['pyramid', pyramid_detector.levels, pyramid_detector.margin, pyramid_detector.min_margin,
+                pyramid_detector.coarse_circularity, pyramid_detector.max_fraction]
+    elif tiled_processor is not None:
+        mode = ['tiled', tiled_processor.tile_size, tiled_processor.overlap]
+    else:
+        mode = ['full']
+    image_loader = components['image_loader']
+    decode = ['gray' if image_loader.grayscale else 'color', image_loader.reduction]
+    image_processor = components['image_processor']
+    contour_processor = components['contour_processor']
+    circle_detector = components['circle_detector']
+    if isinstance(circle_detector, RansacCircleDetector):
+        # Every constructor parameter, so a new one cannot be left out of the key
+        names = list(inspect.signature(RansacCircleDetector.__init__).parameters)[1:]
+        detector = ['ransac', {name: getattr(circle_detector, name) for name in names}]
+    else:
+        detector = ['circularity']
+    return {
+        'edges': {'mode': mode, 'decode': decode, 'blur': image_processor.BLUR_SIZE,
+                  'canny': list(image_processor.CANNY_THRESHOLDS),
+                  'close': image_processor.CLOSE_KERNEL.astype(int).tolist()},
+        'contours': {'retrieval': image_processor.CONTOUR_RETRIEVAL,
+                     'approximation': image_processor.CONTOUR_APPROXIMATION},
+        'detections': {'min_area': contour_processor.MIN_AREA, 'min_perimeter': contour_processor.MIN_PERIMETER,
+                       'filter_circularity': circle_detector.CONTOUR_CIRCULARITY,
+                       'circularity': circle_detector.CIRCULARITY, 'detector': detector},
+    }
+
+def detect_stages(image_path, loaded_image, components, need_edges=True):
+    """
+    Run edge detection, contour extraction and circle detection on an image.
+    
+    With a stage cache, processing restarts from the deepest stage found in
+    the cache and the stages computed are stored for the next run; the image
+    is only decoded if a stage has to be computed.
+    
+    Args:
+        image_path (str): Path the image was loaded from; its content keys the cache
+            unless the loaded image carries its content hash.
+        loaded_image (LoadedImage): The image, decoded on first use.
+        components (dict): Pipeline components from create_components().
+        need_edges (bool): Whether the edge image is used; if not, stages restored
+            from the cache do not load or recompute it.
+        
+    Returns:
+        tuple: Edge image (at the decoded size, or None if not needed and not
+            computed), filtered contours and list of Detection objects, both in
+            full-size image coordinates.
+    """
+    image_processor = components['image_processor']
+    contour_processor = components['contour_processor']
+    circle_detector = components['circle_detector']
+    pyramid_detector = components.get('pyramid_detector')
+    tiled_processor = components.get('tiled_processor')
+    cache = components.get('stage_cache')
+    metrics = components.get('metrics')
+    timer = metrics.timer if metrics is not None else null_timer
+    
+    def decode():
+        with timer('decode'):
+            return loaded_image.image
+    
+    def compute_edges():
+        image = decode()
+        with timer('preprocess'):
+            processed_image = image_processor.preprocess(image)
+        with timer('detect_edges'):
+            return image_processor.detect_edges(processed_image)
+    
+    keys = None
+    if cache is not None:
+        if loaded_image.key is not None:
+            image_key = loaded_image.key
+        elif loaded_image.data is not None:
+            image_key = cache.data_key(loaded_image.data)
+        else:
+            image_key = cache.image_key(image_path)
+        keys = cache.stage_keys(image_key, stage_params(components))
+        cached = cache.get('detections', keys['detections'])
+        if cached is not None:
+            filtered_contours, detections = cached
+            edges = cache.get('edges', keys['edges']) if need_edges else None
+            if need_edges and edges is None:
+                edges = compute_edges()
+                cache.put('edges', keys['edges'], edges)
+            if metrics is not None:
+                metrics.count('circles', len(detections))
+            return edges, filtered_contours, detections
+    
+    # Size limits apply to full-size parts
+    reduction = loaded_image.reduction
+    min_area = contour_processor.MIN_AREA / reduction**2
+    min_perimeter = contour_processor.MIN_PERIMETER / reduction
+    
+    edges = None
+    edges_cached = False
+    if pyramid_detector is not None:
+        # Detect coarse-to-fine; only the edges around each circle are computed
+        image = decode()
+        edges = np.zeros(image.shape[:2], dtype=np.uint8)
+        with timer('pyramid_detect'):
+            detections = pyramid_detector.detect(image, edges, min_area, min_perimeter)
+        filtered_contours = [detection.contour for detection in detections]
+        logger.info("Pyramid: %.1f%% of pixels processed at full resolution",
+                    pyramid_detector.stats['full_res_fraction'] * 100)
+        if pyramid_detector.tolerance is not None:
+            def measure(detection):
+                points = contour_processor.single_line_processing(detection.contour)
+                return components['roundness_calculator'].measure(points, 'min_zone')['min_zone'][2]
+            check = pyramid_detector.validate(image, detections, measure, min_area, min_perimeter)
+            if not check['within_tolerance']:
+                logger.warning("Pyramid results of %s differ from full-frame processing (%d parts missed, "
+                               "max roundness difference %.3f pixels)", image_path, check['missed'],
+                               check['max_deviation'])
+    else:
+        contours = cache.get('contours', keys['contours']) if cache is not None else None
+        if cache is not None and ((contours is not None and need_edges) or
+                                  (contours is None and tiled_processor is None)):
+            edges = cache.get('edges', keys['edges'])
+            edges_cached = edges is not None
+        if contours is None:
+            if tiled_processor is not None:
+                image = decode()
+                edges = np.zeros(image.shape[:2], dtype=np.uint8)
+                with timer('tiled_contours'):
+                    contours = tiled_processor.extract_contours(image, edges)
+            else:
+                if edges is None:
+                    edges = compute_edges()
+                with timer('extract_contours'):
+                    contours = image_processor.extract_contours(edges)
+            if cache is not None:
+                cache.put('contours', keys['contours'], contours)
+        elif edges is None and need_edges:
+            edges = compute_edges()
+        
+        # Filter contours and detect circles; the shape properties of all contours
+        # are computed once by the batch and reused by the detector
+        with timer('filter_contours'):
+            filtered = contour_processor.filter_contours(ContourBatch.from_contours(contours), min_area,
+                                                         min_perimeter, circle_detector.CONTOUR_CIRCULARITY)
+        with timer('detect_circles'):
+            detections = circle_detector.detect(filtered)
+        # Views into the batch's point buffer
+        filtered_contours = list(filtered)
+        if metrics is not None:
+            metrics.count('raw_contours', len(contours))
+            metrics.count('filtered_contours', len(filtered_contours))
+    
+    if reduction != 1:
+        filtered_contours, detections = scale_detections(filtered_contours, detections, reduction)
+    
+    if cache is not None:
+        if not edges_cached and edges is not None:
+            cache.put('edges', keys['edges'], edges)
+        cache.put('detections', keys['detections'], (filtered_contours, detections))
+    if metrics is not None:
+        metrics.count('circles', len(detections))
+    return edges, filtered_contours, detections
+
+def scale_detections(contours, detections, reduction):
+    """
+    Map contours and detections from a reduced-size image to full-size coordinates.
+    
+    Args:
+        contours (list): Contours in reduced-size coordinates.
+        detections (list): Detection objects whose contour_index refers to contours.
+        reduction (int): Size reduction of the image the detections were made on.
+        
+    Returns:
+        tuple: Scaled contours and scaled Detection objects.
+    """
+    # A reduced pixel covers `reduction` full-size pixels; map to their middle,
+    # rounded down to a whole pixel so the integer contours and the circles agree
+    offset = (reduction - 1) // 2
+    contours = [contour * reduction + offset for contour in contours]
+    scaled = []
+    for detection in detections:
+        center_x, center_y, radius = detection.circle
+        centroid_x, centroid_y = detection.centroid
+        scaled.append(Detection(detection.contour_index, contours[detection.contour_index],
+                                (center_x * reduction + offset, center_y * reduction + offset, radius * reduction),
+                                (centroid_x * reduction + offset, centroid_y * reduction + offset),
+                                detection.area * reduction**2, detection.perimeter * reduction))
+    return contours, scaled
+
+# Components kept warm in each worker process of the batch pool
+_worker_components = None
+
+def _init_worker(opencv_threads, options):
+    """
+    Initialize a batch worker process.
+    
+    Args:
+        opencv_threads (int): Number of threads OpenCV may use in this worker.
+        options (dict): Pipeline options passed to create_components().
+    """
+    global _worker_components
+    cv2.setNumThreads(opencv_threads)
+    _worker_components = create_components(dict(options or {}, tile_workers=opencv_threads))
+
+def _run_task(task, components, show=False, flush=False, loaded_image=None):
+    """
+    Process one image of a batch.
+    
+    Args:
+        task (tuple): Image path, roundness method, output directory and render level.
+        components (dict): Pipeline components from create_components().
+        show (bool): Whether to show visualization.
+        flush (bool): Whether to wait for the output images of this image to be
+            written, reporting failed writes as an error of the image.
+        loaded_image (LoadedImage): The image, if already loaded.
+        
+    Returns:
+        tuple: Results and None on success, or None and the error message on
+            failure, followed by the stage cache statistics and the metrics
+            record of this image (each None if disabled).
+    """
+    image_path, method, output_dir, render = task
+    try:
+        outcome = process_image(image_path, method, output_dir, show, components, render, loaded_image), None
+        if flush:
+            errors = components['image_writer'].flush()
+            if errors:
+                outcome = None, "; ".join(errors)
+    except Exception as e:
+        outcome = None, str(e)
+    cache = components.get('stage_cache')
+    metrics = components.get('metrics')
+    return outcome + (cache.pop_stats() if cache is not None else None,
+                      metrics.pop_record() if metrics is not None else None)
+
+def _process_image_task(task):
+    """
+    Process one image in a batch worker process.
+    
+    The output images are written before the task returns, since the
+    worker may be shut down as soon as the last result arrives.
+    
+    Args:
+        task (tuple): Image path, roundness method, output directory and render level.
+        
+    Returns:
+        tuple: See _run_task().
+    """
+    return _run_task(task, _worker_components, flush=True)
+
+def process_all_images(dataset_dir, method='min_zone', output_dir='output', show=False, workers=1,
+                       options=None, render='full'):
+    """
+    Process all images in a dataset directory or dataset pack.
+    
+    Images of a pack are not decoded; each worker maps the pack file, so
+    all workers share it through the OS page cache.
+    
+    Args:
+        dataset_dir (str): Path to the dataset directory, or to a pack file.
+        method (str): Method for roundness calculation, or 'all' for every method.
+        output_dir (str): Directory to save output images.
+        show (bool): Whether to show visualization. Ignored when workers > 1.
+        workers (int): Number of worker processes; 0 uses all cores.
+        options (dict): Pipeline options passed to create_components().
+        render (str): Output images to write for each image, see process_image().
+        
+    Returns:
+        dict: Results for all images, in directory listing order or pack order.
+    """
+    if os.path.isfile(dataset_dir):
+        # Images are taken from the pack by name
+        options = dict(options or {}, pack=dataset_dir)
+        image_files = DatasetPack(dataset_dir).names
+        image_dir = ''
+    else:
+        # Get all image files in the dataset directory
+        image_files = [f for f in os.listdir(dataset_dir) if f.lower().endswith(('.jpg', '.jpeg', '.png'))]
+        image_dir = dataset_dir
+    tasks = [(os.path.join(image_dir, image_file), method,
+              os.path.join(output_dir, os.path.splitext(image_file)[0]), render)
+             for image_file in image_files]
+    
+    if workers == 0:
+        workers = os.cpu_count() or 1
+    workers = min(workers, len(tasks))
+    
+    if workers > 1:
+        # Split the cores between workers so OpenCV does not oversubscribe them
+        opencv_threads = max(1, (os.cpu_count() or 1) // workers)
+        executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                       initargs=(opencv_threads, options))
+        outcomes = iter(executor.map(_process_image_task, tasks))
+    else:
+        executor = None
+        # Images are decoded ahead and written in the background while the
+        # current image is processed
+        components = create_components(options)
+        loaded_images = components['image_loader'].iterate([task[0] for task in tasks])
+        outcomes = (_run_task(task, components, show, loaded_image=loaded_image)
+                    for task, loaded_image in zip(tasks, loaded_images))
+    
+    all_results = {}
+    cache_stats = None
+    # Records of all workers are aggregated here
+    metrics_path = (options or {}).get('metrics_path')
+    metrics = Metrics() if metrics_path else None
+    
+    try:
+        for image_file in image_files:
+            print(f"Processing image: {image_file}")
+            results, error, stats, record = next(outcomes)
+            if stats is not None:
+                cache_stats = StageCache.merge_stats(cache_stats, stats)
+            if record is not None:
+                metrics.add(record)
+            
+            if error is not None:
+                print(f"Error processing {image_file}: {error}")
+                continue
+            
+            all_results[image_file] = results
+            
+            # Print results
+            for result in results:
+                bound = f" (error bound {result['error_bound']:.3f})" if 'error_bound' in result else ""
+                print(f"  Circle {result['circle_index']}: {METHOD_NAMES[result['method']]} "
+                      f"Roundness = {result['roundness']:.2f} pixels{bound}")
+    finally:
+        if executor is not None:
+            executor.shutdown()
+        else:
+            for error in components['image_writer'].close():
+                print(f"Error writing output: {error}")
+    
+    if cache_stats is not None:
+        print("Stage cache: " + ", ".join(f"{stage} {cache_stats[stage]['hits']} hits "
+                                          f"{cache_stats[stage]['misses']} misses"
+                                          for stage in StageCache.STAGES)
+              + f", {cache_stats['evictions']} evictions")
+    
+    if metrics is not None:
+        metrics.export(metrics_path)
+        print(f"Metrics of {len(metrics.records)} images written to {metrics_path}")
+    
+    return all_results
+
+def process_stream(source, method='min_zone', queue_size=4, idle_timeout=None, track=False, kernels='numpy'):
+    """
+    Process a video file or a growing image directory as a stream of frames.
+    
+    Args:
+        source (str): Path to a video file or an image directory.
+        method (str): Method for roundness calculation, or 'all' for every method.
+        queue_size (int): Maximum number of frames queued in front of each stage.
+        idle_timeout (float): Seconds without new images after which directory
+            watching stops. None watches until interrupted.
+        track (bool): Follow parts across frames, see CircleTracker.
+        kernels (str): Distance kernels of the roundness calculator, 'numpy' or 'numba'.
+        
+    Returns:
+        dict: Results for all frames, keyed by frame index or file name.
+    """
+    pipeline = StreamPipeline(method, queue_size, track, kernels)
+    all_results = {}
+    
+    def on_result(frame_result):
+        frame = frame_result['frame']
+        if 'error' in frame_result:
+            print(f"Error processing frame {frame}: {frame_result['error']}")
+            return
+        all_results[frame] = frame_result['results']
+        print(f"Frame {frame}: {len(frame_result['results'])} measurements, queues {pipeline.queue_depths()}")
+    
+    report = pipeline.run(FrameSource(source, idle_timeout=idle_timeout), on_result)
+    
+    print(f"Processed {report['frames']} frames at {report['fps']:.1f} fps")
+    for stage, stats in report['stages'].items():
+        print(f"  {stage}: busy {stats['busy']:.2f} s, queue depth mean {stats['mean_depth']:.1f} "
+              f"max {stats['max_depth']}")
+    if 'tracking' in report:
+        tracking = report['tracking']
+        print(f"  Tracking: {tracking['cold']} cold, {tracking['warm_started']} warm-started and "
+              f"{tracking['reused']} reused measurements; {tracking['evaluations']} solver evaluations, "
+              f"{tracking['evaluations_saved']} saved")
+    
+    return all_results
+
+def main():
+    """Main function."""
+    args = parse_args()
+    options = {'preview_scale': args.preview_scale, 'tile_size': args.tile_size, 'tile_overlap': args.tile_overlap,
+               'pyramid_levels': args.pyramid_levels, 'pyramid_tolerance': args.pyramid_tolerance,
+               'cache_dir': args.cache_dir, 'cache_size_mb': args.cache_size_mb,
+               'decode': args.decode, 'decode_reduction': args.decode_reduction, 'prefetch': args.prefetch,
+               'metrics_path': args.metrics, 'detector': args.detector, 'decimate': args.decimate,
+               'kernels': args.kernels}
+    if args.profile and (not os.path.isfile(args.image_path) or args.image_path.endswith(DatasetPack.EXTENSION)):
+        raise SystemExit("--profile needs a single image as --image_path")
+    
+    if args.stream or args.image_path.lower().endswith(VIDEO_EXTENSIONS):
+        # Process a video file or a watched directory as a stream of frames
+        all_results = process_stream(args.image_path, args.method, args.queue_size, args.idle_timeout,
+                                     args.track, args.kernels)
+    elif os.path.isdir(args.image_path) or args.image_path.endswith(DatasetPack.EXTENSION):
+        # Process all images in the directory or pack
+        all_results = process_all_images(args.image_path, args.method, args.output_dir, args.show,
+                                         args.workers, options, args.render)
+    else:
+        # Process a single image
+        components = create_components(options)
+        profiler = cProfile.Profile() if args.profile else None
+        if profiler is not None:
+            profiler.enable()
+        results = process_image(args.image_path, args.method, args.output_dir, args.show,
+                                components, args.render)
+        if profiler is not None:
+            profiler.disable()
+            profiler.dump_stats(args.profile)
+            print(f"Profile written to {args.profile}; the slowest functions:")
+            pstats.Stats(profiler).sort_stats('cumulative').print_stats(15)
+        for error in components['image_writer'].close():
+            print(f"Error writing output: {error}")
+        metrics = components['metrics']
+        if metrics is not None:
+            metrics.add(metrics.pop_record())
+            metrics.export(args.metrics)
+        all_results = {os.path.basename(args.image_path): results}
+    
+    print("Processing complete.")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,180 @@
+import os
+import json
+import time
+import tempfile
+from contextlib import contextmanager, nullcontext
+import numpy as np
+
+# Upper bounds of the histogram buckets, Prometheus style (value <= bound)
+SECONDS_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000, 20000, 50000, 100000)
+
+_NULL_TIMER = nullcontext()
+
+def null_timer(stage):
+    """
+    Timer used when instrumentation is disabled; it does nothing.
+
+    Args:
+        stage (str): Name of the stage, ignored.
+
+    Returns:
+        contextlib.nullcontext: A shared no-op context manager.
+    """
+    return _NULL_TIMER
+
+class Metrics:
+    """
+    Class for recording per-image stage timings and item counts.
+
+    process_image records into the current image record through timer()
+    and count(). Records are taken with pop_record(), which lets batch
+    workers return them to the parent process, and aggregated into
+    histograms with add(). Code paths check for a missing Metrics object
+    (or use null_timer), so disabled instrumentation costs nothing.
+    """
+
+    def __init__(self):
+        self.record = None
+        self._start = None
+        self.records = []
+        # (metric, label) -> [bucket counts, sum, count]
+        self.histograms = {}
+
+    def begin(self, image):
+        """
+        Start the record of an image.
+
+        Args:
+            image (str): Path or name of the image.
+        """
+        self.record = {'image': image, 'seconds': {}, 'counts': {}}
+        self._start = time.perf_counter()
+
+    def end(self):
+        """
+        Record the total wall time of the current image since begin().
+        """
+        self.record['seconds']['total'] = time.perf_counter() - self._start
+
+    @contextmanager
+    def timer(self, stage):
+        """
+        Add the wall time of a block to a stage of the current image.
+
+        Args:
+            stage (str): Name of the stage.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = self.record['seconds']
+            seconds[stage] = seconds.get(stage, 0.0) + time.perf_counter() - start
+
+    def count(self, item, value):
+        """
+        Record an item count of the current image, e.g. the points of one contour.
+
+        Args:
+            item (str): Name of the counted item.
+            value (int): The count.
+        """
+        self.record['counts'].setdefault(item, []).append(int(value))
+
+    def pop_record(self):
+        """
+        Take the record of the current image.
+
+        Returns:
+            dict: Image, seconds per stage and lists of counts per item, or None.
+        """
+        record, self.record = self.record, None
+        return record
+
+    def add(self, record):
+        """
+        Aggregate the record of an image into the histograms.
+
+        Args:
+            record (dict): Record from pop_record(), possibly of another process.
+        """
+        self.records.append(record)
+        for stage, seconds in record['seconds'].items():
+            self._observe('stage_seconds', stage, SECONDS_BUCKETS, seconds)
+        for item, values in record['counts'].items():
+            for value in values:
+                self._observe('items', item, COUNT_BUCKETS, value)
+
+    def export(self, path):
+        """
+        Write the metrics to a file, in a format chosen by its extension.
+
+        '.prom' writes histograms in the Prometheus text format, e.g. for the
+        node exporter's textfile collector. Anything else writes JSON lines:
+        one record per image followed by one line per histogram.
+
+        Args:
+            path (str): Path of the output file.
+        """
+        if path.endswith('.prom'):
+            content = self.prometheus_text()
+        else:
+            lines = [json.dumps(dict(record, type='image')) for record in self.records]
+            for (metric, label), (buckets, total, count) in sorted(self.histograms.items()):
+                lines.append(json.dumps({'type': 'histogram', 'metric': metric, 'label': label,
+                                         'buckets': self._bounds(metric),
+                                         'counts': buckets.tolist(), 'sum': total, 'count': count}))
+            content = "".join(line + "\n" for line in lines)
+
+        # Write atomically, so a collector never reads a partial file
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, temp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                f.write(content)
+            os.replace(temp_path, path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+
+    def prometheus_text(self):
+        """
+        Format the histograms in the Prometheus text exposition format.
+
+        Returns:
+            str: The metrics.
+        """
+        descriptions = {
+            'stage_seconds': ('stage', "Wall time of each pipeline stage per image."),
+            'items': ('item', "Item counts: contours and circles per image, points per contour, "
+                              "solver candidates or iterations per part."),
+        }
+        lines = []
+        for metric, (label_name, description) in descriptions.items():
+            name = f'detection_circle_{metric}'
+            lines.append(f'# HELP {name} {description}')
+            lines.append(f'# TYPE {name} histogram')
+            for (histogram_metric, label), (buckets, total, count) in sorted(self.histograms.items()):
+                if histogram_metric != metric:
+                    continue
+                cumulative = np.cumsum(buckets)
+                for bound, value in zip(self._bounds(metric) + ['+Inf'], cumulative):
+                    lines.append(f'{name}_bucket{{{label_name}="{label}",le="{bound}"}} {value}')
+                lines.append(f'{name}_sum{{{label_name}="{label}"}} {total}')
+                lines.append(f'{name}_count{{{label_name}="{label}"}} {count}')
+        return "\n".join(lines) + "\n"
+
+    def _bounds(self, metric):
+        """Bucket upper bounds of a metric, as a list."""
+        return list(SECONDS_BUCKETS if metric == 'stage_seconds' else COUNT_BUCKETS)
+
+    def _observe(self, metric, label, bounds, value):
+        """Add one value to a histogram."""
+        histogram = self.histograms.get((metric, label))
+        if histogram is None:
+            # One bucket per bound plus the +Inf bucket
+            histogram = self.histograms[(metric, label)] = [np.zeros(len(bounds) + 1, dtype=np.int64), 0.0, 0]
+        histogram[0][np.searchsorted(bounds, value, side='left')] += 1
+        histogram[1] += value
+        histogram[2] += 1
@@ -0,0 +1,154 @@
+import numpy as np
+import cv2
+from .roundness_calculator import RoundnessCalculator, METHOD_NAMES
+
+class PointDecimator:
+    """
+    Class for measuring roundness on a subset of the contour points within an error budget.
+
+    The fixed approxPolyDP tolerance of ContourProcessor.single_line_processing()
+    gives no bound on how far the roundness moves. The decimator starts from
+    the convex hull vertices, which fix the circumscribed circle, and the
+    radial peaks and valleys around the least squares center, the points most
+    likely to touch the zone circles; the other points are dropped.
+
+    The solver result on the kept points is checked against all points at the
+    solver's center. While the budget is exceeded, the points outside the
+    zone found are added and the solver runs again from that center. The
+    reported circles are those of all points at the final center, so they
+    hold the whole contour, and the bound of each method is:
+
+    - min_zone: the reported roundness exceeds the minimum zone of all points
+      by at most the bound, since the minimum zone of the kept points is a
+      lower limit of it.
+    - min_circumscribed: the hull is kept, so the circle is that of all points; 0.
+    - least_squares: fitted on all points, as its cost is only linear; 0.
+    - max_inscribed: how far the dropped points reach into the inscribed
+      circle found on the kept points, a bound on the inscribed radius; the
+      roundness may move by more as the outer radius is taken at the
+      center found.
+    """
+
+    def __init__(self, budget=0.05, max_rounds=8, windows=64, roundness_calculator=None):
+        """
+        Initialize the decimator.
+
+        Args:
+            budget (float): Roundness error budget in pixels.
+            max_rounds (int): Maximum number of solver runs per method; the bound
+                achieved is reported even if it exceeds the budget.
+            windows (int): Number of windows around the contour in each of which the
+                radial peak and valley are kept.
+            roundness_calculator (RoundnessCalculator): Calculator used for measuring.
+        """
+        self.budget = budget
+        self.max_rounds = max_rounds
+        self.windows = windows
+        self.roundness_calculator = roundness_calculator or RoundnessCalculator()
+        # Point counts and solver runs of the last measurement
+        self.stats = {}
+
+    def select(self, points):
+        """
+        Choose the points to keep before solving.
+
+        Args:
+            points (numpy.ndarray): Contour points (N, 2), in contour order.
+
+        Returns:
+            numpy.ndarray: Indices of the kept points, in contour order.
+        """
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        n = len(points)
+        if n <= 3:
+            return np.arange(n)
+        center = self.roundness_calculator.least_squares_method(points)[0]
+        radii = np.hypot(points[:, 0] - center[0], points[:, 1] - center[1])
+        hull = cv2.convexHull(points.astype(np.float32), returnPoints=False).ravel()
+        anchors = np.unique(np.concatenate((hull, [np.argmax(radii), np.argmin(radii)])))
+
+        # Radial peaks and valleys: the largest and smallest radius within a
+        # window, so pixel noise does not make every other point an extremum
+        window = 2 * max(1, n // self.windows) + 1
+        windows = np.lib.stride_tricks.sliding_window_view(np.concatenate((radii[-(window // 2):], radii,
+                                                                           radii[:window // 2])), window)
+        keep = np.zeros(n, dtype=bool)
+        keep[anchors] = True
+        keep |= radii == np.max(windows, axis=1)
+        keep |= radii == np.min(windows, axis=1)
+        return np.flatnonzero(keep)
+
+    def measure(self, points, method='min_zone'):
+        """
+        Measure roundness on the kept points, refining until the budget is met.
+
+        Args:
+            points (numpy.ndarray): Contour points (N, 2), in contour order.
+            method (str): Method for roundness calculation (a key of METHOD_NAMES), or 'all'.
+
+        Returns:
+            tuple: Measurements of all points as returned by RoundnessCalculator.measure(),
+                and the error bound in pixels achieved for each method.
+        """
+        methods = list(METHOD_NAMES) if method == 'all' else [method]
+        if not set(methods) <= set(METHOD_NAMES):
+            raise ValueError(f"Unknown roundness method: {method}")
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        kept = self.select(points)
+        self.stats = {'points': len(points), 'kept': len(kept), 'rounds': 0}
+
+        measurements = {}
+        bounds = {}
+        iterations = {}
+        for key in methods:
+            if key == 'least_squares' or len(kept) == len(points):
+                measurements.update(self.roundness_calculator.measure(points, key))
+                bounds[key] = 0.0
+            elif key == 'min_circumscribed':
+                # The hull vertices fix the circle; the inner radius needs all points
+                outer = self.roundness_calculator.measure(points[kept], key)[key][1]
+                radii = np.hypot(points[:, 0] - outer[0], points[:, 1] - outer[1])
+                outer_radius = max(outer[2], np.max(radii))
+                measurements[key] = ((outer[0], outer[1], np.min(radii)), (outer[0], outer[1], outer_radius),
+                                     outer_radius - np.min(radii))
+                bounds[key] = 0.0
+            else:
+                measurements[key], bounds[key] = self._refine(points, kept, key)
+            iterations.update(self.roundness_calculator.iterations)
+        # Solver work of all methods, as after RoundnessCalculator.measure()
+        self.roundness_calculator.iterations = iterations
+        return measurements, bounds
+
+    def _refine(self, points, subset, method):
+        """
+        Solve on a subset, adding the points outside its zone until the bound meets the budget.
+
+        Returns:
+            tuple: Measurement (inner circle, outer circle, roundness) of all points
+                at the final center, and the bound achieved.
+        """
+        initial_centers = None
+        for round_index in range(self.max_rounds):
+            self.stats['rounds'] += 1
+            self.stats['kept'] = max(self.stats['kept'], len(subset))
+            inner, outer, roundness = self.roundness_calculator.measure(points[subset], method,
+                                                                        initial_centers)[method]
+            radii = np.hypot(points[:, 0] - inner[0], points[:, 1] - inner[1])
+            if method == 'min_zone':
+                bound = np.max(radii) - np.min(radii) - roundness
+                outside = (radii > outer[2]) | (radii < inner[2])
+            else:
+                bound = inner[2] - np.min(radii)
+                outside = radii < inner[2]
+            added = np.setdiff1d(np.flatnonzero(outside), subset)
+            if bound <= self.budget or not len(added):
+                break
+            subset = np.union1d(subset, added)
+            initial_centers = {method: inner[:2]}
+
+        center_x, center_y = inner[:2]
+        inner_radius = np.min(radii)
+        outer_radius = np.max(radii)
+        measurement = ((center_x, center_y, inner_radius), (center_x, center_y, outer_radius),
+                       outer_radius - inner_radius)
+        return measurement, max(float(bound), 0.0)
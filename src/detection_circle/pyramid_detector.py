@@ -0,0 +1,287 @@
+import cv2
+import numpy as np
+from .image_processor import ImageProcessor
+from .contour_processor import ContourProcessor
+from .circle_detector import CircleDetector, Detection
+
+class PyramidDetector:
+    """
+    Class for coarse-to-fine circle detection on an image pyramid.
+
+    Candidate circles are detected on a downsampled pyramid level. Edge and
+    contour extraction are then repeated at full resolution only inside an
+    annulus around each candidate. If the full resolution contour touches
+    the annulus mask, the annulus is widened and the extraction repeated, so
+    a part found on the coarse level gets the contour full-frame processing
+    would find. Parts the coarse level misses are not reported; validate()
+    checks the detections against full-frame processing.
+    """
+
+    # Border pixels of a region whose edges depend on pixels outside it
+    CONTEXT = 8
+
+    def __init__(self, levels=1, margin=0.15, min_margin=8, coarse_circularity=0.6, max_fraction=0.5,
+                 tolerance=None, image_processor=None, contour_processor=None, circle_detector=None):
+        """
+        Initialize the pyramid detector.
+
+        Args:
+            levels (int): Number of pyramid levels; the coarse image is 2**levels times smaller.
+                Parts whose edges break up when downsampled are missed, so more levels
+                suit images with large, high-contrast parts.
+            margin (float): Initial annulus half-width as a fraction of the candidate radius.
+            min_margin (float): Minimum initial annulus half-width, in full resolution pixels.
+            coarse_circularity (float): Circularity threshold for candidates on the coarse level.
+            max_fraction (float): Once the regions around the candidates cover more than
+                this fraction of the image, the full frame is processed instead.
+            tolerance (float): Maximum roundness difference to full-frame processing
+                accepted by validate(), in pixels. None disables validation.
+            image_processor (ImageProcessor): Processor for edge and contour extraction.
+            contour_processor (ContourProcessor): Processor for contour filtering.
+            circle_detector (CircleDetector): Detector for circle fitting.
+        """
+        if levels < 1:
+            raise ValueError("levels must be at least 1")
+        self.levels = levels
+        self.margin = margin
+        self.min_margin = min_margin
+        self.coarse_circularity = coarse_circularity
+        self.max_fraction = max_fraction
+        self.tolerance = tolerance
+        self.image_processor = image_processor or ImageProcessor()
+        self.contour_processor = contour_processor or ContourProcessor()
+        self.circle_detector = circle_detector or CircleDetector()
+        self.stats = {}
+
+    def detect(self, image, edges_out=None, min_area=100, min_perimeter=100):
+        """
+        Detect circles using the image pyramid.
+
+        Args:
+            image (numpy.ndarray): The input BGR or grayscale image.
+            edges_out (numpy.ndarray): Optional uint8 array of the image height and
+                width that receives the full resolution edges of every annulus.
+            min_area (float): Minimum contour area at full resolution.
+            min_perimeter (float): Minimum contour perimeter at full resolution.
+
+        Returns:
+            list: List of Detection objects with contours in full-image coordinates.
+        """
+        scale = 2 ** self.levels
+        small = image
+        for _ in range(self.levels):
+            small = cv2.pyrDown(small)
+
+        # Find candidate circles on the coarse level
+        processed = self.image_processor.preprocess(small)
+        edges = self.image_processor.detect_edges(processed)
+        contours = self.image_processor.extract_contours(edges)
+        contours = self.contour_processor.filter_contours(contours, min_area / scale**2, min_perimeter / scale)
+        candidates = self.circle_detector.detect(contours, self.coarse_circularity)
+
+        circles = [tuple(value * scale for value in candidate.circle) for candidate in candidates]
+        total_pixels = image.shape[0] * image.shape[1]
+        budget = self.max_fraction * total_pixels
+        estimate = sum(self._region(image.shape, circle, self._half_width(circle[2], scale))[1]
+                       for circle in circles)
+
+        detections = []
+        seen = set()
+        full_res_pixels = 0
+        complete = estimate <= budget
+        if complete:
+            for circle in circles:
+                detection, pixels, complete = self._refine(image, circle, scale, edges_out, min_area,
+                                                           min_perimeter, budget - full_res_pixels)
+                full_res_pixels += pixels
+                if not complete:
+                    break
+                if detection is None:
+                    continue
+                key = cv2.boundingRect(detection.contour) + (len(detection.contour),)
+                if key in seen:
+                    continue
+                seen.add(key)
+                detection.contour_index = len(detections)
+                detections.append(detection)
+
+        if not complete:
+            # Refining costs about as much as processing the full frame
+            detections = self._detect_full_frame(image, edges_out, min_area, min_perimeter)
+            full_res_pixels += total_pixels
+
+        self.stats = {
+            'candidates': len(candidates),
+            'detections': len(detections),
+            'full_res_pixels': full_res_pixels,
+            'full_res_fraction': full_res_pixels / total_pixels,
+        }
+        return detections
+
+    def validate(self, image, detections, measure, min_area=100, min_perimeter=100, tolerance=None):
+        """
+        Compare detections of detect() against full-frame detection.
+
+        Only the full-frame reference is computed; the detections are those
+        already reported, so the statistics of detect() are kept.
+
+        Args:
+            image (numpy.ndarray): The input BGR or grayscale image.
+            detections (list): Detection objects returned by detect() for the image.
+            measure (callable): Maps a Detection to its roundness value.
+            min_area (float): Minimum contour area passed to detect().
+            min_perimeter (float): Minimum contour perimeter passed to detect().
+            tolerance (float): Maximum accepted roundness difference, in pixels.
+                Defaults to the tolerance given at initialization.
+
+        Returns:
+            dict: Number of matched and missed parts, the maximum roundness
+                difference and whether it is within the tolerance.
+        """
+        if tolerance is None:
+            tolerance = self.tolerance if self.tolerance is not None else 0.0
+        reference = self._detect_full_frame(image, None, min_area, min_perimeter)
+
+        matched = 0
+        max_deviation = 0.0
+        for expected in reference:
+            distances = [np.hypot(d.circle[0] - expected.circle[0], d.circle[1] - expected.circle[1])
+                         for d in detections]
+            if not distances or min(distances) > 1.0:
+                continue
+            found = detections[int(np.argmin(distances))]
+            matched += 1
+            max_deviation = max(max_deviation, abs(measure(found) - measure(expected)))
+
+        return {
+            'matched': matched,
+            'missed': len(reference) - matched,
+            'max_deviation': max_deviation,
+            'within_tolerance': matched == len(reference) and max_deviation <= tolerance,
+        }
+
+    def _detect_full_frame(self, image, edges_out=None, min_area=100, min_perimeter=100):
+        """
+        Detect circles on the full resolution image without the pyramid.
+
+        Args:
+            image (numpy.ndarray): The input BGR or grayscale image.
+            edges_out (numpy.ndarray): Optional full-size edge image to fill.
+            min_area (float): Minimum contour area.
+            min_perimeter (float): Minimum contour perimeter.
+
+        Returns:
+            list: List of Detection objects.
+        """
+        processed = self.image_processor.preprocess(image)
+        edges = self.image_processor.detect_edges(processed)
+        if edges_out is not None:
+            edges_out[...] = edges
+        contours = self.image_processor.extract_contours(edges)
+        contours = self.contour_processor.filter_contours(contours, min_area, min_perimeter)
+        return self.circle_detector.detect(contours)
+
+    def _half_width(self, radius, scale):
+        """
+        Get the initial annulus half-width for a candidate.
+
+        Args:
+            radius (float): Candidate radius at full resolution.
+            scale (int): Downsampling factor of the coarse level.
+
+        Returns:
+            float: Half-width in full resolution pixels.
+        """
+        # The coarse level locates edges only to within a coarse pixel
+        return max(self.min_margin, self.margin * radius) + scale
+
+    def _region(self, shape, circle, half_width):
+        """
+        Get the image region processed for an annulus.
+
+        Args:
+            shape (tuple): Image shape.
+            circle (tuple): Candidate circle (center_x, center_y, radius).
+            half_width (float): Annulus half-width.
+
+        Returns:
+            tuple: Region (x0, y0, x1, y1) and its number of pixels.
+        """
+        height, width = shape[:2]
+        center_x, center_y, radius = circle
+        outer = radius + half_width
+        x0 = max(int(np.floor(center_x - outer)) - self.CONTEXT, 0)
+        y0 = max(int(np.floor(center_y - outer)) - self.CONTEXT, 0)
+        x1 = min(int(np.ceil(center_x + outer)) + self.CONTEXT + 1, width)
+        y1 = min(int(np.ceil(center_y + outer)) + self.CONTEXT + 1, height)
+        return (x0, y0, x1, y1), max(x1 - x0, 0) * max(y1 - y0, 0)
+
+    def _refine(self, image, circle, scale, edges_out, min_area, min_perimeter, budget, max_attempts=3):
+        """
+        Re-detect a candidate circle at full resolution inside an annulus.
+
+        Args:
+            image (numpy.ndarray): The full resolution image.
+            circle (tuple): Candidate circle (center_x, center_y, radius) at full resolution.
+            scale (int): Downsampling factor of the coarse level.
+            edges_out (numpy.ndarray): Optional full-size edge image to fill.
+            min_area (float): Minimum contour area.
+            min_perimeter (float): Minimum contour perimeter.
+            budget (float): Number of full resolution pixels that may still be processed.
+            max_attempts (int): Number of annulus widths tried before the candidate is dropped.
+
+        Returns:
+            tuple: The Detection (or None), the number of full resolution pixels processed
+                and False if the budget ran out before the candidate was resolved.
+        """
+        height, width = image.shape[:2]
+        center_x, center_y, radius = circle
+        half_width = self._half_width(radius, scale)
+        pixels = 0
+
+        for _ in range(max_attempts):
+            outer = radius + half_width
+            inner = max(radius - half_width, 0)
+            (x0, y0, x1, y1), region_pixels = self._region(image.shape, circle, half_width)
+            if region_pixels == 0:
+                return None, pixels, True
+            if pixels + region_pixels > budget:
+                return None, pixels, False
+            pixels += region_pixels
+
+            processed = self.image_processor.preprocess(image[y0:y1, x0:x1])
+            edges = self.image_processor.detect_edges(processed)
+
+            # Keep only the edges inside the annulus around the candidate
+            yy, xx = np.ogrid[y0:y1, x0:x1]
+            distance = np.sqrt((xx - center_x)**2 + (yy - center_y)**2)
+            edges[(distance < inner) | (distance > outer)] = 0
+
+            contours = self.image_processor.extract_contours(edges)
+            offset = np.array([x0, y0], dtype=np.int32)
+            contours = [contour + offset for contour in contours]
+            contours = self.contour_processor.filter_contours(contours, min_area, min_perimeter)
+            detections = self.circle_detector.detect(contours)
+            if not detections:
+                # The part may have been cut open by a too narrow annulus
+                half_width *= 2
+                continue
+            best = min(detections, key=lambda d: np.hypot(d.circle[0] - center_x, d.circle[1] - center_y))
+
+            # A contour that reaches the mask or the region border may be cut off
+            points = best.contour.reshape(-1, 2)
+            reach = np.sqrt((points[:, 0] - center_x)**2 + (points[:, 1] - center_y)**2)
+            bx, by, bw, bh = cv2.boundingRect(best.contour)
+            clipped = (np.max(reach) > outer - 2 or (inner > 0 and np.min(reach) < inner + 2)
+                       or (bx < x0 + self.CONTEXT and x0 > 0) or (by < y0 + self.CONTEXT and y0 > 0)
+                       or (bx + bw > x1 - self.CONTEXT and x1 < width)
+                       or (by + bh > y1 - self.CONTEXT and y1 < height))
+            if not clipped:
+                if edges_out is not None:
+                    region = edges_out[y0:y1, x0:x1]
+                    np.maximum(region, edges, out=region)
+                return Detection(best.contour_index, best.contour, best.circle, best.centroid,
+                                 best.area, best.perimeter), pixels, True
+            half_width *= 2
+
+        return None, pixels, True
@@ -0,0 +1,248 @@
+import cv2
+import numpy as np
+from .circle_detector import CircleDetector, Detection
+
+class RansacCircleDetector(CircleDetector):
+    """
+    Class for detecting circles in broken, merged or partially occluded contours.
+
+    Contours that pass the circularity test are fitted as by CircleDetector.
+    For the others, circles are found with RANSAC: batches of three-point
+    hypotheses are scored against the contour points at once with NumPy
+    broadcasting, and sampling stops as soon as the best inlier ratio makes
+    a better hypothesis unlikely. The inliers of the best hypothesis are
+    refitted with the least squares fit. A contour can hold several circles,
+    e.g. touching parts, which are found one after another.
+
+    A circle is accepted if its inliers cover enough of its circumference
+    with unbroken runs along the contour. Texture that merely crosses a
+    circle many times only contributes short runs and is rejected.
+
+    The contour of each detection holds the inlier points of its circle, in
+    contour order, so roundness is measured on the part's own edge.
+    """
+
+    # Contours only need to pass the size filter, not the circularity one
+    CONTOUR_CIRCULARITY = 0.0
+
+    def __init__(self, threshold=2.0, min_coverage=0.6, confidence=0.99, max_iterations=512, batch_size=64,
+                 max_circles=4, min_inliers=20, min_radius=16, min_run=8, sample_points=1024, seed=0):
+        """
+        Initialize the detector.
+
+        Args:
+            threshold (float): Maximum distance of an inlier from the circle, in pixels.
+            min_coverage (float): Fraction of the circumference the inliers must cover.
+            confidence (float): Probability of having drawn an all-inlier sample
+                at which sampling stops.
+            max_iterations (int): Maximum number of hypotheses per circle.
+            batch_size (int): Number of hypotheses scored at once.
+            max_circles (int): Maximum number of circles found in one contour.
+            min_inliers (int): Minimum number of inlier points of a circle.
+            min_radius (float): Minimum radius of a circle, in pixels; the default
+                matches the minimum contour perimeter of 100 pixels.
+            min_run (int): Minimum number of consecutive contour points on the
+                circle for them to count towards its coverage.
+            sample_points (int): Maximum number of contour points hypotheses are
+                scored on; the final inliers are taken from all points.
+            seed (int): Seed of the random generator, for reproducible results.
+        """
+        self.threshold = threshold
+        self.min_coverage = min_coverage
+        self.confidence = confidence
+        self.max_iterations = max_iterations
+        self.batch_size = batch_size
+        self.max_circles = max_circles
+        self.min_inliers = min_inliers
+        self.min_radius = min_radius
+        self.min_run = min_run
+        self.sample_points = sample_points
+        self.seed = seed
+
+    def detect(self, contours, circularity_threshold=CircleDetector.CIRCULARITY):
+        """
+        Detect circles from contours, keeping track of the contour of each circle.
+
+        Args:
+            contours (list): List of contours.
+            circularity_threshold (float): Circularity (0 to 1) above which a
+                contour is fitted directly instead of with RANSAC.
+
+        Returns:
+            list: List of Detection objects, in contour order.
+        """
+        detections = super().detect(contours, circularity_threshold)
+        fitted = {detection.contour_index for detection in detections}
+        rng = np.random.default_rng(self.seed)
+
+        for i, contour in enumerate(contours):
+            if i in fitted:
+                continue
+            points = contour.reshape(-1, 2)
+            for circle, inliers in self.fit_contour(points, rng):
+                part = np.ascontiguousarray(points[inliers]).reshape(-1, 1, 2)
+                area, perimeter = self.shape_properties(part)
+                centroid = part.reshape(-1, 2).mean(axis=0)
+                detections.append(Detection(i, part, circle, (centroid[0], centroid[1]), area, perimeter))
+
+        detections.sort(key=lambda detection: detection.contour_index)
+        return detections
+
+    def fit_contour(self, points, rng=None):
+        """
+        Find the circles in the points of one contour.
+
+        Args:
+            points (numpy.ndarray): Contour points (N, 2).
+            rng (numpy.random.Generator): Random generator; seeded from `seed` if not given.
+
+        Returns:
+            list: Tuples of circle (center_x, center_y, radius) and boolean inlier
+                mask over the points, one per circle found.
+        """
+        rng = rng if rng is not None else np.random.default_rng(self.seed)
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        remaining = np.ones(len(points), dtype=bool)
+        circles = []
+        while len(circles) < self.max_circles and np.count_nonzero(remaining) >= self.min_inliers:
+            candidates = np.flatnonzero(remaining)
+            found = self.ransac(points[candidates], rng)
+            if found is None:
+                break
+            circle, inliers = found
+            mask = np.zeros(len(points), dtype=bool)
+            mask[candidates[inliers]] = True
+            circles.append((circle, mask))
+            # Points near a found circle cannot start another one
+            distances = np.abs(np.hypot(points[:, 0] - circle[0], points[:, 1] - circle[1]) - circle[2])
+            remaining &= distances > 2 * self.threshold
+        return circles
+
+    def ransac(self, points, rng):
+        """
+        Fit one circle to points with outliers.
+
+        Args:
+            points (numpy.ndarray): Points (N, 2), float64.
+            rng (numpy.random.Generator): Random generator.
+
+        Returns:
+            tuple: Circle (center_x, center_y, radius) and boolean inlier mask, or
+                None if no circle with enough inliers and coverage was found.
+        """
+        n = len(points)
+        if n < max(3, self.min_inliers):
+            return None
+        # Score hypotheses on a subset of the points
+        scored = points if n <= self.sample_points else points[rng.choice(n, self.sample_points, replace=False)]
+        max_radius = np.max(np.ptp(points, axis=0))
+
+        best_center, best_radius, best_count = None, None, 0
+        needed = self.max_iterations
+        tried = 0
+        while tried < needed:
+            samples = points[rng.integers(0, n, (self.batch_size, 3))]
+            tried += self.batch_size
+            centers, radii = self._circumcircles(samples)
+            valid = np.isfinite(radii) & (radii >= self.min_radius) & (radii <= max_radius)
+            if not np.any(valid):
+                continue
+            centers, radii = centers[valid], radii[valid]
+
+            # Residuals of every scored point against every hypothesis at once
+            distances = np.sqrt(np.sum((scored[None, :, :] - centers[:, None, :])**2, axis=2))
+            counts = np.count_nonzero(np.abs(distances - radii[:, None]) <= self.threshold, axis=1)
+            best = np.argmax(counts)
+            if counts[best] > best_count:
+                best_center, best_radius, best_count = centers[best], radii[best], counts[best]
+                # Hypotheses needed to draw an all-inlier sample with the given confidence
+                ratio = best_count / len(scored)
+                if ratio >= 1:
+                    break
+                needed = min(self.max_iterations,
+                             int(np.ceil(np.log(1 - self.confidence) / np.log(1 - ratio**3))))
+        if best_center is None:
+            return None
+
+        # Refit the inliers with least squares, then once more with the refined inliers
+        center, radius = best_center, best_radius
+        for _ in range(2):
+            inliers = np.abs(np.hypot(points[:, 0] - center[0], points[:, 1] - center[1]) - radius) <= self.threshold
+            if np.count_nonzero(inliers) < self.min_inliers:
+                return None
+            centers, radii = self.fit_circles_batch(points[inliers], [0, np.count_nonzero(inliers)])
+            center, radius = centers[0], radii[0]
+
+        inliers = np.abs(np.hypot(points[:, 0] - center[0], points[:, 1] - center[1]) - radius) <= self.threshold
+        inliers = self._long_runs(inliers)
+        if (np.count_nonzero(inliers) < self.min_inliers or radius < self.min_radius
+                or self.coverage(points[inliers], center) < self.min_coverage):
+            return None
+        return (center[0], center[1], radius), inliers
+
+    def coverage(self, points, center, bins=36):
+        """
+        Estimate the fraction of a circle's circumference covered by points on it.
+
+        Args:
+            points (numpy.ndarray): Points on the circle (N, 2).
+            center (tuple): Center of the circle (x, y).
+            bins (int): Number of angular sectors.
+
+        Returns:
+            float: Fraction of the sectors holding at least one point.
+        """
+        angles = np.arctan2(points[:, 1] - center[1], points[:, 0] - center[0])
+        sectors = np.floor((angles + np.pi) / (2 * np.pi) * bins).astype(np.intp) % bins
+        return len(np.unique(sectors)) / bins
+
+    def _long_runs(self, mask):
+        """
+        Keep only the runs of at least `min_run` consecutive True values of a mask.
+
+        The contour is closed, so a run reaching the last point continues with
+        the run starting at the first point.
+
+        Args:
+            mask (numpy.ndarray): Boolean mask over the points, in contour order.
+
+        Returns:
+            numpy.ndarray: The filtered mask.
+        """
+        edges = np.diff(np.concatenate(([0], mask.astype(np.int8), [0])))
+        starts = np.flatnonzero(edges == 1)
+        ends = np.flatnonzero(edges == -1)
+        lengths = ends - starts
+        if len(starts) > 1 and starts[0] == 0 and ends[-1] == len(mask):
+            # One arc crossing the start of the contour
+            lengths[0] = lengths[-1] = lengths[0] + lengths[-1]
+        runs = np.zeros(len(mask) + 1, dtype=np.int32)
+        for start, end, length in zip(starts, ends, lengths):
+            if length >= self.min_run:
+                runs[start] += 1
+                runs[end] -= 1
+        return np.cumsum(runs[:-1]) > 0
+
+    def _circumcircles(self, triangles):
+        """
+        Compute the circles through many point triples at once.
+
+        Args:
+            triangles (numpy.ndarray): Point triples (K, 3, 2).
+
+        Returns:
+            tuple: Centers (K, 2) and radii (K,); radii of collinear triples are NaN.
+        """
+        a, b, c = triangles[:, 0], triangles[:, 1], triangles[:, 2]
+        # Relative to the first point for precision
+        b = b - a
+        c = c - a
+        d = 2 * (b[:, 0] * c[:, 1] - b[:, 1] * c[:, 0])
+        b_sq = np.sum(b**2, axis=1)
+        c_sq = np.sum(c**2, axis=1)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            ux = (c[:, 1] * b_sq - b[:, 1] * c_sq) / d
+            uy = (b[:, 0] * c_sq - c[:, 0] * b_sq) / d
+        radii = np.hypot(ux, uy)
+        radii[np.abs(d) < 1e-9] = np.nan
+        return a + np.column_stack((ux, uy)), radii
@@ -0,0 +1,589 @@
+import numpy as np
+import cv2
+from .contour_batch import ContourBatch
+from .circle_detector import CircleDetector
+from .distance_kernels import DistanceKernels
+
+METHOD_NAMES = {
+    'min_zone': "Minimum Zone Method",
+    'least_squares': "Least Squares Method",
+    'min_circumscribed': "Minimum Circumscribed Circle Method",
+    'max_inscribed': "Maximum Inscribed Circle Method",
+}
+
+# Side in pixels of the initial Nelder-Mead simplex around a warm-start center;
+# a center carried over from the previous frame is about this close to the optimum
+WARM_START_STEP = 1.0
+
+class RoundnessCalculator:
+    """
+    Class for calculating roundness tolerance using various methods.
+    """
+    
+    def __init__(self, backend='numpy'):
+        """
+        Initialize the calculator.
+        
+        Args:
+            backend (str): Backend of the distance kernels, 'numpy' or 'numba'. Numba
+                compiles the optimizer objectives on first use, which only pays off
+                for long runs of optimizer-based measurements.
+        """
+        self._voronoi_solver = None
+        self.kernels = DistanceKernels(backend)
+        # Solver work of the last measurement per method: candidate centers
+        # evaluated by the Voronoi solver, or Nelder-Mead iterations
+        self.iterations = {}
+        # Methods of the last measurement whose solver used the initial center
+        self.warm_starts = set()
+    
+    @property
+    def voronoi_solver(self):
+        """
+        VoronoiSolver: The exact solver, created on first use.
+        
+        SciPy is imported only when a method that needs it is used, which
+        keeps the start-up of short-lived processes fast.
+        """
+        if self._voronoi_solver is None:
+            from .voronoi_solver import VoronoiSolver
+            self._voronoi_solver = VoronoiSolver()
+        return self._voronoi_solver
+    
+    def measure(self, points, method='min_zone', initial_centers=None):
+        """
+        Calculate roundness with the given method and return uniform results.
+        
+        Args:
+            points (numpy.ndarray): Array of points (N, 2).
+            method (str): Method for roundness calculation (a key of METHOD_NAMES), or 'all'.
+            initial_centers (dict): Centers (x, y) to start the 'min_zone' and
+                'max_inscribed' solvers from, keyed by method, e.g. the optimal
+                centers of the same part in the previous frame.
+            
+        Returns:
+            dict: Maps each evaluated method to a tuple of inner circle (center_x, center_y, radius),
+                outer circle (center_x, center_y, radius), and roundness.
+        """
+        self.iterations = {}
+        self.warm_starts = set()
+        initial_centers = initial_centers or {}
+        if method == 'all':
+            return self.evaluate_all(points, initial_centers)
+        
+        if method == 'min_zone':
+            inner_circle, outer_circle, roundness = self.min_zone_method(
+                points, initial_center=initial_centers.get('min_zone'))
+        elif method == 'least_squares':
+            center, radius, roundness = self.least_squares_method(points)
+            inner_circle = (center[0], center[1], radius - roundness/2)
+            outer_circle = (center[0], center[1], radius + roundness/2)
+        elif method == 'min_circumscribed':
+            center, outer_radius, inner_radius, roundness = self.min_circumscribed_method(points)
+            inner_circle = (center[0], center[1], inner_radius)
+            outer_circle = (center[0], center[1], outer_radius)
+        elif method == 'max_inscribed':
+            center, inner_radius, outer_radius, roundness = self.max_inscribed_method(
+                points, initial_center=initial_centers.get('max_inscribed'))
+            inner_circle = (center[0], center[1], inner_radius)
+            outer_circle = (center[0], center[1], outer_radius)
+        else:
+            raise ValueError(f"Unknown roundness method: {method}")
+        
+        return {method: (inner_circle, outer_circle, roundness)}
+    
+    def measure_batch(self, contours, method='min_zone'):
+        """
+        Calculate roundness of every contour of a batch.
+        
+        The points are converted to float64 once for the whole batch. The least
+        squares method is solved for all contours at once with segmented
+        reductions; the other methods run per contour on views of the buffer.
+        
+        Args:
+            contours (list or ContourBatch): Contours or single-line point arrays.
+            method (str): Method for roundness calculation (a key of METHOD_NAMES), or 'all'.
+            
+        Returns:
+            list: One dict per contour, as returned by measure(). `iterations`
+                holds the solver work of the last contour.
+        """
+        batch = ContourBatch.from_contours(contours)
+        points, offsets = batch.flatten()
+        points = points.astype(np.float64)
+        if method != 'least_squares':
+            return [self.measure(points[offsets[i]:offsets[i + 1]], method) for i in range(len(batch))]
+        
+        self.iterations = {}
+        if len(batch) == 0:
+            return []
+        centers, radii = CircleDetector().fit_circles_batch(points, offsets)
+        counts = np.diff(offsets)
+        center_points = np.repeat(centers, counts, axis=0)
+        distances = np.sqrt((points[:, 0] - center_points[:, 0])**2 + (points[:, 1] - center_points[:, 1])**2)
+        roundness = np.maximum.reduceat(distances, offsets[:-1]) - np.minimum.reduceat(distances, offsets[:-1])
+        return [{'least_squares': ((center[0], center[1], radius - zone/2),
+                                   (center[0], center[1], radius + zone/2),
+                                   zone)}
+                for center, radius, zone in zip(centers, radii, roundness)]
+    
+    def bootstrap(self, points, methods=('least_squares', 'min_circumscribed'), resamples=200, mode='perturb',
+                  sigma=0.5, confidence=0.95, seed=0):
+        """
+        Estimate the uncertainty of roundness values by evaluating many variants of the points.
+        
+        All variants are generated as one (B, N, 2) array and every method is
+        evaluated on all of them at once: least squares with one batched
+        solve of the normal equations, the minimum circumscribed circle with a
+        batched support-set iteration that needs a few vectorized steps for
+        all variants together.
+        
+        Args:
+            points (numpy.ndarray): Array of points (N, 2).
+            methods (tuple): Methods to evaluate, 'least_squares' and/or 'min_circumscribed'.
+            resamples (int): Number of variants B.
+            mode (str): 'perturb' adds Gaussian noise of `sigma` pixels to every point,
+                modelling edge localization error; 'resample' draws N points with
+                replacement (the classical bootstrap, which tends to lose extreme points).
+            sigma (float): Standard deviation of the perturbation in pixels.
+            confidence (float): Coverage of the percentile interval.
+            seed (int): Seed of the random generator, for reproducible results.
+            
+        Returns:
+            dict: For each method, the roundness of the points ('value'), as the
+                single method gives it, and the 'mean', 'std' and percentile
+                'interval' (low, high) over the variants.
+        """
+        unknown = set(methods) - {'least_squares', 'min_circumscribed'}
+        if unknown:
+            raise ValueError(f"Methods without a batched solver: {', '.join(sorted(unknown))}")
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        rng = np.random.default_rng(seed)
+        if mode == 'perturb':
+            variants = points[None, :, :] + rng.normal(0, sigma, (resamples,) + points.shape)
+        elif mode == 'resample':
+            variants = points[rng.integers(0, len(points), (resamples, len(points)))]
+        else:
+            raise ValueError(f"Unknown bootstrap mode: {mode}")
+        
+        # The points themselves are evaluated as variant 0 of the batch
+        batch = np.concatenate((points[None], variants))
+        alpha = (1 - confidence) / 2 * 100
+        results = {}
+        for method in methods:
+            if method == 'least_squares':
+                centers = self._least_squares_centers(batch)
+                distances = np.sqrt(np.sum((batch - centers[:, None, :])**2, axis=2))
+                roundness = np.max(distances, axis=1) - np.min(distances, axis=1)
+                value = roundness[0]
+            else:
+                centers, outer_radii = self._enclosing_circles(batch)
+                distances = np.sqrt(np.sum((batch - centers[:, None, :])**2, axis=2))
+                roundness = outer_radii - np.min(distances, axis=1)
+                # Measured as min_circumscribed_method() does, on integer points
+                value = self.min_circumscribed_method(points)[3]
+            samples = roundness[1:]
+            results[method] = {
+                'value': float(value),
+                'mean': float(np.mean(samples)),
+                'std': float(np.std(samples, ddof=1)) if len(samples) > 1 else 0.0,
+                'interval': tuple(float(v) for v in np.percentile(samples, [alpha, 100 - alpha])),
+            }
+        return results
+    
+    def _least_squares_centers(self, batch):
+        """
+        Fit least squares circle centers to many point sets at once.
+        
+        Args:
+            batch (numpy.ndarray): Point sets (B, N, 2).
+            
+        Returns:
+            numpy.ndarray: Centers (B, 2).
+        """
+        # Normal equations of [2x, 2y, 1] . (a, b, c) = x^2 + y^2 in centered coordinates
+        means = np.mean(batch, axis=1)
+        centered = batch - means[:, None, :]
+        design = np.concatenate((2 * centered, np.ones(centered.shape[:2] + (1,))), axis=2)
+        target = np.sum(centered**2, axis=2)
+        normal = np.einsum('bni,bnj->bij', design, design)
+        rhs = np.einsum('bni,bn->bi', design, target)
+        try:
+            solution = np.linalg.solve(normal, rhs[:, :, None])[:, :, 0]
+        except np.linalg.LinAlgError:
+            # Degenerate sets, e.g. a resample drawing one point only: the
+            # minimum norm solution, as np.linalg.lstsq gives least_squares_method()
+            solution = np.matmul(np.linalg.pinv(normal), rhs[:, :, None])[:, :, 0]
+        return means + solution[:, :2]
+    
+    def _enclosing_circles(self, batch, max_steps=100):
+        """
+        Find the minimum enclosing circles of many point sets at once.
+        
+        Each set keeps a support of at most three points and the smallest circle
+        enclosing it. While a point lies outside, the support is replaced by that
+        of the smallest circle enclosing the support and the farthest point. The
+        radius grows at every step, so this ends with the exact circle; sets that
+        are done are carried along unchanged.
+        
+        Args:
+            batch (numpy.ndarray): Point sets (B, N, 2).
+            max_steps (int): Maximum number of support updates.
+            
+        Returns:
+            tuple: Centers (B, 2) and radii (B,).
+        """
+        rows = np.arange(len(batch))
+        # Start from the first point and the point farthest from it
+        first = batch[:, 0]
+        farthest = batch[rows, np.argmax(np.sum((batch - first[:, None])**2, axis=2), axis=1)]
+        support = np.stack((first, farthest, farthest), axis=1)
+        centers = (first + farthest) / 2
+        radii = np.sqrt(np.sum((farthest - first)**2, axis=1)) / 2
+        
+        for _ in range(max_steps):
+            distances = np.sqrt(np.sum((batch - centers[:, None, :])**2, axis=2))
+            outside = np.argmax(distances, axis=1)
+            active = distances[rows, outside] > radii * (1 + 1e-12) + 1e-9
+            if not np.any(active):
+                break
+            candidates = np.concatenate((support[active], batch[rows[active], outside[active]][:, None]), axis=1)
+            support[active], centers[active], radii[active] = self._enclosing_circles_of_four(candidates)
+        return centers, radii
+    
+    def _enclosing_circles_of_four(self, quads):
+        """
+        Find the minimum enclosing circles of many sets of four points.
+        
+        Args:
+            quads (numpy.ndarray): Point sets (K, 4, 2).
+            
+        Returns:
+            tuple: Supports (K, 3, 2), with a point repeated for two-point
+                supports, centers (K, 2) and radii (K,).
+        """
+        # Circles on each pair as diameter and through each triple
+        pairs = [(0, 1), (0, 2), (0, 3), (1, 2), (1, 3), (2, 3)]
+        triples = [(0, 1, 2), (0, 1, 3), (0, 2, 3), (1, 2, 3)]
+        supports = np.stack([quads[:, [i, j, j]] for i, j in pairs] + [quads[:, list(t)] for t in triples], axis=1)
+        centers = np.empty(supports.shape[:2] + (2,))
+        radii = np.empty(supports.shape[:2])
+        centers[:, :6] = (supports[:, :6, 0] + supports[:, :6, 1]) / 2
+        radii[:, :6] = np.sqrt(np.sum((supports[:, :6, 1] - supports[:, :6, 0])**2, axis=2)) / 2
+        
+        a = supports[:, 6:, 0]
+        b = supports[:, 6:, 1] - a
+        c = supports[:, 6:, 2] - a
+        d = 2 * (b[..., 0] * c[..., 1] - b[..., 1] * c[..., 0])
+        b_sq = np.sum(b**2, axis=2)
+        c_sq = np.sum(c**2, axis=2)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            ux = (c[..., 1] * b_sq - b[..., 1] * c_sq) / d
+            uy = (b[..., 0] * c_sq - c[..., 0] * b_sq) / d
+        centers[:, 6:] = a + np.stack((ux, uy), axis=2)
+        radii[:, 6:] = np.where(np.abs(d) > 1e-12, np.hypot(ux, uy), np.inf)
+        
+        # The smallest circle holding all four points
+        distances = np.sqrt(np.sum((quads[:, None, :, :] - centers[:, :, None, :])**2, axis=3))
+        encloses = np.all(distances <= radii[:, :, None] * (1 + 1e-9) + 1e-9, axis=2)
+        best = np.argmin(np.where(encloses, radii, np.inf), axis=1)
+        rows = np.arange(len(quads))
+        return supports[rows, best], centers[rows, best], radii[rows, best]
+    
+    def evaluate_all(self, points, initial_centers=None):
+        """
+        Calculate roundness with all four methods in a single pass.
+        
+        The float64 point buffer, centered coordinates, squared distances,
+        convex hull and k-d tree are computed once and shared by all methods.
+        
+        Args:
+            points (numpy.ndarray): Array of points (N, 2), in contour order.
+            initial_centers (dict): Centers to start the 'min_zone' and 'max_inscribed'
+                solvers from, keyed by method, see measure().
+            
+        Returns:
+            dict: Maps each method name ('min_zone', 'least_squares', 'min_circumscribed',
+                'max_inscribed') to a tuple of inner circle (center_x, center_y, radius),
+                outer circle (center_x, center_y, radius), and roundness.
+        """
+        from scipy.spatial import ConvexHull, cKDTree, QhullError
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        initial_centers = initial_centers or {}
+        
+        # Shared precomputation
+        mean = np.mean(points, axis=0)
+        centered = points - mean
+        squared = centered[:, 0]**2 + centered[:, 1]**2
+        try:
+            hull_indices = ConvexHull(points).vertices
+        except (QhullError, ValueError):
+            hull_indices = np.arange(len(points))
+        tree = cKDTree(points)
+        
+        def distances(center):
+            # |p - c|^2 = |p - m|^2 - 2 (c - m).(p - m) + |c - m|^2
+            offset = np.asarray(center, dtype=np.float64) - mean
+            return np.sqrt(np.maximum(squared - 2 * centered @ offset + offset @ offset, 0))
+        
+        results = {}
+        
+        # Minimum zone
+        try:
+            center, min_radius, max_radius = self.voronoi_solver.min_zone(
+                points, hull=points[hull_indices], tree=tree, initial_center=initial_centers.get('min_zone'))
+            self.iterations['min_zone'] = self.voronoi_solver.stats['candidates']
+            if 'min_zone' in initial_centers:
+                self.warm_starts.add('min_zone')
+            results['min_zone'] = ((center[0], center[1], min_radius),
+                                   (center[0], center[1], max_radius),
+                                   max_radius - min_radius)
+        except (ValueError, QhullError):
+            results['min_zone'] = self._min_zone_nelder_mead(points, initial_centers.get('min_zone'))
+        
+        # Least squares, solved in centered coordinates
+        A = np.column_stack((2 * centered, np.ones(len(points))))
+        try:
+            solution, residuals, rank, s = np.linalg.lstsq(A, squared, rcond=None)
+            center = (mean[0] + solution[0], mean[1] + solution[1])
+            radius = np.sqrt(solution[2] + solution[0]**2 + solution[1]**2)
+        except np.linalg.LinAlgError:
+            # Fallback to OpenCV's minEnclosingCircle, as in least_squares_method()
+            center, radius = cv2.minEnclosingCircle(np.array(points, dtype=np.int32))
+        d = distances(center)
+        roundness = np.max(d) - np.min(d)
+        results['least_squares'] = ((center[0], center[1], radius - roundness/2),
+                                    (center[0], center[1], radius + roundness/2),
+                                    roundness)
+        
+        # Minimum circumscribed circle: only hull points can touch it
+        points_int = np.array(points[hull_indices], dtype=np.int32)
+        (center_x, center_y), outer_radius = cv2.minEnclosingCircle(points_int)
+        inner_radius = tree.query((center_x, center_y))[0]
+        results['min_circumscribed'] = ((center_x, center_y, inner_radius),
+                                        (center_x, center_y, outer_radius),
+                                        outer_radius - inner_radius)
+        
+        # Maximum inscribed circle
+        try:
+            center, inner_radius, outer_radius = self.voronoi_solver.max_inscribed(points, tree=tree)
+            self.iterations['max_inscribed'] = self.voronoi_solver.stats['candidates']
+        except (ValueError, QhullError):
+            center, inner_radius, outer_radius, _ = self._max_inscribed_nelder_mead(
+                points, initial_centers.get('max_inscribed'))
+        results['max_inscribed'] = ((center[0], center[1], inner_radius),
+                                    (center[0], center[1], outer_radius),
+                                    outer_radius - inner_radius)
+        
+        return results
+    
+    def min_zone_method(self, points, solver='voronoi', initial_center=None):
+        """
+        Calculate roundness using minimum zone method.
+        
+        Args:
+            points (numpy.ndarray): Array of points (N, 2).
+            solver (str): 'voronoi' for the exact Voronoi-based solver or 'nelder-mead'
+                for the iterative optimizer. The optimizer is also used as a fallback
+                when the points are too degenerate for the exact solver.
+            initial_center (tuple): Center (x, y) to start from instead of the centroid,
+                or to tighten the initial bound of the exact solver.
+            
+        Returns:
+            tuple: Inner circle (center_x, center_y, radius), outer circle (center_x, center_y, radius), and roundness.
+        """
+        if solver == 'voronoi':
+            from scipy.spatial import QhullError
+            try:
+                center, min_radius, max_radius = self.voronoi_solver.min_zone(points, initial_center=initial_center)
+            except (ValueError, QhullError):
+                return self._min_zone_nelder_mead(points, initial_center)
+            self.iterations['min_zone'] = self.voronoi_solver.stats['candidates']
+            if initial_center is not None:
+                self.warm_starts.add('min_zone')
+            
+            roundness = max_radius - min_radius
+            inner_circle = (center[0], center[1], min_radius)
+            outer_circle = (center[0], center[1], max_radius)
+            
+            return inner_circle, outer_circle, roundness
+        elif solver == 'nelder-mead':
+            return self._min_zone_nelder_mead(points, initial_center)
+        else:
+            raise ValueError(f"Unknown min zone solver: {solver}")
+    
+    def _min_zone_nelder_mead(self, points, initial_center=None):
+        """
+        Calculate roundness using minimum zone method with a Nelder-Mead optimizer.
+        
+        Args:
+            points (numpy.ndarray): Array of points (N, 2).
+            initial_center (tuple): Center (x, y) to start from; the centroid if not given.
+            
+        Returns:
+            tuple: Inner circle (center_x, center_y, radius), outer circle (center_x, center_y, radius), and roundness.
+        """
+        from scipy.optimize import minimize
+        
+        # Initial guess for center using centroid, unless warm-started
+        options = {}
+        if initial_center is None:
+            initial_center = np.mean(points, axis=0)
+        else:
+            options['initial_simplex'] = self._warm_start_simplex(initial_center)
+        
+        # Objective function to minimize: difference between max and min radius
+        objective = self.kernels.min_zone_objective(points)
+        
+        # Minimize the objective function
+        result = minimize(objective, initial_center, method='Nelder-Mead', options=options)
+        optimal_center = result.x
+        self.iterations['min_zone'] = result.nit
+        if options:
+            self.warm_starts.add('min_zone')
+        
+        # Calculate min and max distances from optimal center to all points
+        min_radius, max_radius = self.kernels.radius_range(points, optimal_center)
+        
+        # Calculate roundness (difference between max and min radius)
+        roundness = max_radius - min_radius
+        
+        # Return inner circle, outer circle, and roundness
+        inner_circle = (optimal_center[0], optimal_center[1], min_radius)
+        outer_circle = (optimal_center[0], optimal_center[1], max_radius)
+        
+        return inner_circle, outer_circle, roundness
+    
+    def least_squares_method(self, points):
+        """
+        Calculate roundness using least squares circle method.
+        
+        Args:
+            points (numpy.ndarray): Array of points (N, 2).
+            
+        Returns:
+            tuple: Center coordinates (x, y), radius, and roundness.
+        """
+        # Fit a circle using least squares
+        A = np.column_stack((2 * points[:, 0], 2 * points[:, 1], np.ones(len(points))))
+        b = points[:, 0]**2 + points[:, 1]**2
+        
+        # Solve the system using least squares
+        try:
+            solution, residuals, rank, s = np.linalg.lstsq(A, b, rcond=None)
+            center_x, center_y, c = solution
+            radius = np.sqrt(c + center_x**2 + center_y**2)
+            
+            # Calculate min and max distances from center to all points
+            min_distance, max_distance = self.kernels.radius_range(points, (center_x, center_y))
+            
+            # Calculate roundness (difference between max and min radius)
+            roundness = max_distance - min_distance
+            
+            return (center_x, center_y), radius, roundness
+        except np.linalg.LinAlgError:
+            # Fallback to OpenCV's minEnclosingCircle if least squares fails
+            (center_x, center_y), radius = cv2.minEnclosingCircle(np.array(points, dtype=np.int32))
+            
+            # Calculate min and max distances from center to all points
+            min_distance, max_distance = self.kernels.radius_range(points, (center_x, center_y))
+            
+            # Calculate roundness (difference between max and min radius)
+            roundness = max_distance - min_distance
+            
+            return (center_x, center_y), radius, roundness
+    
+    def min_circumscribed_method(self, points):
+        """
+        Calculate roundness using minimum circumscribed circle method.
+        
+        Args:
+            points (numpy.ndarray): Array of points (N, 2).
+            
+        Returns:
+            tuple: Center coordinates (x, y), outer radius, inner radius, and roundness.
+        """
+        # Find the minimum enclosing circle (outer circle)
+        points_int = np.array(points, dtype=np.int32)
+        (center_x, center_y), outer_radius = cv2.minEnclosingCircle(points_int)
+        
+        # Find the minimum distance from center to all points (inner radius)
+        inner_radius = self.kernels.radius_range(points, (center_x, center_y))[0]
+        
+        # Calculate roundness (difference between outer and inner radius)
+        roundness = outer_radius - inner_radius
+        
+        return (center_x, center_y), outer_radius, inner_radius, roundness
+    
+    def max_inscribed_method(self, points, solver='voronoi', initial_center=None):
+        """
+        Calculate roundness using maximum inscribed circle method.
+        
+        Args:
+            points (numpy.ndarray): Array of points (N, 2), in contour order.
+            solver (str): 'voronoi' for the exact Voronoi-based solver or 'nelder-mead'
+                for the iterative optimizer. The optimizer is also used as a fallback
+                when the points are too degenerate for the exact solver.
+            initial_center (tuple): Center (x, y) the optimizer starts from instead of
+                the centroid; the exact solver does not need one.
+            
+        Returns:
+            tuple: Center coordinates (x, y), inner radius, outer radius, and roundness.
+        """
+        if solver == 'voronoi':
+            from scipy.spatial import QhullError
+            try:
+                center, inner_radius, outer_radius = self.voronoi_solver.max_inscribed(points)
+            except (ValueError, QhullError):
+                return self._max_inscribed_nelder_mead(points, initial_center)
+            self.iterations['max_inscribed'] = self.voronoi_solver.stats['candidates']
+            
+            roundness = outer_radius - inner_radius
+            
+            return center, inner_radius, outer_radius, roundness
+        elif solver == 'nelder-mead':
+            return self._max_inscribed_nelder_mead(points, initial_center)
+        else:
+            raise ValueError(f"Unknown max inscribed solver: {solver}")
+    
+    def _max_inscribed_nelder_mead(self, points, initial_center=None):
+        """
+        Calculate roundness using maximum inscribed circle method with a Nelder-Mead optimizer.
+        
+        Args:
+            points (numpy.ndarray): Array of points (N, 2).
+            initial_center (tuple): Center (x, y) to start from; the centroid if not given.
+            
+        Returns:
+            tuple: Center coordinates (x, y), inner radius, outer radius, and roundness.
+        """
+        from scipy.optimize import minimize
+        
+        # Initial guess for center using centroid, unless warm-started
+        options = {}
+        if initial_center is None:
+            initial_center = np.mean(points, axis=0)
+        else:
+            options['initial_simplex'] = self._warm_start_simplex(initial_center)
+        
+        # Objective function to minimize: the negative of the minimum distance (to maximize it)
+        objective = self.kernels.max_inscribed_objective(points)
+        
+        # Minimize the negative of the objective function
+        result = minimize(objective, initial_center, method='Nelder-Mead', options=options)
+        optimal_center = result.x
+        self.iterations['max_inscribed'] = result.nit
+        if options:
+            self.warm_starts.add('max_inscribed')
+        
+        # Calculate min and max distances from optimal center to all points
+        inner_radius, outer_radius = self.kernels.radius_range(points, optimal_center)
+        
+        # Calculate roundness (difference between outer and inner radius)
+        roundness = outer_radius - inner_radius
+        
+        return (optimal_center[0], optimal_center[1]), inner_radius, outer_radius, roundness
+    
+    def _warm_start_simplex(self, center):
+        """Small initial Nelder-Mead simplex around a center expected to be near the optimum."""
+        return np.asarray(center, dtype=np.float64) + np.array([[0, 0], [WARM_START_STEP, 0], [0, WARM_START_STEP]])
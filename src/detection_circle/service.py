@@ -0,0 +1,369 @@
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from urllib.parse import urlsplit, parse_qs
+import numpy as np
+import cv2
+from .main import create_components, process_image
+from .roundness_calculator import METHOD_NAMES
+
+# Pipeline components of the current worker thread or process
+_worker = threading.local()
+
+REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+           413: 'Payload Too Large', 422: 'Unprocessable Entity', 500: 'Internal Server Error',
+           503: 'Service Unavailable'}
+
+def _init_service_worker(opencv_threads, options):
+    """
+    Create the warm pipeline of a service worker and run it once.
+
+    The warm-up image makes the first request skip lazy imports and the
+    first-call overhead of every stage.
+
+    Args:
+        opencv_threads (int): Number of threads OpenCV may use, or None to leave it.
+        options (dict): Pipeline options passed to create_components().
+    """
+    if opencv_threads is not None:
+        cv2.setNumThreads(opencv_threads)
+    _worker.components = create_components(options)
+    image = np.full((160, 160, 3), 40, dtype=np.uint8)
+    cv2.circle(image, (80, 80), 50, (200, 200, 200), -1)
+    _inspect({'data': cv2.imencode('.png', image)[1].tobytes(), 'name': '<warm-up>', 'method': 'all'})
+
+def _started():
+    """Do nothing; submitted once per worker so it starts and warms up before the first request."""
+
+def _inspect(request):
+    """
+    Process one request.
+
+    Args:
+        request (dict): 'path' of an image file, or 'data' with the bytes of
+            one and an optional 'name'; and the roundness 'method'.
+
+    Returns:
+        dict: 'results' and 'elapsed_ms', or 'error' and the HTTP 'status'.
+    """
+    components = _worker.components
+    start = time.perf_counter()
+    try:
+        if 'data' in request:
+            loaded_image = components['image_loader'].decode(request['data'], request.get('name', '<bytes>'))
+        else:
+            loaded_image = components['image_loader'].load(request['path'])
+        loaded_image.image
+    except Exception as e:
+        return {'error': str(e), 'status': 422}
+    try:
+        results = process_image(loaded_image.path, request['method'], None, False, components, 'none',
+                                loaded_image)
+    except Exception as e:
+        return {'error': str(e), 'status': 500}
+    for result in results:
+        del result['result_image_path']
+    return {'results': results, 'elapsed_ms': (time.perf_counter() - start) * 1000}
+
+def _json_default(value):
+    """Convert NumPy scalars for json.dumps."""
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+class InspectionService:
+    """
+    Class for serving the pipeline to local clients over HTTP.
+
+    Every worker keeps one warm pipeline, so requests pay neither process
+    start-up nor imports nor component construction. Requests that arrive
+    while the workers are busy are queued and handed to the next free worker
+    one at a time, so each is answered as soon as it is done. At most
+    `max_in_flight` requests are accepted at a time; beyond that the service answers 503 with
+    Retry-After, so clients back off instead of growing the queue.
+
+    Endpoints:
+        POST /inspect: an image file as the body (decoded in memory), or a JSON
+            body {"path": ..., "method": ...}. ?method= selects the roundness
+            method for image bodies. Returns {"results": [...], "elapsed_ms": ...}.
+        GET /health: request counters, queue length and recent latency percentiles.
+    """
+
+    def __init__(self, options=None, method='min_zone', workers=1, processes=False, max_in_flight=32,
+                 max_body=64 << 20):
+        """
+        Initialize the service.
+
+        Args:
+            options (dict): Pipeline options passed to create_components().
+            method (str): Default roundness method, or 'all'.
+            workers (int): Number of warm pipelines processing requests concurrently.
+            processes (bool): Run the pipelines in worker processes instead of threads,
+                which keeps Python-heavy solvers from contending for the GIL.
+            max_in_flight (int): Maximum number of requests queued or being processed.
+            max_body (int): Maximum request body size in bytes.
+        """
+        self.options = options or {}
+        self.method = method
+        self.workers = workers
+        self.processes = processes
+        self.max_in_flight = max_in_flight
+        self.max_body = max_body
+        self.in_flight = 0
+        self.stats = {'requests': 0, 'rejected': 0, 'errors': 0}
+        self.latencies = deque(maxlen=1024)
+        self.executor = None
+        self.queue = None
+        self.servers = []
+        self._dispatchers = []
+
+    async def start(self, host='127.0.0.1', port=8080, unix_socket=None):
+        """
+        Warm up the workers and start listening.
+
+        Args:
+            host (str): Address to listen on for TCP connections.
+            port (int): TCP port; 0 picks a free port. None disables TCP.
+            unix_socket (str): Path of a Unix socket to listen on as well, optional.
+        """
+        loop = asyncio.get_running_loop()
+        if self.processes:
+            opencv_threads = max(1, (os.cpu_count() or 1) // self.workers)
+            self.executor = ProcessPoolExecutor(self.workers, initializer=_init_service_worker,
+                                                initargs=(opencv_threads, self.options))
+        else:
+            self.executor = ThreadPoolExecutor(self.workers, initializer=_init_service_worker,
+                                               initargs=(None, self.options))
+        # Start every worker now rather than on the first request
+        await asyncio.gather(*(loop.run_in_executor(self.executor, _started) for _ in range(self.workers)))
+
+        self.queue = asyncio.Queue()
+        self._dispatchers = [asyncio.create_task(self._dispatcher()) for _ in range(self.workers)]
+        if port is not None:
+            self.servers.append(await asyncio.start_server(self._handle_connection, host, port))
+        if unix_socket is not None:
+            self.servers.append(await asyncio.start_unix_server(self._handle_connection, unix_socket))
+
+    @property
+    def addresses(self):
+        """
+        list: Addresses the service listens on, as (host, port) tuples or socket paths.
+        """
+        return [sock.getsockname() for server in self.servers for sock in server.sockets]
+
+    async def serve_forever(self):
+        """Serve until cancelled."""
+        await asyncio.gather(*(server.serve_forever() for server in self.servers))
+
+    async def close(self):
+        """Stop listening, stop the workers and release them."""
+        for server in self.servers:
+            server.close()
+            await server.wait_closed()
+        for dispatcher in self._dispatchers:
+            dispatcher.cancel()
+        await asyncio.gather(*self._dispatchers, return_exceptions=True)
+        if self.executor is not None:
+            self.executor.shutdown()
+        self.servers = []
+        self._dispatchers = []
+
+    async def inspect(self, request):
+        """
+        Process a request once a worker is free.
+
+        Args:
+            request (dict): 'path' or 'data' (and optionally 'name') of the image,
+                and optionally the roundness 'method'.
+
+        Returns:
+            dict: 'results' and 'elapsed_ms', or 'error' and the HTTP 'status'
+                (503 if the service is at its in-flight limit).
+        """
+        if self.in_flight >= self.max_in_flight:
+            self.stats['rejected'] += 1
+            return {'error': "Too many requests in flight", 'status': 503}
+        request = dict(request, method=request.get('method') or self.method)
+        if request['method'] not in METHOD_NAMES and request['method'] != 'all':
+            return {'error': f"Unknown roundness method: {request['method']}", 'status': 400}
+
+        self.in_flight += 1
+        self.stats['requests'] += 1
+        start = time.perf_counter()
+        try:
+            future = asyncio.get_running_loop().create_future()
+            self.queue.put_nowait((request, future))
+            response = await future
+        finally:
+            self.in_flight -= 1
+        if 'error' in response:
+            self.stats['errors'] += 1
+        else:
+            self.latencies.append(time.perf_counter() - start)
+        return response
+
+    def health(self):
+        """
+        Describe the state of the service.
+
+        Returns:
+            dict: Counters, in-flight and queued requests, and p50/p99 latency in
+                milliseconds over the last 1024 successful requests.
+        """
+        health = dict(self.stats, in_flight=self.in_flight, queued=self.queue.qsize() if self.queue else 0,
+                      workers=self.workers)
+        if self.latencies:
+            latencies = np.asarray(self.latencies) * 1000
+            health['latency_p50_ms'] = float(np.percentile(latencies, 50))
+            health['latency_p99_ms'] = float(np.percentile(latencies, 99))
+        return health
+
+    async def _dispatcher(self):
+        """Hand queued requests to one worker, answering each as soon as it is processed."""
+        loop = asyncio.get_running_loop()
+        while True:
+            request, future = await self.queue.get()
+            try:
+                response = await loop.run_in_executor(self.executor, _inspect, request)
+            except Exception as e:
+                # E.g. a worker process died; the pool cannot be used any more
+                response = {'error': f"Worker failed: {e}", 'status': 500}
+            if not future.done():
+                future.set_result(response)
+
+    async def _handle_connection(self, reader, writer):
+        """Serve the HTTP/1.1 requests of one connection."""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                try:
+                    verb, target, version = request_line.decode('latin-1').split()
+                except ValueError:
+                    await self._respond(writer, 400, {'error': "Malformed request line"}, False)
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+                keep_alive = (headers.get('connection', '').lower() != 'close'
+                              and version.upper() == 'HTTP/1.1')
+
+                try:
+                    length = int(headers.get('content-length') or 0)
+                except ValueError:
+                    length = -1
+                if length < 0:
+                    await self._respond(writer, 400, {'error': "Malformed Content-Length"}, False)
+                    break
+                if length > self.max_body:
+                    await self._respond(writer, 413, {'error': "Request body too large"}, False)
+                    break
+                body = await reader.readexactly(length) if length else b''
+
+                status, response = await self._route(verb, target, headers, body)
+                await self._respond(writer, status, response, keep_alive)
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def _route(self, verb, target, headers, body):
+        """Dispatch a parsed request; returns the status and the JSON response."""
+        url = urlsplit(target)
+        if url.path == '/health':
+            if verb != 'GET':
+                return 405, {'error': "Use GET"}
+            return 200, self.health()
+        if url.path != '/inspect':
+            return 404, {'error': f"Unknown path: {url.path}"}
+        if verb != 'POST':
+            return 405, {'error': "Use POST"}
+
+        query = parse_qs(url.query)
+        if headers.get('content-type', '').startswith('application/json'):
+            try:
+                request = json.loads(body)
+                request = {'path': str(request['path']), 'method': request.get('method')}
+            except (ValueError, KeyError, TypeError):
+                return 400, {'error': 'Expected a JSON object with a "path"'}
+        elif body:
+            request = {'data': body, 'name': query.get('name', ['<bytes>'])[0]}
+        else:
+            return 400, {'error': "Expected an image body or a JSON path"}
+        if 'method' in query:
+            request['method'] = query['method'][0]
+
+        response = await self.inspect(request)
+        return response.pop('status', 200), response
+
+    async def _respond(self, writer, status, response, keep_alive):
+        """Write a JSON response."""
+        body = json.dumps(response, default=_json_default).encode()
+        head = [f"HTTP/1.1 {status} {REASONS[status]}", "Content-Type: application/json",
+                f"Content-Length: {len(body)}", f"Connection: {'keep-alive' if keep_alive else 'close'}"]
+        if status == 503:
+            head.append("Retry-After: 1")
+        writer.write(("\r\n".join(head) + "\r\n\r\n").encode('latin-1') + body)
+        await writer.drain()
+
+def parse_args(argv=None):
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description='Serve circle detection and roundness measurement over HTTP')
+    parser.add_argument('--host', type=str, default='127.0.0.1', help='Address to listen on')
+    parser.add_argument('--port', type=int, default=8080, help='TCP port to listen on (-1 disables TCP)')
+    parser.add_argument('--unix_socket', type=str, default=None, help='Also listen on this Unix socket')
+    parser.add_argument('--method', type=str, default='min_zone', choices=list(METHOD_NAMES) + ['all'],
+                        help='Default roundness method; requests can override it with ?method=')
+    parser.add_argument('--workers', type=int, default=1, help='Number of warm pipelines')
+    parser.add_argument('--processes', action='store_true',
+                        help='Run the pipelines in worker processes instead of threads')
+    parser.add_argument('--max_in_flight', type=int, default=32,
+                        help='Requests accepted at a time; further requests get 503 and Retry-After')
+    parser.add_argument('--decode', type=str, default='color', choices=['color', 'gray'],
+                        help='Decode images for detection in color, or straight to grayscale')
+    parser.add_argument('--decode_reduction', type=int, default=1, choices=[1, 2, 4, 8],
+                        help='Decode images for detection at 1/N of their size')
+    parser.add_argument('--pyramid_levels', type=int, default=0,
+                        help='Coarse-to-fine detection levels (0 disables the pyramid)')
+    parser.add_argument('--detector', type=str, default='circularity', choices=['circularity', 'ransac'],
+                        help='Circle detection engine')
+    parser.add_argument('--cache_dir', type=str, default=None, help='Directory of the on-disk stage cache')
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    """Run the service until interrupted."""
+    args = parse_args(argv)
+    options = {'decode': args.decode, 'decode_reduction': args.decode_reduction,
+               'pyramid_levels': args.pyramid_levels, 'cache_dir': args.cache_dir,
+               'detector': args.detector, 'prefetch': 0, 'writer_workers': 1}
+    service = InspectionService(options, args.method, args.workers, args.processes, args.max_in_flight)
+
+    async def run():
+        await service.start(args.host, args.port if args.port >= 0 else None, args.unix_socket)
+        print(f"Listening on {', '.join(map(str, service.addresses))} with {args.workers} warm pipelines",
+              flush=True)
+        try:
+            await service.serve_forever()
+        finally:
+            await service.close()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    sys.exit(main())
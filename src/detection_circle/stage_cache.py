@@ -0,0 +1,265 @@
+import os
+import json
+import hashlib
+import tempfile
+import numpy as np
+from .circle_detector import Detection
+
+class StageCache:
+    """
+    Class for caching per-stage pipeline outputs on disk.
+
+    Entries are keyed by a hash of the image file content and of the
+    parameters of the stage and of every stage before it, so changing a
+    parameter only invalidates the stages that depend on it. Each entry is
+    one .npz file: edges are stored bit-packed, contours as one flat int32
+    point array with offsets. The cache is shared safely between processes.
+    Files are written atomically and the least recently used entries are
+    evicted when the total size exceeds the cap.
+    """
+
+    STAGES = ('edges', 'contours', 'detections')
+
+    def __init__(self, cache_dir, max_bytes=1 << 30):
+        """
+        Initialize the cache.
+
+        Args:
+            cache_dir (str): Directory holding the cache files; created if missing.
+            max_bytes (int): Maximum total size of the cache files.
+        """
+        os.makedirs(cache_dir, exist_ok=True)
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.total_bytes = sum(size for _, size, _ in self._entries())
+        self.stats = self._empty_stats()
+
+    @staticmethod
+    def image_key(image_path):
+        """
+        Hash the content of an image file.
+
+        Args:
+            image_path (str): Path to the image file.
+
+        Returns:
+            str: Hex digest of the file content.
+        """
+        digest = hashlib.blake2b(digest_size=20)
+        with open(image_path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+        return digest.hexdigest()
+
+    @staticmethod
+    def data_key(data):
+        """
+        Hash the content of an image file held in memory.
+
+        Args:
+            data (bytes): Content of the image file.
+
+        Returns:
+            str: Hex digest of the content, equal to image_key() of the file.
+        """
+        return hashlib.blake2b(data, digest_size=20).hexdigest()
+
+    def stage_keys(self, image_key, params):
+        """
+        Derive the cache key of every stage.
+
+        Args:
+            image_key (str): Content hash from image_key().
+            params (dict): JSON-serializable parameters of each stage, keyed by stage name.
+
+        Returns:
+            dict: Cache key per stage.
+        """
+        keys = {}
+        upstream = image_key
+        for stage in self.STAGES:
+            text = json.dumps([upstream, stage, params.get(stage)], sort_keys=True)
+            upstream = hashlib.blake2b(text.encode(), digest_size=20).hexdigest()
+            keys[stage] = upstream
+        return keys
+
+    def get(self, stage, key):
+        """
+        Look up a stage output.
+
+        Args:
+            stage (str): Stage name, one of STAGES.
+            key (str): Cache key of the stage.
+
+        Returns:
+            object: The cached output, or None on a miss. Edges are an uint8 image,
+                contours a list of contours and detections a tuple of the filtered
+                contours and the Detection objects.
+        """
+        path = self._path(key)
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                value = self._decode(stage, data)
+            # Mark the entry as recently used
+            os.utime(path)
+        except (OSError, ValueError, KeyError):
+            # Missing, evicted by another process, or corrupt
+            self.stats[stage]['misses'] += 1
+            return None
+        self.stats[stage]['hits'] += 1
+        return value
+
+    def put(self, stage, key, value):
+        """
+        Store a stage output.
+
+        Args:
+            stage (str): Stage name, one of STAGES.
+            key (str): Cache key of the stage.
+            value (object): Stage output in the form returned by get().
+        """
+        arrays = self._encode(stage, value)
+        fd, temp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                np.savez(f, **arrays)
+            size = os.path.getsize(temp_path)
+            os.replace(temp_path, self._path(key))
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        self.total_bytes += size
+        if self.total_bytes > self.max_bytes:
+            self.evict()
+
+    def evict(self):
+        """
+        Remove least recently used entries until the cache fits its size cap.
+        """
+        entries = sorted(self._entries(), key=lambda entry: entry[2])
+        self.total_bytes = sum(size for _, size, _ in entries)
+        for path, size, _ in entries:
+            if self.total_bytes <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            self.total_bytes -= size
+            self.stats['evictions'] += 1
+
+    def pop_stats(self):
+        """
+        Get the hit and miss counts since the last call and reset them.
+
+        Returns:
+            dict: Hits and misses per stage and the number of evictions.
+        """
+        stats = self.stats
+        self.stats = self._empty_stats()
+        return stats
+
+    @staticmethod
+    def merge_stats(total, stats):
+        """
+        Add cache statistics, e.g. from several worker processes.
+
+        Args:
+            total (dict): Statistics to add to, or None.
+            stats (dict): Statistics from pop_stats().
+
+        Returns:
+            dict: The summed statistics.
+        """
+        if total is None:
+            return stats
+        for stage in StageCache.STAGES:
+            for count in ('hits', 'misses'):
+                total[stage][count] += stats[stage][count]
+        total['evictions'] += stats['evictions']
+        return total
+
+    def _empty_stats(self):
+        """Create zeroed statistics."""
+        stats = {stage: {'hits': 0, 'misses': 0} for stage in self.STAGES}
+        stats['evictions'] = 0
+        return stats
+
+    def _path(self, key):
+        """Get the file path of a cache key."""
+        return os.path.join(self.cache_dir, key + '.npz')
+
+    def _entries(self):
+        """
+        List the cache files.
+
+        Returns:
+            list: Tuples of path, size in bytes and last use time.
+        """
+        entries = []
+        for entry in os.scandir(self.cache_dir):
+            if not entry.name.endswith('.npz'):
+                continue
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((entry.path, stat.st_size, stat.st_mtime))
+        return entries
+
+    def _encode_contours(self, contours, prefix, arrays):
+        """Flatten contours into int32 points and offsets."""
+        counts = [len(contour) for contour in contours]
+        arrays[prefix + 'offsets'] = np.concatenate([[0], np.cumsum(counts)]).astype(np.int64)
+        if contours:
+            arrays[prefix + 'points'] = np.concatenate([contour.reshape(-1, 2) for contour in contours]).astype(np.int32)
+        else:
+            arrays[prefix + 'points'] = np.empty((0, 2), dtype=np.int32)
+
+    def _decode_contours(self, data, prefix):
+        """Rebuild contours from flat points and offsets."""
+        points = data[prefix + 'points']
+        offsets = data[prefix + 'offsets']
+        return [points[start:end].reshape(-1, 1, 2) for start, end in zip(offsets[:-1], offsets[1:])]
+
+    def _encode(self, stage, value):
+        """
+        Convert a stage output to named arrays.
+        """
+        arrays = {}
+        if stage == 'edges':
+            arrays['shape'] = np.array(value.shape, dtype=np.int64)
+            arrays['bits'] = np.packbits(value.reshape(-1) > 0)
+        elif stage == 'contours':
+            self._encode_contours(value, '', arrays)
+        elif stage == 'detections':
+            contours, detections = value
+            self._encode_contours(contours, '', arrays)
+            arrays['contour_index'] = np.array([d.contour_index for d in detections], dtype=np.int64)
+            arrays['values'] = np.array([tuple(d.circle) + tuple(d.centroid) + (d.area, d.perimeter)
+                                         for d in detections], dtype=np.float64).reshape(-1, 7)
+        else:
+            raise ValueError(f"Unknown stage: {stage}")
+        return arrays
+
+    def _decode(self, stage, data):
+        """
+        Convert named arrays back to a stage output.
+        """
+        if stage == 'edges':
+            shape = tuple(data['shape'])
+            bits = np.unpackbits(data['bits'], count=int(np.prod(shape)))
+            return (bits * 255).astype(np.uint8).reshape(shape)
+        if stage == 'contours':
+            return self._decode_contours(data, '')
+        if stage == 'detections':
+            contours = self._decode_contours(data, '')
+            detections = []
+            for index, values in zip(data['contour_index'], data['values']):
+                index = int(index)
+                circle = (values[0], values[1], values[2])
+                detections.append(Detection(index, contours[index], circle, (values[3], values[4]),
+                                            values[5], values[6]))
+            return contours, detections
+        raise ValueError(f"Unknown stage: {stage}")
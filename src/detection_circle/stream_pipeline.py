@@ -0,0 +1,364 @@
+import os
+import time
+import queue
+import threading
+import cv2
+from .frame_processor import FrameProcessor
+from .contour_processor import ContourProcessor
+from .circle_detector import CircleDetector
+from .roundness_calculator import RoundnessCalculator
+from .circle_tracker import CircleTracker
+
+VIDEO_EXTENSIONS = ('.mp4', '.avi', '.mov', '.mkv', '.m4v', '.mpg', '.mpeg', '.wmv')
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.bmp', '.tif', '.tiff')
+
+# Marks the end of the stream on a stage queue
+_END = object()
+
+class FrameSource:
+    """
+    Class for reading frames from a video file or a growing image directory.
+    """
+
+    def __init__(self, source, poll_interval=0.5, idle_timeout=None):
+        """
+        Initialize the frame source.
+
+        Args:
+            source (str): Path to a video file or to a directory of images.
+            poll_interval (float): Seconds between directory scans for new images.
+            idle_timeout (float): Stop watching a directory after this many seconds
+                without new images. None watches until interrupted.
+        """
+        self.source = source
+        self.poll_interval = poll_interval
+        self.idle_timeout = idle_timeout
+
+    def __iter__(self):
+        """
+        Iterate over the frames of the source.
+
+        Yields:
+            tuple: Frame identifier (frame index or file name) and BGR image.
+        """
+        if os.path.isdir(self.source):
+            return self._read_directory()
+        return self._read_video()
+
+    def _read_video(self):
+        """
+        Read frames from a video file with cv2.VideoCapture.
+
+        Yields:
+            tuple: Frame index and BGR image.
+        """
+        capture = cv2.VideoCapture(self.source)
+        if not capture.isOpened():
+            raise ValueError(f"Failed to open video {self.source}")
+        try:
+            index = 0
+            while True:
+                ok, frame = capture.read()
+                if not ok:
+                    break
+                yield index, frame
+                index += 1
+        finally:
+            capture.release()
+
+    def _read_directory(self, max_attempts=3):
+        """
+        Read images from a directory in name order, picking up new files as they appear.
+
+        Files that cannot be decoded yet (for example because they are still
+        being written) are retried on the next scans.
+
+        Args:
+            max_attempts (int): Number of scans a file may fail to decode before it is skipped.
+
+        Yields:
+            tuple: File name and BGR image.
+        """
+        done = set()
+        attempts = {}
+        last_new = time.monotonic()
+
+        while True:
+            names = sorted(f for f in os.listdir(self.source)
+                           if f.lower().endswith(IMAGE_EXTENSIONS) and f not in done)
+            for name in names:
+                image = cv2.imread(os.path.join(self.source, name))
+                if image is None:
+                    attempts[name] = attempts.get(name, 0) + 1
+                    if attempts[name] >= max_attempts:
+                        done.add(name)
+                    continue
+                done.add(name)
+                last_new = time.monotonic()
+                yield name, image
+
+            if self.idle_timeout is not None and time.monotonic() - last_new >= self.idle_timeout:
+                break
+            time.sleep(self.poll_interval)
+
+class StreamPipeline:
+    """
+    Class for processing a stream of frames with concurrent, bounded stages.
+
+    Each stage runs in its own thread and hands frames to the next stage
+    through a bounded queue, so a slow stage blocks the stages before it
+    instead of letting frames pile up in memory. OpenCV releases the GIL
+    in its heavy calls, which lets the stages overlap.
+    """
+
+    STAGES = ('decode', 'edges', 'detect', 'roundness', 'output')
+
+    def __init__(self, method='min_zone', queue_size=4, track=False, kernels='numpy'):
+        """
+        Initialize the pipeline.
+
+        Args:
+            method (str): Method for roundness calculation, or 'all'.
+            queue_size (int): Maximum number of frames waiting in front of each stage.
+            track (bool): Follow parts from frame to frame with a CircleTracker,
+                warm-starting their solvers and reusing unchanged measurements.
+            kernels (str): Distance kernels of the roundness calculator, 'numpy' or 'numba'.
+        """
+        self.method = method
+        self.queue_size = queue_size
+        # An edge image is alive in the edges stage, in the detect queue and in
+        # the detect stage, so queue_size + 2 buffers are never overwritten early
+        self.image_processor = FrameProcessor(edge_buffers=queue_size + 2)
+        self.contour_processor = ContourProcessor()
+        self.circle_detector = CircleDetector()
+        self.roundness_calculator = RoundnessCalculator(kernels)
+        # Frames reach the roundness stage in order, so one tracker sees them all
+        self.tracker = CircleTracker(self.roundness_calculator) if track else None
+        self.queues = {}
+        self.stage_stats = {}
+        self.frames = 0
+        self.elapsed = 0.0
+
+    def run(self, source, on_result=None):
+        """
+        Process all frames of a source.
+
+        Args:
+            source (iterable): Iterable of (frame_id, image) pairs, e.g. a FrameSource.
+            on_result (callable): Called from the output stage with each frame result.
+
+        Returns:
+            dict: Pipeline report, see report().
+        """
+        # One queue in front of every stage after decoding
+        self.queues = {stage: queue.Queue(maxsize=self.queue_size) for stage in self.STAGES[1:]}
+        self.stage_stats = {stage: {'busy': 0.0, 'max_depth': 0, 'depth_sum': 0, 'items': 0}
+                            for stage in self.STAGES}
+        self.frames = 0
+        errors = []
+        stop = threading.Event()
+
+        def emit(result):
+            self.frames += 1
+            if on_result is not None:
+                on_result(result)
+
+        handlers = {
+            'decode': None,
+            'edges': self._edges_stage,
+            'detect': self._detect_stage,
+            'roundness': self._roundness_stage,
+            'output': emit,
+        }
+
+        threads = [threading.Thread(target=self._decode_worker, args=(source, stop, errors),
+                                    name='decode', daemon=True)]
+        for stage in self.STAGES[1:]:
+            threads.append(threading.Thread(target=self._stage_worker,
+                                            args=(stage, handlers[stage], stop, errors),
+                                            name=stage, daemon=True))
+
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        try:
+            for thread in threads:
+                while thread.is_alive():
+                    thread.join(0.1)
+        except KeyboardInterrupt:
+            stop.set()
+            for thread in threads:
+                thread.join()
+        self.elapsed = time.perf_counter() - start
+
+        if errors:
+            raise errors[0]
+        return self.report()
+
+    def queue_depths(self):
+        """
+        Get the current number of frames waiting in front of each stage.
+
+        Returns:
+            dict: Queue depth per stage.
+        """
+        return {stage: q.qsize() for stage, q in self.queues.items()}
+
+    def report(self):
+        """
+        Summarize throughput, per-stage busy time and queue depths.
+
+        A stage whose input queue is often full, or whose busy time is close
+        to the total elapsed time, is the bottleneck. The decode busy time
+        includes waiting for the source to deliver frames.
+
+        Returns:
+            dict: Frame count, elapsed seconds, frames per second and per-stage
+                statistics, and with tracking the tracker statistics.
+        """
+        stages = {}
+        for stage, stats in self.stage_stats.items():
+            items = stats['items']
+            stages[stage] = {
+                'busy': stats['busy'],
+                'max_depth': stats['max_depth'],
+                'mean_depth': stats['depth_sum'] / items if items else 0.0,
+            }
+        report = {
+            'frames': self.frames,
+            'elapsed': self.elapsed,
+            'fps': self.frames / self.elapsed if self.elapsed > 0 else 0.0,
+            'stages': stages,
+        }
+        if self.tracker is not None:
+            report['tracking'] = dict(self.tracker.stats)
+        return report
+
+    def _put(self, stage, item, stop):
+        """
+        Put an item on the queue in front of a stage, waiting while it is full.
+
+        Args:
+            stage (str): Name of the receiving stage.
+            item (object): Item to enqueue.
+            stop (threading.Event): Set when the pipeline is shutting down.
+
+        Returns:
+            bool: False if the pipeline stopped before the item could be queued.
+        """
+        while not stop.is_set():
+            try:
+                self.queues[stage].put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _decode_worker(self, source, stop, errors):
+        """
+        Read frames from the source and feed the first processing stage.
+        """
+        stats = self.stage_stats['decode']
+        try:
+            iterator = iter(source)
+            while not stop.is_set():
+                started = time.perf_counter()
+                try:
+                    frame_id, image = next(iterator)
+                except StopIteration:
+                    break
+                stats['busy'] += time.perf_counter() - started
+                stats['items'] += 1
+                if not self._put('edges', {'frame': frame_id, 'image': image}, stop):
+                    break
+        except Exception as e:
+            errors.append(e)
+            stop.set()
+        finally:
+            self._put('edges', _END, stop)
+
+    def _stage_worker(self, stage, handler, stop, errors):
+        """
+        Take items from a stage queue, process them and pass them on.
+        """
+        stats = self.stage_stats[stage]
+        next_stage = self.STAGES[self.STAGES.index(stage) + 1] if stage != 'output' else None
+        try:
+            while not stop.is_set():
+                try:
+                    item = self.queues[stage].get(timeout=0.1)
+                except queue.Empty:
+                    continue
+                if item is _END:
+                    break
+
+                depth = self.queues[stage].qsize()
+                stats['max_depth'] = max(stats['max_depth'], depth)
+                stats['depth_sum'] += depth
+                stats['items'] += 1
+
+                started = time.perf_counter()
+                if next_stage is None:
+                    handler(item)
+                elif 'error' not in item:
+                    try:
+                        item = handler(item)
+                    except Exception as e:
+                        # A bad frame is reported downstream instead of stopping the stream
+                        item = {'frame': item['frame'], 'error': str(e)}
+                stats['busy'] += time.perf_counter() - started
+
+                if next_stage is not None and not self._put(next_stage, item, stop):
+                    break
+        except Exception as e:
+            errors.append(e)
+            stop.set()
+        finally:
+            if next_stage is not None:
+                self._put(next_stage, _END, stop)
+
+    def _edges_stage(self, item):
+        """
+        Preprocess a frame and detect its edges.
+        """
+        processed_image = self.image_processor.preprocess(item['image'])
+        return {'frame': item['frame'], 'edges': self.image_processor.detect_edges(processed_image)}
+
+    def _detect_stage(self, item):
+        """
+        Extract and filter contours and detect circles.
+        """
+        contours = self.image_processor.extract_contours(item['edges'])
+        filtered_contours = self.contour_processor.filter_contours(contours)
+        detections = self.circle_detector.detect(filtered_contours)
+        return {'frame': item['frame'], 'detections': detections}
+
+    def _roundness_stage(self, item):
+        """
+        Measure the roundness of every detected circle.
+        """
+        detections = item['detections']
+        points = [self.contour_processor.single_line_processing(detection.contour) for detection in detections]
+        if self.tracker is not None:
+            tracked = self.tracker.update([detection.circle for detection in detections], points, self.method)
+        else:
+            tracked = [(None, self.roundness_calculator.measure(part, self.method)) for part in points]
+
+        results = []
+        for i, (detection, (track_id, measurements)) in enumerate(zip(detections, tracked)):
+            circle = detection.circle
+            for method_key, (inner_circle, outer_circle, roundness) in measurements.items():
+                result = {
+                    'circle_index': i,
+                    'contour_index': detection.contour_index,
+                    'center': (circle[0], circle[1]),
+                    'radius': circle[2],
+                    'inner_circle': inner_circle,
+                    'outer_circle': outer_circle,
+                    'roundness': roundness,
+                    'method': method_key,
+                }
+                if track_id is not None:
+                    result['track_id'] = track_id
+                results.append(result)
+        return {'frame': item['frame'], 'results': results}
@@ -0,0 +1,161 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+import cv2
+import numpy as np
+from .image_processor import ImageProcessor
+
+class TiledProcessor:
+    """
+    Class for extracting contours from very large images tile by tile.
+
+    The image is split into a grid of core regions, and each tile is a core
+    region extended by an overlap margin on every side. Tiles are
+    preprocessed, edge-detected and contoured independently in a thread
+    pool, so intermediate arrays are bounded by the tile size. A contour is
+    kept only by the tile whose core contains its centroid and only if it
+    does not reach the tile border, which drops partial contours and
+    deduplicates contours seen by several tiles. Parts smaller than the
+    overlap are therefore found exactly as in full-frame processing.
+    """
+
+    # Pixels next to a tile border whose edges depend on pixels outside the
+    # tile (Gaussian blur, Canny and morphology neighbourhoods)
+    CONTEXT = 8
+
+    def __init__(self, tile_size=2048, overlap=256, workers=None, image_processor=None):
+        """
+        Initialize the tiled processor.
+
+        Args:
+            tile_size (int): Side length of the core region of a tile, in pixels.
+            overlap (int): Margin added around each core region, in pixels.
+                Should exceed the largest part diameter.
+            workers (int): Number of threads processing tiles; defaults to the CPU count.
+            image_processor (ImageProcessor): Processor used for every tile.
+        """
+        if tile_size <= 0 or overlap <= self.CONTEXT:
+            raise ValueError("tile_size must be positive and overlap larger than the context margin")
+        self.tile_size = tile_size
+        self.overlap = overlap
+        self.workers = workers or os.cpu_count() or 1
+        self.image_processor = image_processor or ImageProcessor()
+
+    def tiles(self, shape):
+        """
+        Compute the tile layout for an image shape.
+
+        Args:
+            shape (tuple): Image shape (height, width, ...).
+
+        Returns:
+            list: Tuples of core region (x0, y0, x1, y1) and extended region (x0, y0, x1, y1).
+        """
+        height, width = shape[:2]
+        layout = []
+        for y0 in range(0, height, self.tile_size):
+            for x0 in range(0, width, self.tile_size):
+                core = (x0, y0, min(x0 + self.tile_size, width), min(y0 + self.tile_size, height))
+                extended = (max(core[0] - self.overlap, 0), max(core[1] - self.overlap, 0),
+                            min(core[2] + self.overlap, width), min(core[3] + self.overlap, height))
+                layout.append((core, extended))
+        return layout
+
+    def extract_contours(self, image, edges_out=None):
+        """
+        Extract external contours from an image tile by tile.
+
+        Args:
+            image (numpy.ndarray): The input BGR or grayscale image.
+            edges_out (numpy.ndarray): Optional uint8 array of the image height and
+                width that receives the edge image of every core region.
+
+        Returns:
+            list: List of contours in full-image coordinates.
+        """
+        shape = image.shape
+        layout = self.tiles(shape)
+
+        def process_tile(tile):
+            core, extended = tile
+            return self._process_tile(image, shape, core, extended, edges_out)
+
+        if self.workers > 1 and len(layout) > 1:
+            with ThreadPoolExecutor(max_workers=self.workers) as executor:
+                tile_contours = list(executor.map(process_tile, layout))
+        else:
+            tile_contours = [process_tile(tile) for tile in layout]
+
+        contours = [contour for tile in tile_contours for contour in tile]
+        return self._remove_enclosed(contours)
+
+    def _process_tile(self, image, shape, core, extended, edges_out):
+        """
+        Extract the contours owned by one tile.
+
+        Args:
+            image (numpy.ndarray): The full input image.
+            shape (tuple): Image shape.
+            core (tuple): Core region (x0, y0, x1, y1).
+            extended (tuple): Extended region (x0, y0, x1, y1).
+            edges_out (numpy.ndarray): Optional full-size edge image to fill.
+
+        Returns:
+            list: Contours in full-image coordinates.
+        """
+        ex0, ey0, ex1, ey1 = extended
+        processed = self.image_processor.preprocess(image[ey0:ey1, ex0:ex1])
+        edges = self.image_processor.detect_edges(processed)
+        if edges_out is not None:
+            cx0, cy0, cx1, cy1 = core
+            edges_out[cy0:cy1, cx0:cx1] = edges[cy0 - ey0:cy1 - ey0, cx0 - ex0:cx1 - ex0]
+        contours = self.image_processor.extract_contours(edges)
+
+        # Contours reaching into the context margin may be cut off or altered by
+        # the tile border, unless that border is the image border
+        height, width = shape[:2]
+        lo_x = ex0 + self.CONTEXT if ex0 > 0 else -1
+        lo_y = ey0 + self.CONTEXT if ey0 > 0 else -1
+        hi_x = ex1 - self.CONTEXT if ex1 < width else width + 1
+        hi_y = ey1 - self.CONTEXT if ey1 < height else height + 1
+
+        owned = []
+        offset = np.array([ex0, ey0], dtype=np.int32)
+        for contour in contours:
+            x, y, w, h = cv2.boundingRect(contour)
+            x += ex0
+            y += ey0
+            if x < lo_x or y < lo_y or x + w > hi_x or y + h > hi_y:
+                continue
+            centroid = np.mean(contour.reshape(-1, 2), axis=0) + offset
+            if core[0] <= centroid[0] < core[2] and core[1] <= centroid[1] < core[3]:
+                owned.append(contour + offset)
+        return owned
+
+    def _remove_enclosed(self, contours):
+        """
+        Drop contours enclosed by another contour.
+
+        A contour enclosed by a part that crosses a tile border is external
+        within that tile, but not in the full image.
+
+        Args:
+            contours (list): List of contours in full-image coordinates.
+
+        Returns:
+            list: Contours not enclosed by any other contour, in tile order.
+        """
+        if len(contours) < 2:
+            return contours
+        boxes = np.array([cv2.boundingRect(contour) for contour in contours])
+        x0, y0 = boxes[:, 0], boxes[:, 1]
+        x1, y1 = x0 + boxes[:, 2], y0 + boxes[:, 3]
+
+        keep = []
+        for i, contour in enumerate(contours):
+            # Only contours with a strictly larger bounding box can enclose it
+            around = np.flatnonzero((x0 <= x0[i]) & (y0 <= y0[i]) & (x1 >= x1[i]) & (y1 >= y1[i])
+                                    & (boxes[:, 2] * boxes[:, 3] > boxes[i, 2] * boxes[i, 3]))
+            point = (float(contour[0, 0, 0]), float(contour[0, 0, 1]))
+            if not any(cv2.pointPolygonTest(contours[j], point, False) > 0 for j in around):
+                keep.append(contour)
+        return keep
@@ -0,0 +1,252 @@
+import cv2
+import numpy as np
+
+class Visualizer:
+    """
+    Class for visualizing images, contours, and circles.
+    """
+    
+    def __init__(self, preview_scale=0.25, thumbnail_margin=0.2):
+        """
+        Initialize the visualizer.
+        
+        Args:
+            preview_scale (float): Scale of downscaled preview images.
+            thumbnail_margin (float): Margin around a part in its thumbnail, as a
+                fraction of the part radius.
+        """
+        self.preview_scale = preview_scale
+        self.thumbnail_margin = thumbnail_margin
+    
+    def display_image(self, image, title="Image"):
+        """
+        Display an image using matplotlib.
+        
+        Args:
+            image (numpy.ndarray): The image to display.
+            title (str): Title for the image.
+        """
+        # Imported here so that runs without a display do not load matplotlib
+        import matplotlib.pyplot as plt
+        
+        # Convert BGR to RGB for matplotlib
+        if len(image.shape) == 3 and image.shape[2] == 3:
+            image_rgb = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+        else:
+            image_rgb = image
+            
+        plt.figure(figsize=(10, 8))
+        plt.imshow(image_rgb, cmap='gray' if len(image.shape) == 2 else None)
+        plt.title(title)
+        plt.axis('off')
+        plt.tight_layout()
+        plt.show()
+    
+    def draw_contours(self, image, contours, color=(0, 255, 0), thickness=2):
+        """
+        Draw contours on an image.
+        
+        Args:
+            image (numpy.ndarray): The image to draw on.
+            contours (list): List of contours.
+            color (tuple): BGR color for contours.
+            thickness (int): Line thickness.
+            
+        Returns:
+            numpy.ndarray: Image with contours drawn.
+        """
+        # Create a copy of the image to avoid modifying the original
+        result = image.copy()
+        
+        # Draw all contours
+        cv2.drawContours(result, contours, -1, color, thickness)
+        
+        return result
+    
+    def draw_circles(self, image, circles, color=(0, 0, 255), thickness=2):
+        """
+        Draw circles on an image.
+        
+        Args:
+            image (numpy.ndarray): The image to draw on.
+            circles (list): List of circles, each represented as (center_x, center_y, radius).
+            color (tuple): BGR color for circles.
+            thickness (int): Line thickness.
+            
+        Returns:
+            numpy.ndarray: Image with circles drawn.
+        """
+        # Create a copy of the image to avoid modifying the original
+        result = image.copy()
+        
+        # Draw all circles
+        for circle in circles:
+            center_x, center_y, radius = circle
+            center = (int(center_x), int(center_y))
+            radius = int(radius)
+            
+            # Draw the circle
+            cv2.circle(result, center, radius, color, thickness)
+            
+            # Draw the center
+            cv2.circle(result, center, 5, color, -1)
+        
+        return result
+    
+    def visualize_roundness(self, image, inner_circle, outer_circle, method_name=""):
+        """
+        Visualize roundness calculation by drawing inner and outer circles.
+        
+        Args:
+            image (numpy.ndarray): The image to draw on.
+            inner_circle (tuple): Inner circle (center_x, center_y, radius).
+            outer_circle (tuple): Outer circle (center_x, center_y, radius).
+            method_name (str): Name of the roundness calculation method.
+            
+        Returns:
+            numpy.ndarray: Image with roundness visualization.
+        """
+        # Create a copy of the image to avoid modifying the original
+        result = image.copy()
+        
+        # Draw inner circle
+        center_x, center_y, radius = inner_circle
+        center = (int(center_x), int(center_y))
+        radius = int(radius)
+        cv2.circle(result, center, radius, (0, 255, 0), 2)
+        
+        # Draw outer circle
+        center_x, center_y, radius = outer_circle
+        center = (int(center_x), int(center_y))
+        radius = int(radius)
+        cv2.circle(result, center, radius, (0, 0, 255), 2)
+        
+        # Draw center
+        cv2.circle(result, center, 5, (255, 0, 0), -1)
+        
+        # Calculate roundness
+        roundness = outer_circle[2] - inner_circle[2]
+        
+        # Add text with roundness value
+        text = f"{method_name} Roundness: {roundness:.2f} pixels"
+        cv2.putText(result, text, (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 1, (255, 255, 255), 2)
+        
+        return result
+    
+    def draw_roundness(self, image, inner_circle, outer_circle, label=""):
+        """
+        Draw the inner and outer circles of a part and a label next to it, in place.
+        
+        Unlike visualize_roundness, this does not copy the image, so the
+        results of many parts can be drawn onto one image.
+        
+        Args:
+            image (numpy.ndarray): The image to draw on; modified in place.
+            inner_circle (tuple): Inner circle (center_x, center_y, radius).
+            outer_circle (tuple): Outer circle (center_x, center_y, radius).
+            label (str): Text drawn at the upper right of the outer circle, within
+                its extent where it fits; may span several lines separated by newlines.
+            
+        Returns:
+            numpy.ndarray: The same image, with the roundness drawn.
+        """
+        center_x, center_y, radius = inner_circle
+        cv2.circle(image, (int(center_x), int(center_y)), int(radius), (0, 255, 0), 2)
+        
+        center_x, center_y, radius = outer_circle
+        cv2.circle(image, (int(center_x), int(center_y)), int(radius), (0, 0, 255), 2)
+        cv2.circle(image, (int(center_x), int(center_y)), 5, (255, 0, 0), -1)
+        
+        # Write the label lines next to the part, kept inside the image
+        lines = label.split("\n") if label else []
+        font, scale, thickness = cv2.FONT_HERSHEY_SIMPLEX, 0.8, 2
+        sizes = [cv2.getTextSize(line, font, scale, thickness)[0] for line in lines]
+        if lines:
+            line_height = max(height for _, height in sizes) + 10
+            text_width = max(width for width, _ in sizes)
+            x = min(int(center_x + 0.7 * radius), int(center_x + radius) - text_width,
+                    image.shape[1] - text_width - 5)
+            y = min(max(int(center_y - 0.7 * radius), line_height),
+                    image.shape[0] - line_height * (len(lines) - 1) - 5)
+            for k, line in enumerate(lines):
+                cv2.putText(image, line, (max(x, 5), y + k * line_height), font, scale,
+                            (255, 255, 255), thickness)
+        
+        return image
+    
+    def render_overlay(self, image, contours=(), circles=(), measurements=(), scale=1.0):
+        """
+        Draw contours, fitted circles and the roundness of every part onto one canvas.
+        
+        The image is copied (or downscaled) once and everything is drawn onto
+        that copy, so the cost does not grow with a full-frame copy per part.
+        
+        Args:
+            image (numpy.ndarray): The BGR or grayscale input image; not modified.
+            contours (list): Contours to draw, in image coordinates.
+            circles (list): Fitted circles (center_x, center_y, radius) to draw.
+            measurements (list): Tuples of inner circle, outer circle and label per part.
+            scale (float): Scale of the canvas relative to the image.
+            
+        Returns:
+            numpy.ndarray: The BGR canvas.
+        """
+        if scale != 1.0:
+            canvas = cv2.resize(image, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+        else:
+            canvas = image.copy()
+        if canvas.ndim == 2:
+            canvas = cv2.cvtColor(canvas, cv2.COLOR_GRAY2BGR)
+        
+        scale_circle = lambda circle: (circle[0] * scale, circle[1] * scale, circle[2] * scale)
+        
+        # Draw all contours
+        if scale != 1.0:
+            contours = [np.round(contour * scale).astype(np.int32) for contour in contours]
+        cv2.drawContours(canvas, list(contours), -1, (0, 255, 0), 2)
+        
+        # Draw all fitted circles and their centers
+        for circle in circles:
+            center_x, center_y, radius = scale_circle(circle)
+            center = (int(center_x), int(center_y))
+            cv2.circle(canvas, center, int(radius), (0, 0, 255), 2)
+            cv2.circle(canvas, center, 5, (0, 0, 255), -1)
+        
+        # Draw the inner and outer circles and a label for every part
+        for inner_circle, outer_circle, label in measurements:
+            self.draw_roundness(canvas, scale_circle(inner_circle), scale_circle(outer_circle), label)
+        
+        return canvas
+    
+    def thumbnails(self, canvas, circles, scale=1.0):
+        """
+        Crop the region around each part from a rendered canvas.
+        
+        Args:
+            canvas (numpy.ndarray): Canvas from render_overlay().
+            circles (list): Circles (center_x, center_y, radius) in image coordinates.
+            scale (float): Scale the canvas was rendered at.
+            
+        Returns:
+            list: One view into the canvas per circle.
+        """
+        height, width = canvas.shape[:2]
+        crops = []
+        for center_x, center_y, radius in circles:
+            extent = radius * (1 + self.thumbnail_margin) * scale
+            x0 = max(int(center_x * scale - extent), 0)
+            y0 = max(int(center_y * scale - extent), 0)
+            x1 = min(int(np.ceil(center_x * scale + extent)), width)
+            y1 = min(int(np.ceil(center_y * scale + extent)), height)
+            crops.append(canvas[y0:y1, x0:x1])
+        return crops
+    
+    def save_image(self, image, filename):
+        """
+        Save an image to a file.
+        
+        Args:
+            image (numpy.ndarray): The image to save.
+            filename (str): Path to save the image.
+        """
+        cv2.imwrite(filename, image)
@@ -0,0 +1,487 @@
+import time
+import numpy as np
+from scipy.spatial import ConvexHull, Delaunay, Voronoi, cKDTree, QhullError
+
+class VoronoiSolver:
+    """
+    Class for exact roundness evaluation based on Voronoi diagrams.
+
+    The minimum zone center is a vertex of the overlay of the farthest-point
+    and nearest-point Voronoi diagrams of the profile: either a vertex of one
+    of the diagrams or an intersection of an edge of each. Instead of forming
+    the full overlay, the solver prunes the plane with a quadtree (the zone
+    width is 2-Lipschitz in the center) and only intersects the Voronoi edges
+    that cross the surviving cells.
+
+    Each solve records its point count, the number of candidate centers it
+    evaluated and the elapsed time in ``stats``.
+    """
+
+    def __init__(self, max_cells=4096):
+        """
+        Initialize the solver.
+
+        Args:
+            max_cells (int): Maximum number of quadtree cells kept per level.
+        """
+        self.max_cells = max_cells
+        self.stats = {}
+
+    def min_zone(self, points, hull=None, tree=None, initial_center=None):
+        """
+        Find the exact minimum zone annulus of a set of points.
+
+        Args:
+            points (numpy.ndarray): Array of points (N, 2).
+            hull (numpy.ndarray): Precomputed convex hull points (H, 2), optional.
+            tree (scipy.spatial.cKDTree): Precomputed k-d tree of the points, optional.
+            initial_center (tuple): A center (x, y) expected to be close to the
+                optimum, e.g. from the previous frame, optional. A tighter initial
+                bound prunes more of the plane; the result stays exact.
+
+        Returns:
+            tuple: Center coordinates (x, y), inner radius and outer radius.
+
+        Raises:
+            ValueError: If the points are degenerate (fewer than four distinct
+                points or all collinear).
+        """
+        start = time.perf_counter()
+        points = self._validate_points(points)
+
+        # Only the convex hull vertices can be farthest from a center
+        if hull is None:
+            hull = points[ConvexHull(points).vertices]
+        if tree is None:
+            tree = cKDTree(points)
+
+        # Search inside a square box around the profile
+        lo = points.min(axis=0)
+        hi = points.max(axis=0)
+        diameter = np.max(hi - lo)
+        box_origin = (lo + hi) / 2 - diameter
+        box_side = 2 * diameter
+
+        def zone_width(centers):
+            outer = self._max_distances(centers, hull)
+            inner = tree.query(centers)[0]
+            return outer - inner
+
+        # Upper bound from the centroid, the least squares center and the warm start
+        initial = [points.mean(axis=0), self._least_squares_center(points)]
+        if initial_center is not None:
+            initial.append(np.asarray(initial_center, dtype=np.float64))
+        initial = np.array(initial)
+        best_width = np.min(zone_width(initial))
+
+        # Quadtree pruning: a cell of half-diagonal L around m can only hold
+        # a center better than best_width if width(m) - 2L <= best_width
+        side = box_side
+        cells = (box_origin + side / 2)[None, :]
+        offsets = np.array([[-1, -1], [1, -1], [-1, 1], [1, 1]]) / 4.0
+        while True:
+            widths = zone_width(cells)
+            best_width = min(best_width, np.min(widths))
+            half_diagonal = side * np.sqrt(2) / 2
+            cells = cells[widths - 2 * half_diagonal <= best_width + 1e-12]
+            min_side = max(best_width / 4, diameter * 1e-9)
+            if side <= min_side or 4 * len(cells) > self.max_cells:
+                break
+            cells = (cells[:, None, :] + offsets[None, :, :] * side).reshape(-1, 2)
+            side /= 2
+        half_diagonal = side * np.sqrt(2) / 2
+
+        # Within a cell only points close to the nearest/farthest distance of
+        # its center can become nearest/farthest, so both diagrams are built
+        # from those sites only; restricted to the cells they are unchanged.
+        inner_radius = tree.query(cells)[0] + 2 * half_diagonal
+        near = tree.query_ball_point(cells, inner_radius, return_sorted=False)
+        inner_sites = np.unique(np.concatenate([np.asarray(i, dtype=np.intp) for i in near]))
+        outer_radius = self._max_distances(cells, hull) - 2 * half_diagonal
+        outer_sites = np.zeros(len(hull), dtype=bool)
+        for start_cell in range(0, len(cells), 256):
+            block = cells[start_cell:start_cell + 256]
+            distances = np.sqrt(np.sum((block[:, None, :] - hull[None]) ** 2, axis=2))
+            outer_sites |= np.any(distances >= outer_radius[start_cell:start_cell + 256, None], axis=0)
+
+        ray_length = 2 * box_side
+        fvd_vertices, fvd_segments = self._farthest_voronoi(hull[outer_sites], hull, ray_length)
+        nvd_vertices, nvd_segments = self._nearest_voronoi(points[inner_sites], points, ray_length)
+
+        cell_keys = np.unique(self._cell_keys(cells, box_origin, side))
+
+        def in_cells(candidates):
+            keys = self._cell_keys(candidates, box_origin, side)
+            return np.isin(keys, cell_keys)
+
+        # Candidate centers: diagram vertices and edge intersections in the cells
+        vertices = np.vstack((fvd_vertices, nvd_vertices))
+        candidates = [vertices[in_cells(vertices)], cells]
+        fvd_segments = self._segments_in_cells(fvd_segments, cells, side)
+        nvd_segments = self._segments_in_cells(nvd_segments, cells, side)
+        crossings = self._intersections(fvd_segments, nvd_segments)
+        candidates.append(crossings[in_cells(crossings)])
+        candidates = np.vstack(candidates)
+
+        widths = zone_width(candidates)
+        best = np.argmin(widths)
+        center = candidates[best]
+        inner_radius = tree.query(center)[0]
+        outer_radius = self._max_distances(center[None, :], hull)[0]
+
+        self.stats = {
+            'points': len(points),
+            'hull_points': len(hull),
+            'inner_sites': len(inner_sites),
+            'outer_sites': int(np.count_nonzero(outer_sites)),
+            'cells': len(cells),
+            'candidates': len(candidates),
+            'elapsed': time.perf_counter() - start,
+        }
+
+        return (center[0], center[1]), inner_radius, outer_radius
+
+    def max_inscribed(self, points, tree=None):
+        """
+        Find the exact maximum inscribed circle of a closed profile.
+
+        The largest empty circle centered inside the profile polygon is
+        centered either at a nearest-point Voronoi vertex inside the polygon
+        or where a Voronoi edge crosses the polygon boundary. Vertices are
+        tested in order of decreasing radius, so usually only the first few
+        need a point-in-polygon test.
+
+        Args:
+            points (numpy.ndarray): Array of profile points (N, 2), in contour order.
+            tree (scipy.spatial.cKDTree): Precomputed k-d tree of the points, optional.
+
+        Returns:
+            tuple: Center coordinates (x, y), inner radius and outer radius.
+
+        Raises:
+            ValueError: If the points are degenerate or no Voronoi vertex lies
+                inside the profile.
+        """
+        start = time.perf_counter()
+        points = self._validate_points(points)
+        if tree is None:
+            tree = cKDTree(points)
+
+        # Voronoi vertices are the Delaunay circumcenters and, the Delaunay
+        # circles being empty, their radii are the circumradii
+        simplices = Delaunay(points).simplices
+        vertices = self._circumcenters(points[simplices])
+        radii = np.sqrt(np.sum((vertices - points[simplices[:, 0]])**2, axis=1))
+        radii[~np.isfinite(radii)] = -np.inf
+        order = np.argsort(-radii, kind='stable')
+
+        # Test vertices for containment in growing batches, largest first
+        best = None
+        tested = 0
+        batch_size = 8
+        while tested < len(order):
+            batch = order[tested:tested + batch_size]
+            tested += len(batch)
+            inside = np.flatnonzero(self._inside_polygon(vertices[batch], points))
+            if len(inside):
+                best = batch[inside[0]]
+                break
+            batch_size *= 2
+        if best is None:
+            raise ValueError("No Voronoi vertex lies inside the profile")
+        center = vertices[best]
+        inner_radius = tree.query(center)[0]
+
+        # A circle centered on a boundary edge cannot be larger than half the
+        # edge length, so only long edges need their Voronoi crossings checked
+        edges = np.stack((points, np.roll(points, -1, axis=0)), axis=1)
+        lengths = np.linalg.norm(edges[:, 1] - edges[:, 0], axis=1)
+        edges = edges[lengths / 2 > inner_radius]
+        crossings = np.empty((0, 2))
+        if len(edges):
+            ray_length = 2 * np.max(np.ptp(points, axis=0))
+            segments = self._nearest_voronoi(points, points, ray_length)[1]
+            crossings = self._intersections(edges, segments)
+        if len(crossings):
+            crossing_radii = tree.query(crossings)[0]
+            candidate = np.argmax(crossing_radii)
+            if crossing_radii[candidate] > inner_radius:
+                center = crossings[candidate]
+                inner_radius = crossing_radii[candidate]
+
+        outer_radius = np.max(np.sqrt(np.sum((points - center)**2, axis=1)))
+
+        self.stats = {
+            'points': len(points),
+            'vertices': len(vertices),
+            'candidates': tested + len(crossings),
+            'elapsed': time.perf_counter() - start,
+        }
+
+        return (center[0], center[1]), inner_radius, outer_radius
+
+    def _inside_polygon(self, positions, polygon):
+        """
+        Test which positions lie inside a polygon using the even-odd rule.
+
+        Args:
+            positions (numpy.ndarray): Array of positions (M, 2).
+            polygon (numpy.ndarray): Polygon vertices (N, 2), in order.
+
+        Returns:
+            numpy.ndarray: Boolean mask (M,).
+        """
+        x = positions[:, 0:1]
+        y = positions[:, 1:2]
+        x0, y0 = polygon[:, 0], polygon[:, 1]
+        x1, y1 = np.roll(x0, -1), np.roll(y0, -1)
+        straddles = (y0 > y) != (y1 > y)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            x_cross = x0 + (y - y0) * (x1 - x0) / (y1 - y0)
+        return np.count_nonzero(straddles & (x < x_cross), axis=1) % 2 == 1
+
+    def _validate_points(self, points):
+        """
+        Convert points to a float64 array and reject degenerate input.
+
+        Args:
+            points (numpy.ndarray): Array of points (N, 2).
+
+        Returns:
+            numpy.ndarray: Array of points (N, 2).
+
+        Raises:
+            ValueError: If there are fewer than four points or all points are collinear.
+        """
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        if len(points) < 4:
+            raise ValueError("At least four points are required")
+        if np.linalg.matrix_rank(points - points.mean(axis=0)) < 2:
+            raise ValueError("Points are collinear")
+        return points
+
+    def _least_squares_center(self, points):
+        """
+        Compute the algebraic least squares circle center.
+
+        Args:
+            points (numpy.ndarray): Array of points (N, 2).
+
+        Returns:
+            numpy.ndarray: Center coordinates (2,).
+        """
+        mean = points.mean(axis=0)
+        shifted = points - mean
+        A = np.column_stack((2 * shifted, np.ones(len(points))))
+        b = np.sum(shifted**2, axis=1)
+        solution = np.linalg.lstsq(A, b, rcond=None)[0]
+        return mean + solution[:2]
+
+    def _max_distances(self, centers, hull, chunk_size=4096):
+        """
+        Compute the distance from each center to its farthest hull point.
+
+        Args:
+            centers (numpy.ndarray): Array of centers (M, 2).
+            hull (numpy.ndarray): Array of convex hull points (H, 2).
+            chunk_size (int): Number of centers processed at once.
+
+        Returns:
+            numpy.ndarray: Maximum distances (M,).
+        """
+        result = np.empty(len(centers))
+        for start in range(0, len(centers), chunk_size):
+            block = centers[start:start + chunk_size]
+            dx = block[:, 0:1] - hull[None, :, 0]
+            dy = block[:, 1:2] - hull[None, :, 1]
+            result[start:start + chunk_size] = np.sqrt(np.max(dx * dx + dy * dy, axis=1))
+        return result
+
+    def _circumcenters(self, triangles):
+        """
+        Compute the circumcenters of a set of triangles.
+
+        Args:
+            triangles (numpy.ndarray): Triangle vertices (T, 3, 2).
+
+        Returns:
+            numpy.ndarray: Circumcenters (T, 2); NaN for degenerate triangles.
+        """
+        a = triangles[:, 0]
+        b = triangles[:, 1] - a
+        c = triangles[:, 2] - a
+        d = 2 * (b[:, 0] * c[:, 1] - b[:, 1] * c[:, 0])
+        b2 = np.sum(b**2, axis=1)
+        c2 = np.sum(c**2, axis=1)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            ux = (c[:, 1] * b2 - b[:, 1] * c2) / d
+            uy = (b[:, 0] * c2 - c[:, 0] * b2) / d
+        return a + np.column_stack((ux, uy))
+
+    def _farthest_voronoi(self, sites, hull, ray_length):
+        """
+        Build the farthest-point Voronoi diagram of convex hull points.
+
+        The farthest-point Delaunay triangulation is the upper convex hull of
+        the points lifted onto the paraboloid z = x^2 + y^2.
+
+        Args:
+            sites (numpy.ndarray): Convex hull points to build the diagram from (S, 2).
+            hull (numpy.ndarray): All convex hull points (H, 2), used when the
+                sites are too few to form a triangulation.
+            ray_length (float): Length used to clip unbounded edges.
+
+        Returns:
+            tuple: Vertices (V, 2) and edge segments (E, 2, 2).
+        """
+        hull = sites if len(sites) >= 3 else hull
+        if len(hull) == 3:
+            # A triangle is its own farthest-point triangulation: the diagram is
+            # its circumcenter with a ray per edge. Qhull needs four points.
+            triangles = np.array([[0, 1, 2]])
+        else:
+            lifted = np.column_stack((hull, np.sum(hull**2, axis=1)))
+            try:
+                hull3d = ConvexHull(lifted)
+            except QhullError:
+                # Co-circular hull points lift onto a plane
+                hull3d = ConvexHull(lifted, qhull_options='QJ')
+            triangles = hull3d.simplices[hull3d.equations[:, 2] > 0]
+        centers = self._circumcenters(hull[triangles])
+
+        # Each triangulation edge shared by two triangles is a bounded edge
+        edges = np.sort(triangles[:, [[0, 1], [1, 2], [2, 0]]], axis=2).reshape(-1, 2)
+        owners = np.repeat(np.arange(len(triangles)), 3)
+        keys = edges[:, 0] * len(hull) + edges[:, 1]
+        order = np.argsort(keys, kind='stable')
+        keys, edges, owners = keys[order], edges[order], owners[order]
+        shared = np.flatnonzero(keys[1:] == keys[:-1])
+        segments = np.stack((centers[owners[shared]], centers[owners[shared + 1]]), axis=1)
+
+        # Convex hull edges give rays pointing away from the edge
+        single = np.ones(len(keys), dtype=bool)
+        single[shared] = False
+        single[shared + 1] = False
+        p = hull[edges[single, 0]]
+        q = hull[edges[single, 1]]
+        normal = np.column_stack((q[:, 1] - p[:, 1], p[:, 0] - q[:, 0]))
+        normal /= np.linalg.norm(normal, axis=1, keepdims=True)
+        outward = np.sign(np.sum(((p + q) / 2 - hull.mean(axis=0)) * normal, axis=1))
+        origins = centers[owners[single]]
+        rays = np.stack((origins, origins - outward[:, None] * normal * ray_length), axis=1)
+
+        segments = np.concatenate((segments, rays))
+        segments = segments[np.all(np.isfinite(segments), axis=(1, 2))]
+        vertices = centers[np.all(np.isfinite(centers), axis=1)]
+        return vertices, segments
+
+    def _nearest_voronoi(self, sites, points, ray_length):
+        """
+        Build the nearest-point Voronoi diagram of the points.
+
+        Args:
+            sites (numpy.ndarray): Points to build the diagram from (S, 2).
+            points (numpy.ndarray): All points (N, 2), used when the sites are
+                too few or too degenerate to form a diagram.
+            ray_length (float): Length used to clip unbounded edges.
+
+        Returns:
+            tuple: Vertices (V, 2) and edge segments (E, 2, 2).
+        """
+        try:
+            sites = np.unique(sites, axis=0)
+            voronoi = Voronoi(sites)
+        except (QhullError, ValueError):
+            sites = np.unique(points, axis=0)
+            voronoi = Voronoi(sites)
+        points = sites
+        ridge_vertices = np.array(voronoi.ridge_vertices)
+        ridge_points = voronoi.ridge_points
+
+        bounded = np.all(ridge_vertices >= 0, axis=1)
+        segments = voronoi.vertices[ridge_vertices[bounded]]
+
+        # Unbounded ridges separate hull neighbours and point outwards
+        unbounded = np.flatnonzero(~bounded & np.any(ridge_vertices >= 0, axis=1))
+        origins = voronoi.vertices[np.max(ridge_vertices[unbounded], axis=1)]
+        p = points[ridge_points[unbounded, 0]]
+        q = points[ridge_points[unbounded, 1]]
+        normal = np.column_stack((p[:, 1] - q[:, 1], q[:, 0] - p[:, 0]))
+        normal /= np.linalg.norm(normal, axis=1, keepdims=True)
+        outward = np.sign(np.sum(((p + q) / 2 - points.mean(axis=0)) * normal, axis=1))
+        rays = np.stack((origins, origins + outward[:, None] * normal * ray_length), axis=1)
+
+        return voronoi.vertices, np.concatenate((segments, rays))
+
+    def _cell_keys(self, positions, origin, side):
+        """
+        Map positions to integer keys of the quadtree grid cells containing them.
+
+        Args:
+            positions (numpy.ndarray): Array of positions (M, 2).
+            origin (numpy.ndarray): Grid origin (2,).
+            side (float): Grid cell side length.
+
+        Returns:
+            numpy.ndarray: Cell keys (M,).
+        """
+        index = np.floor((positions - origin) / side).astype(np.int64)
+        return index[:, 0] * (1 << 32) + index[:, 1]
+
+    def _segments_in_cells(self, segments, cells, side):
+        """
+        Keep the segments whose bounding box overlaps one of the cells.
+
+        Args:
+            segments (numpy.ndarray): Segments (E, 2, 2).
+            cells (numpy.ndarray): Cell centers (C, 2).
+            side (float): Cell side length.
+
+        Returns:
+            numpy.ndarray: Overlapping segments (K, 2, 2).
+        """
+        seg_lo = np.min(segments, axis=1)
+        seg_hi = np.max(segments, axis=1)
+        cell_lo = cells - side / 2
+        cell_hi = cells + side / 2
+
+        # Cheap rejection against the bounding box of all cells first
+        near = np.all((seg_hi >= cell_lo.min(axis=0)) & (seg_lo <= cell_hi.max(axis=0)), axis=1)
+        segments, seg_lo, seg_hi = segments[near], seg_lo[near], seg_hi[near]
+
+        keep = np.zeros(len(segments), dtype=bool)
+        for start in range(0, len(cells), 256):
+            lo = cell_lo[start:start + 256]
+            hi = cell_hi[start:start + 256]
+            overlap = np.all((seg_hi[:, None, :] >= lo[None]) & (seg_lo[:, None, :] <= hi[None]), axis=2)
+            keep |= np.any(overlap, axis=1)
+        return segments[keep]
+
+    def _intersections(self, first, second, chunk_size=1024):
+        """
+        Compute all intersection points between two sets of segments.
+
+        Args:
+            first (numpy.ndarray): Segments (E1, 2, 2).
+            second (numpy.ndarray): Segments (E2, 2, 2).
+            chunk_size (int): Number of segments of the first set processed at once.
+
+        Returns:
+            numpy.ndarray: Intersection points (K, 2).
+        """
+        crossings = [np.empty((0, 2))]
+        b0 = second[:, 0]
+        db = second[:, 1] - b0
+        for start in range(0, len(first), chunk_size):
+            a0 = first[start:start + chunk_size, 0][:, None, :]
+            da = first[start:start + chunk_size, 1][:, None, :] - a0
+            offset = b0[None] - a0
+            denom = da[..., 0] * db[None, :, 1] - da[..., 1] * db[None, :, 0]
+            with np.errstate(divide='ignore', invalid='ignore'):
+                t = (offset[..., 0] * db[None, :, 1] - offset[..., 1] * db[None, :, 0]) / denom
+                u = (offset[..., 0] * da[..., 1] - offset[..., 1] * da[..., 0]) / denom
+            eps = 1e-9
+            hit = (t >= -eps) & (t <= 1 + eps) & (u >= -eps) & (u <= 1 + eps)
+            rows, cols = np.nonzero(hit)
+            crossings.append(a0[rows, 0] + t[rows, cols, None] * da[rows, 0])
+        return np.vstack(crossings)
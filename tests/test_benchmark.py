@@ -0,0 +1,58 @@
+import unittest
+import os
+import shutil
+import tempfile
+import sys
+
+# Add the src directory to the path so we can import our modules
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from detection_circle.benchmark import Benchmark, STAGES, synthetic_images, compare
+
+class TestBenchmark(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_run(self):
+        """Test that every stage is timed on a synthetic image"""
+        paths = synthetic_images(self.temp_dir, count=1, size=(512, 512), parts=4)
+        self.assertEqual(paths, synthetic_images(self.temp_dir, count=1, size=(512, 512), parts=4))
+
+        results = Benchmark(repeat=2).run(paths)
+        self.assertEqual(set(results['stages']), set(STAGES))
+        for stats in results['stages'].values():
+            self.assertEqual(stats['samples'], 2)
+            self.assertLessEqual(stats['median_ms'], stats['p95_ms'])
+        self.assertEqual(results['images'], ['synthetic_0.jpg'])
+
+        # Throughput comes from passes with one method, faster than the sum of all stages
+        self.assertEqual(results['method'], 'min_zone')
+        stage_total = sum(stats['mean_ms'] for stats in results['stages'].values()) / 1000
+        self.assertGreater(results['images_per_sec'], 1 / stage_total)
+        with self.assertRaises(ValueError):
+            Benchmark(method='unknown')
+
+    def test_compare(self):
+        """Test that only slowdowns beyond both thresholds are flagged"""
+        baseline = {'stages': {'detect_edges': {'median_ms': 10.0}, 'filter_contours': {'median_ms': 0.01}},
+                    'images_per_sec': 10.0, 'peak_rss_mb': 100.0}
+        results = {'stages': {'detect_edges': {'median_ms': 11.0}, 'filter_contours': {'median_ms': 0.05}},
+                   'images_per_sec': 9.5, 'peak_rss_mb': 105.0}
+        self.assertEqual(compare(results, baseline, threshold=0.2), [])
+
+        results['stages']['detect_edges']['median_ms'] = 13.0
+        results['images_per_sec'] = 7.0
+        regressions = compare(results, baseline, threshold=0.2)
+        self.assertEqual(len(regressions), 2)
+        self.assertTrue(regressions[0].startswith('detect_edges'))
+
+        # Throughput measured with another method is not comparable
+        baseline['method'] = 'all'
+        results['method'] = 'min_zone'
+        self.assertEqual(len(compare(results, baseline, threshold=0.2)), 1)
+
+if __name__ == '__main__':
+    unittest.main()
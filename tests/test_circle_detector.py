@@ -7,9 +7,10 @@ import sys
 # Add the src directory to the path so we can import our modules
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
 
-from circle_detector import CircleDetector
-from image_processor import ImageProcessor
-from contour_processor import ContourProcessor
+from detection_circle.circle_detector import CircleDetector
+from detection_circle.image_processor import ImageProcessor
+from detection_circle.contour_processor import ContourProcessor
+from detection_circle.contour_batch import ContourBatch
 
 class TestCircleDetector(unittest.TestCase):
     def setUp(self):
@@ -34,6 +35,35 @@ class TestCircleDetector(unittest.TestCase):
         self.assertIsNotNone(circles)
         self.assertTrue(isinstance(circles, list))
         
+    def test_detect(self):
+        """Test that detections keep the contour each circle was fitted to"""
+        # Two concentric circles and a square between them in the contour list
+        theta = np.linspace(0, 2*np.pi, 60, endpoint=False)
+        outer = np.column_stack((100 + 60 * np.cos(theta), 100 + 60 * np.sin(theta)))
+        inner = np.column_stack((100 + 30 * np.cos(theta), 100 + 30 * np.sin(theta)))
+        square = np.array([[0, 0], [50, 0], [50, 50], [0, 50]])
+        contours = [np.round(c).astype(np.int32).reshape(-1, 1, 2) for c in (outer, square, inner)]
+        
+        detections = self.circle_detector.detect(contours)
+        
+        self.assertEqual([d.contour_index for d in detections], [0, 2])
+        self.assertTrue(detections[1].contour is contours[2])
+        self.assertAlmostEqual(detections[0].circle[2], 60, delta=1)
+        self.assertAlmostEqual(detections[1].circle[2], 30, delta=1)
+        self.assertAlmostEqual(detections[1].centroid[0], 100, delta=1)
+        self.assertAlmostEqual(detections[1].area, cv2.contourArea(contours[2]))
+        self.assertAlmostEqual(detections[1].perimeter, cv2.arcLength(contours[2], True))
+        self.assertEqual(self.circle_detector.detect_circles(contours), [d.circle for d in detections])
+        
+        # A batch gives the same detections, with views into its points as contours
+        batch_detections = self.circle_detector.detect(ContourBatch.from_contours(contours))
+        self.assertEqual([d.contour_index for d in batch_detections], [0, 2])
+        for detection, batch_detection in zip(detections, batch_detections):
+            np.testing.assert_array_equal(batch_detection.contour, detection.contour)
+            self.assertEqual(batch_detection.circle, detection.circle)
+            self.assertEqual(batch_detection.area, detection.area)
+            self.assertEqual(batch_detection.perimeter, detection.perimeter)
+        
     def test_fit_circle(self):
         """Test that circle fitting works correctly"""
         # Create points that lie approximately on a circle
@@ -58,6 +88,43 @@ class TestCircleDetector(unittest.TestCase):
         self.assertAlmostEqual(center[1], center_y, delta=5)
         self.assertAlmostEqual(radius, 50, delta=5)
         
+    def test_fit_circle_arc(self):
+        """Test that circle fitting works on a partial arc"""
+        theta = np.linspace(0, np.pi, 50)
+        points = np.column_stack((100 + 50 * np.cos(theta), 100 + 50 * np.sin(theta)))
+        
+        center, radius = self.circle_detector.fit_circle(points)
+        
+        self.assertAlmostEqual(center[0], 100, places=6)
+        self.assertAlmostEqual(center[1], 100, places=6)
+        self.assertAlmostEqual(radius, 50, places=6)
+        
+    def test_fit_circles_batch(self):
+        """Test that batch circle fitting matches fitting each contour separately"""
+        rng = np.random.default_rng(0)
+        contours = []
+        for _ in range(20):
+            theta = np.sort(rng.uniform(0, 2*np.pi, rng.integers(5, 60)))
+            radius = rng.uniform(5, 40)
+            center = rng.uniform(0, 500, 2)
+            points = center + radius * np.column_stack((np.cos(theta), np.sin(theta)))
+            contours.append(np.round(points).astype(np.int32).reshape(-1, 1, 2))
+        # A degenerate (collinear) segment uses the minEnclosingCircle fallback
+        contours.append(np.array([[[0, 0]], [[1, 1]], [[2, 2]]], dtype=np.int32))
+        
+        points, offsets = ContourBatch.from_contours(contours).flatten()
+        centers, radii = self.circle_detector.fit_circles_batch(points, offsets)
+        
+        self.assertEqual(centers.shape, (len(contours), 2))
+        for contour, center, radius in zip(contours[:-1], centers, radii):
+            expected_center, expected_radius = self.circle_detector.fit_circle(contour.reshape(-1, 2))
+            self.assertAlmostEqual(center[0], expected_center[0], places=6)
+            self.assertAlmostEqual(center[1], expected_center[1], places=6)
+            self.assertAlmostEqual(radius, expected_radius, places=6)
+        (center_x, center_y), radius = cv2.minEnclosingCircle(contours[-1])
+        self.assertAlmostEqual(centers[-1][0], center_x, places=5)
+        self.assertAlmostEqual(radii[-1], radius, places=5)
+        
     def test_is_circle(self):
         """Test that circle validation works correctly"""
         # Create a contour that is approximately a circle
@@ -0,0 +1,64 @@
+import unittest
+import os
+import numpy as np
+import sys
+
+# Add the src directory to the path so we can import our modules
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from detection_circle.circle_tracker import CircleTracker
+from detection_circle.roundness_calculator import RoundnessCalculator
+
+class TestCircleTracker(unittest.TestCase):
+    def setUp(self):
+        self.tracker = CircleTracker()
+        # Integer profile of a slightly lobed part
+        theta = np.linspace(0, 2*np.pi, 180, endpoint=False)
+        radius = 60 + 1.5 * np.cos(3 * theta)
+        self.points = np.round(np.column_stack((200 + radius * np.cos(theta), 150 + radius * np.sin(theta))))
+        self.circle = (200.0, 150.0, 60.0)
+
+    def test_reuse_translated(self):
+        """Test that a translated, unchanged part reuses its moved measurement"""
+        (first_id, first), = self.tracker.update([self.circle], [self.points])
+        work = sum(self.tracker.roundness_calculator.iterations.values())
+        shift = np.array([3.0, -2.0])
+        (second_id, second), = self.tracker.update([(203.0, 148.0, 60.0)], [self.points + shift])
+
+        self.assertEqual(second_id, first_id)
+        self.assertEqual(second['min_zone'][2], first['min_zone'][2])
+        np.testing.assert_allclose(second['min_zone'][0][:2], np.add(first['min_zone'][0][:2], shift))
+        self.assertEqual(self.tracker.stats['reused'], 1)
+        self.assertEqual(self.tracker.stats['evaluations_saved'], work)
+
+    def test_warm_start(self):
+        """Test that changed parts are warm-started and new parts get new tracks"""
+        rng = np.random.default_rng(0)
+        self.tracker.update([self.circle], [self.points])
+        moved = self.points + (1.3, 0.6) + rng.normal(0, 0.4, self.points.shape)
+        other = self.points + (400, 0)
+        results = self.tracker.update([(201.3, 150.6, 60.0), (600.0, 150.0, 60.0)], [moved, other])
+
+        self.assertEqual([track_id for track_id, _ in results], [0, 1])
+        self.assertEqual(self.tracker.stats['warm_started'], 1)
+        self.assertEqual(self.tracker.stats['cold'], 2)
+        # The exact solver gives the same zone from a warm start
+        cold = RoundnessCalculator().measure(moved, 'min_zone')
+        self.assertAlmostEqual(results[0][1]['min_zone'][2], cold['min_zone'][2], places=9)
+
+        # Tracks without a match are dropped after max_missed frames
+        for _ in range(self.tracker.max_missed + 1):
+            self.tracker.update([], [])
+        self.assertEqual(self.tracker.tracks, [])
+
+    def test_nelder_mead_warm_start(self):
+        """Test that the optimizers converge from a warm-start center"""
+        calculator = RoundnessCalculator()
+        exact = calculator.min_zone_method(self.points)
+        center = np.add(exact[0][:2], (0.8, -0.5))
+        warm = calculator.min_zone_method(self.points, 'nelder-mead', initial_center=center)
+        self.assertIn('min_zone', calculator.warm_starts)
+        self.assertAlmostEqual(warm[2], exact[2], delta=1e-3)
+
+if __name__ == '__main__':
+    unittest.main()
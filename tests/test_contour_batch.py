@@ -0,0 +1,76 @@
+import unittest
+import os
+import numpy as np
+import cv2
+import sys
+
+# Add the src directory to the path so we can import our modules
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from detection_circle.contour_batch import ContourBatch
+from detection_circle.image_processor import ImageProcessor
+
+class TestContourBatch(unittest.TestCase):
+    def setUp(self):
+        image_processor = ImageProcessor()
+        # Real contours of all sizes, from single points to part outlines
+        test_image_path = os.path.join(os.path.dirname(__file__), '..', 'dataset', '0.jpg')
+        image = image_processor.load_image(test_image_path)
+        edges = image_processor.detect_edges(image_processor.preprocess(image))
+        self.contours = image_processor.extract_contours(edges)
+        self.contours.append(np.array([[[3, 4]]], dtype=np.int32))
+
+    def test_properties(self):
+        """Test that the vectorized properties equal OpenCV's"""
+        batch = ContourBatch.from_contours(self.contours)
+
+        self.assertEqual(len(batch), len(self.contours))
+        np.testing.assert_array_equal(batch.areas, [cv2.contourArea(c) for c in self.contours])
+        np.testing.assert_array_equal(batch.perimeters, [cv2.arcLength(c, True) for c in self.contours])
+        np.testing.assert_array_equal(batch.bounding_boxes, [cv2.boundingRect(c) for c in self.contours])
+        np.testing.assert_allclose(batch.centroids, [c.reshape(-1, 2).mean(axis=0) for c in self.contours])
+        self.assertEqual(batch.circularities[-1], 0)
+        for contour, view in zip(self.contours, batch):
+            np.testing.assert_array_equal(view, contour)
+
+    def test_select(self):
+        """Test that selections share the point buffer and the computed properties"""
+        batch = ContourBatch.from_contours(self.contours)
+        areas = batch.areas
+        selected = batch.select(np.flatnonzero(areas > 100)[::-1])
+
+        self.assertTrue(selected.points is batch.points)
+        self.assertIn('perimeter', selected._properties)
+        self.assertNotIn('centroid', selected._properties)
+        indices = np.flatnonzero(areas > 100)[::-1]
+        np.testing.assert_array_equal(selected.areas, areas[indices])
+        np.testing.assert_array_equal(selected.bounding_boxes,
+                                      [cv2.boundingRect(self.contours[i]) for i in indices])
+        self.assertTrue(np.shares_memory(selected[0], batch.points))
+
+        points, offsets = selected.flatten()
+        np.testing.assert_array_equal(points[offsets[0]:offsets[1]], self.contours[indices[0]].reshape(-1, 2))
+
+    def test_flatten(self):
+        """Test that flattening gives the concatenated points and the segment offsets"""
+        batch = ContourBatch.from_contours(self.contours)
+        points, offsets = batch.flatten()
+
+        self.assertTrue(points is batch.points)
+        np.testing.assert_array_equal(points, np.concatenate([c.reshape(-1, 2) for c in self.contours]))
+        np.testing.assert_array_equal(offsets, np.cumsum([0] + [len(c) for c in self.contours]))
+
+        points, offsets = ContourBatch.from_contours([]).flatten()
+        self.assertEqual(points.shape, (0, 2))
+        np.testing.assert_array_equal(offsets, [0])
+
+    def test_empty(self):
+        """Test that an empty batch has empty properties"""
+        batch = ContourBatch.from_contours([])
+        self.assertEqual(len(batch), 0)
+        self.assertEqual(batch.areas.shape, (0,))
+        self.assertEqual(batch.bounding_boxes.shape, (0, 4))
+        self.assertEqual(len(batch.select(np.zeros(0, dtype=bool))), 0)
+
+if __name__ == '__main__':
+    unittest.main()
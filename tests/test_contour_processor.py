@@ -7,8 +7,9 @@ import sys
 # Add the src directory to the path so we can import our modules
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
 
-from contour_processor import ContourProcessor
-from image_processor import ImageProcessor
+from detection_circle.contour_processor import ContourProcessor
+from detection_circle.image_processor import ImageProcessor
+from detection_circle.contour_batch import ContourBatch
 
 class TestContourProcessor(unittest.TestCase):
     def setUp(self):
@@ -33,6 +34,26 @@ class TestContourProcessor(unittest.TestCase):
         # The filtered list should not be longer than the original list
         self.assertTrue(len(filtered_contours) <= len(contours))
         
+    def test_filter_contour_batch(self):
+        """Test that filtering a batch selects the same contours as filtering a list"""
+        image = self.image_processor.load_image(self.test_image_path)
+        edges = self.image_processor.detect_edges(self.image_processor.preprocess(image))
+        contours = self.image_processor.extract_contours(edges)
+        
+        filtered_contours = self.contour_processor.filter_contours(contours)
+        filtered_batch = self.contour_processor.filter_contours(ContourBatch.from_contours(contours))
+        
+        self.assertIsInstance(filtered_batch, ContourBatch)
+        self.assertEqual(len(filtered_batch), len(filtered_contours))
+        for contour, view in zip(filtered_contours, filtered_batch):
+            np.testing.assert_array_equal(view, contour)
+        
+        # Approximating a batch matches approximating each contour
+        approximations = self.contour_processor.single_line_processing(filtered_batch)
+        for contour, approximation in zip(filtered_contours, approximations):
+            np.testing.assert_array_equal(approximation.reshape(-1, 2),
+                                          self.contour_processor.single_line_processing(contour))
+        
     def test_single_line_processing(self):
         """Test that contour single-line processing works correctly"""
         # Create a simple contour for testing
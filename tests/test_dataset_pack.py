@@ -0,0 +1,78 @@
+import unittest
+import os
+import shutil
+import tempfile
+import numpy as np
+import cv2
+import sys
+
+# Add the src directory to the path so we can import our modules
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from detection_circle.dataset_pack import DatasetPack
+from detection_circle.image_loader import ImageLoader
+from detection_circle.stage_cache import StageCache
+
+class TestDatasetPack(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.image_dir = os.path.join(self.temp_dir, 'images')
+        os.makedirs(self.image_dir)
+        # Images of different sizes, with a circle so the content varies
+        self.images = {}
+        for k, (height, width) in enumerate([(64, 80), (120, 90), (33, 47)]):
+            image = np.full((height, width, 3), 20 * k, dtype=np.uint8)
+            cv2.circle(image, (width // 2, height // 2), min(height, width) // 3, (40, 160, 220), -1)
+            name = f'{k}.png'
+            cv2.imwrite(os.path.join(self.image_dir, name), image)
+            self.images[name] = image
+        with open(os.path.join(self.image_dir, 'notes.txt'), 'w') as f:
+            f.write('not an image')
+        self.pack_path = os.path.join(self.temp_dir, 'images.pack')
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_build_and_open(self):
+        """Test that packed images are zero-copy views equal to the converted images"""
+        DatasetPack.build(self.image_dir, self.pack_path)
+        pack = DatasetPack(self.pack_path)
+
+        self.assertEqual(pack.names, ['0.png', '1.png', '2.png'])
+        for k, name in enumerate(pack.names):
+            expected = cv2.cvtColor(self.images[name], cv2.COLOR_BGR2GRAY)
+            np.testing.assert_array_equal(pack[name], expected)
+            np.testing.assert_array_equal(pack[k], expected)
+            # A view into the mapping, starting on a page boundary
+            self.assertTrue(np.shares_memory(pack[name], pack.data))
+            self.assertFalse(pack[name].flags.writeable)
+            self.assertEqual(pack.entries[k]['offset'] % DatasetPack.ALIGNMENT, 0)
+
+        with self.assertRaises(KeyError):
+            pack['missing.png']
+
+    def test_load(self):
+        """Test that pack images carry the source file hash and decode color on use"""
+        pack = DatasetPack.build(self.image_dir, self.pack_path, decode='gray')
+        loader = ImageLoader(pack=pack)
+        self.assertTrue(loader.grayscale)
+        loaded_images = list(loader.iterate(['1.png', '0.png']))
+
+        loaded = loaded_images[0]
+        self.assertTrue(np.shares_memory(loaded.image, pack.data))
+        self.assertEqual(loaded.key, StageCache.image_key(os.path.join(self.image_dir, '1.png')))
+        np.testing.assert_array_equal(loaded.color, self.images['1.png'])
+
+        with self.assertRaises(ValueError):
+            ImageLoader(reduction=2, pack=pack)
+
+    def test_empty_directory(self):
+        """Test that an empty directory gives an empty pack"""
+        empty_dir = os.path.join(self.temp_dir, 'empty')
+        os.makedirs(empty_dir)
+        pack = DatasetPack.build(empty_dir, self.pack_path)
+        self.assertEqual(len(pack), 0)
+        self.assertEqual(len(DatasetPack(self.pack_path)), 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+import unittest
+import os
+import importlib.util
+import numpy as np
+import sys
+
+# Add the src directory to the path so we can import our modules
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from detection_circle import distance_kernels
+from detection_circle.distance_kernels import DistanceKernels
+from detection_circle.roundness_calculator import RoundnessCalculator
+
+HAS_NUMBA = importlib.util.find_spec('numba') is not None
+
+class TestDistanceKernels(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.point_sets = [rng.normal(100, 40, (n, 2)) for n in (1, 3, 50, 500)]
+        self.point_sets.append(np.round(self.point_sets[-1]).astype(np.int32))
+        self.centers = [np.array([100.0, 100.0]), (97.25, 104.5), rng.normal(100, 5, 2)]
+
+    def reference(self, points, center):
+        """Distances as the roundness methods computed them before the kernels."""
+        return np.sqrt((points[:, 0] - center[0])**2 + (points[:, 1] - center[1])**2)
+
+    def check_backend(self, kernels):
+        """Check the kernels of a backend against the reference distances."""
+        for points in self.point_sets:
+            zone_width = kernels.min_zone_objective(points)
+            inscribed = kernels.max_inscribed_objective(points)
+            for center in self.centers:
+                distances = self.reference(points, center)
+                self.assertEqual(kernels.radius_range(points, center), (np.min(distances), np.max(distances)))
+                self.assertEqual(zone_width(center), np.max(distances) - np.min(distances))
+                self.assertEqual(inscribed(center), -np.min(distances))
+
+    def test_numpy_backend(self):
+        """Test that the NumPy kernels equal the reference distances exactly"""
+        self.check_backend(DistanceKernels('numpy'))
+
+    def test_loops(self):
+        """Test that the loops compiled for numba equal the NumPy kernels when run as Python"""
+        kernels = DistanceKernels('numpy')
+        for points in self.point_sets:
+            x = np.ascontiguousarray(points[:, 0], dtype=np.float64)
+            y = np.ascontiguousarray(points[:, 1], dtype=np.float64)
+            for center in self.centers:
+                low, high = kernels.radius_range(points, center)
+                self.assertEqual(distance_kernels._zone_width_loop(x, y, center[0], center[1]), high - low)
+                self.assertEqual(distance_kernels._min_radius_loop(x, y, center[0], center[1]), low)
+
+    @unittest.skipUnless(HAS_NUMBA, "numba is not installed")
+    def test_numba_backend(self):
+        """Test that the compiled kernels equal the reference distances"""
+        self.check_backend(DistanceKernels('numba'))
+        points = self.point_sets[3]
+        results = {backend: RoundnessCalculator(backend).measure(points, 'all') for backend in ('numpy', 'numba')}
+        for method, (inner, outer, roundness) in results['numpy'].items():
+            self.assertAlmostEqual(results['numba'][method][2], roundness, places=9)
+
+    def test_backend_selection(self):
+        """Test that NumPy is the default and numba is only used when chosen"""
+        self.assertEqual(DistanceKernels().backend, 'numpy')
+        self.assertEqual(RoundnessCalculator().kernels.backend, 'numpy')
+        with self.assertRaises(ValueError):
+            DistanceKernels('cuda')
+        if not HAS_NUMBA:
+            with self.assertRaises(ValueError):
+                DistanceKernels('numba')
+
+if __name__ == '__main__':
+    unittest.main()
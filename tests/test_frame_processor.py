@@ -0,0 +1,63 @@
+import unittest
+import os
+import tracemalloc
+import numpy as np
+import cv2
+import sys
+
+# Add the src directory to the path so we can import our modules
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from detection_circle.frame_processor import FrameProcessor
+from detection_circle.image_processor import ImageProcessor
+
+class TestFrameProcessor(unittest.TestCase):
+    def setUp(self):
+        self.frame_processor = FrameProcessor(edge_buffers=2)
+        self.image_processor = ImageProcessor()
+        self.image = cv2.imread(os.path.join(os.path.dirname(__file__), '..', 'dataset', '0.jpg'))
+
+    def test_matches_image_processor(self):
+        """Test that edges match ImageProcessor for color and grayscale frames"""
+        gray = cv2.cvtColor(self.image, cv2.COLOR_BGR2GRAY)
+        for image in (self.image, gray):
+            expected = self.image_processor.detect_edges(self.image_processor.preprocess(image))
+            edges = self.frame_processor.detect_edges(self.frame_processor.preprocess(image))
+            self.assertTrue(np.array_equal(edges, expected))
+
+    def test_buffer_reuse(self):
+        """Test that buffers are allocated once and edge buffers are cycled"""
+        edges = [self.frame_processor.detect_edges(self.frame_processor.preprocess(self.image))
+                 for _ in range(4)]
+        self.assertEqual(self.frame_processor.allocations, 1)
+        self.assertIsNot(edges[0], edges[1])
+        self.assertIs(edges[0], edges[2])
+        self.assertIs(edges[1], edges[3])
+
+        # A new frame size reallocates
+        self.frame_processor.preprocess(self.image[:100, :120])
+        self.assertEqual(self.frame_processor.allocations, 2)
+        self.assertEqual(self.frame_processor.shape, (100, 120))
+
+    def test_no_steady_state_allocation(self):
+        """Test that processing further frames allocates no image-sized arrays"""
+        self.frame_processor.detect_edges(self.frame_processor.preprocess(self.image))
+        frame_size = self.image.shape[0] * self.image.shape[1]
+
+        tracemalloc.start()
+        try:
+            for _ in range(3):
+                self.frame_processor.detect_edges(self.frame_processor.preprocess(self.image))
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        self.assertLess(peak, frame_size // 4)
+
+    def test_invalid_frame(self):
+        """Test that a frame with an unsupported channel count is rejected"""
+        with self.assertRaises(ValueError):
+            self.frame_processor.preprocess(np.zeros((10, 10, 5), dtype=np.uint8))
+        self.assertIsNone(self.frame_processor.shape)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,55 @@
+import unittest
+import os
+import shutil
+import tempfile
+import numpy as np
+import cv2
+import sys
+
+# Add the src directory to the path so we can import our modules
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from detection_circle.image_loader import ImageLoader
+
+class TestImageLoader(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        # Create a few images and one corrupt file
+        self.paths = []
+        for k in range(5):
+            image = np.full((64, 80, 3), 30 * k, dtype=np.uint8)
+            path = os.path.join(self.temp_dir, f'{k}.png')
+            cv2.imwrite(path, image)
+            self.paths.append(path)
+        self.broken_path = os.path.join(self.temp_dir, 'broken.png')
+        with open(self.broken_path, 'wb') as f:
+            f.write(b'not an image')
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_lazy_color(self):
+        """Test that the color image is only decoded when used"""
+        loaded = ImageLoader(grayscale=True, reduction=2).load(self.paths[1])
+        self.assertEqual(loaded.image.shape, (32, 40))
+        self.assertIsNone(loaded._color)
+        self.assertEqual(loaded.color.shape, (64, 80, 3))
+
+        # Without grayscale or reduction the detection image is the color image
+        loaded = ImageLoader().load(self.paths[1])
+        self.assertIs(loaded.color, loaded.image)
+
+    def test_iterate(self):
+        """Test that prefetched images arrive in order with errors deferred"""
+        loader = ImageLoader(grayscale=True, prefetch=2, workers=2)
+        paths = self.paths[:2] + [self.broken_path] + self.paths[2:]
+        loaded_images = list(loader.iterate(paths))
+
+        self.assertEqual([loaded.path for loaded in loaded_images], paths)
+        self.assertEqual([int(loaded.image[0, 0]) for k, loaded in enumerate(loaded_images) if k != 2],
+                         [30 * k for k in range(5)])
+        with self.assertRaises(ValueError):
+            loaded_images[2].image
+
+if __name__ == '__main__':
+    unittest.main()
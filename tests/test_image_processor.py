@@ -7,7 +7,7 @@ import sys
 # Add the src directory to the path so we can import our modules
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
 
-from image_processor import ImageProcessor
+from detection_circle.image_processor import ImageProcessor
 
 class TestImageProcessor(unittest.TestCase):
     def setUp(self):
@@ -22,6 +22,19 @@ class TestImageProcessor(unittest.TestCase):
         self.assertTrue(isinstance(image, np.ndarray))
         self.assertTrue(image.shape[2] == 3)  # Should be a color image with 3 channels
         
+    def test_load_image_reduced(self):
+        """Test that an image can be decoded straight to grayscale at reduced size"""
+        image = self.processor.load_image(self.test_image_path)
+        gray = self.processor.load_image(self.test_image_path, grayscale=True)
+        reduced = self.processor.load_image(self.test_image_path, grayscale=True, reduction=4)
+        self.assertEqual(gray.shape, image.shape[:2])
+        self.assertEqual(reduced.shape, ((image.shape[0] + 3) // 4, (image.shape[1] + 3) // 4))
+        
+        # A grayscale image is preprocessed without color conversion
+        self.assertEqual(self.processor.preprocess(gray).shape, gray.shape)
+        with self.assertRaises(ValueError):
+            self.processor.load_image(self.test_image_path, reduction=3)
+        
     def test_preprocess(self):
         """Test that image preprocessing works correctly"""
         image = self.processor.load_image(self.test_image_path)
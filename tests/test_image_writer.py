@@ -0,0 +1,48 @@
+import unittest
+import os
+import shutil
+import tempfile
+import numpy as np
+import cv2
+import sys
+
+# Add the src directory to the path so we can import our modules
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from detection_circle.image_writer import ImageWriter
+
+class TestImageWriter(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.image_writer = ImageWriter(workers=2, queue_size=2)
+
+    def tearDown(self):
+        self.image_writer.close()
+        shutil.rmtree(self.temp_dir)
+
+    def test_write(self):
+        """Test that all submitted images are written by flush"""
+        images = [np.full((50, 60), 10 * k, dtype=np.uint8) for k in range(10)]
+        for k, image in enumerate(images):
+            self.image_writer.submit(image, os.path.join(self.temp_dir, f'{k}.png'))
+
+        self.assertEqual(self.image_writer.flush(), [])
+        self.assertEqual(self.image_writer.written, 10)
+        for k, image in enumerate(images):
+            written = cv2.imread(os.path.join(self.temp_dir, f'{k}.png'), cv2.IMREAD_GRAYSCALE)
+            self.assertTrue(np.array_equal(written, image))
+
+    def test_errors(self):
+        """Test that failed writes are reported without stopping the writer"""
+        image = np.zeros((10, 10), dtype=np.uint8)
+        self.image_writer.submit(image, os.path.join(self.temp_dir, 'missing', 'a.png'))
+        self.image_writer.submit(image, os.path.join(self.temp_dir, 'b.png'))
+
+        errors = self.image_writer.flush()
+        self.assertEqual(len(errors), 1)
+        self.assertIn('a.png', errors[0])
+        self.assertTrue(os.path.exists(os.path.join(self.temp_dir, 'b.png')))
+        self.assertEqual(self.image_writer.flush(), [])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,113 @@
+import unittest
+import os
+import shutil
+import tempfile
+import sys
+import numpy as np
+from unittest import mock
+
+# Add the src directory to the path so we can import our modules
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from detection_circle.main import parse_args, process_all_images, scale_detections
+from detection_circle.dataset_pack import DatasetPack
+from detection_circle.circle_detector import Detection
+
+class TestMain(unittest.TestCase):
+    def setUp(self):
+        # Create a small dataset with two real images and one corrupt file
+        self.temp_dir = tempfile.mkdtemp()
+        self.dataset_dir = os.path.join(self.temp_dir, 'dataset')
+        self.output_dir = os.path.join(self.temp_dir, 'output')
+        os.makedirs(self.dataset_dir)
+        source_dir = os.path.join(os.path.dirname(__file__), '..', 'dataset')
+        shutil.copy(os.path.join(source_dir, '0.jpg'), os.path.join(self.dataset_dir, '0.jpg'))
+        shutil.copy(os.path.join(source_dir, '25.jpg'), os.path.join(self.dataset_dir, '25.jpg'))
+        with open(os.path.join(self.dataset_dir, 'broken.jpg'), 'wb') as f:
+            f.write(b'not an image')
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_process_all_images_parallel(self):
+        """Test that parallel batch processing matches serial processing"""
+        serial = process_all_images(self.dataset_dir, output_dir=self.output_dir, workers=1)
+        parallel = process_all_images(self.dataset_dir, output_dir=self.output_dir, workers=2)
+
+        # The broken image is reported without stopping the batch
+        self.assertNotIn('broken.jpg', parallel)
+        self.assertEqual(list(parallel), [f for f in os.listdir(self.dataset_dir) if f != 'broken.jpg'])
+        self.assertEqual(list(serial), list(parallel))
+        for image_file in serial:
+            self.assertEqual([r['roundness'] for r in serial[image_file]],
+                             [r['roundness'] for r in parallel[image_file]])
+
+    def test_process_pack(self):
+        """Test that images from a dataset pack give the results of the directory"""
+        os.remove(os.path.join(self.dataset_dir, 'broken.jpg'))
+        pack_path = os.path.join(self.temp_dir, 'dataset.pack')
+        DatasetPack.build(self.dataset_dir, pack_path)
+        directory = process_all_images(self.dataset_dir, output_dir=self.output_dir, render='none')
+        serial = process_all_images(pack_path, output_dir=self.output_dir, render='none')
+        parallel = process_all_images(pack_path, output_dir=self.output_dir, render='none', workers=2)
+
+        self.assertEqual(list(serial), ['0.jpg', '25.jpg'])
+        for image_file in directory:
+            self.assertEqual([r['roundness'] for r in serial[image_file]],
+                             [r['roundness'] for r in directory[image_file]])
+            self.assertEqual([r['roundness'] for r in parallel[image_file]],
+                             [r['roundness'] for r in directory[image_file]])
+
+    def test_decimate(self):
+        """Test that decimated measurements report an error bound within the budget"""
+        results = process_all_images(self.dataset_dir, output_dir=self.output_dir, render='none',
+                                     options={'decimate': 0.05})
+        self.assertTrue(results['25.jpg'])
+        for result in results['25.jpg']:
+            self.assertLessEqual(result['error_bound'], 0.05)
+
+    def test_render_levels(self):
+        """Test that the render level selects the output images and keeps the results"""
+        outputs = {}
+        results = {}
+        for render in ('none', 'thumbnails', 'preview', 'summary', 'full'):
+            output_dir = os.path.join(self.output_dir, render)
+            results[render] = process_all_images(self.dataset_dir, output_dir=output_dir, render=render)
+            outputs[render] = sorted(os.path.relpath(os.path.join(root, name), output_dir)
+                                     for root, _, names in os.walk(output_dir) for name in names)
+
+        self.assertEqual(outputs['none'], [])
+        self.assertEqual(outputs['thumbnails'], ['25/part_0.jpg'])
+        self.assertEqual(outputs['preview'], ['0/preview.jpg', '25/preview.jpg'])
+        self.assertEqual(outputs['summary'], ['0/summary.jpg', '25/summary.jpg'])
+        self.assertIn('25/result_0_min_zone.jpg', outputs['full'])
+        self.assertIn('25/edges.jpg', outputs['full'])
+        for render in ('none', 'thumbnails', 'summary'):
+            self.assertEqual([r['roundness'] for r in results[render]['25.jpg']],
+                             [r['roundness'] for r in results['full']['25.jpg']])
+
+    def test_scale_detections(self):
+        """Test that scaled contours and circles get the same offset"""
+        contour = np.array([[[10, 20]], [[30, 20]], [[20, 30]]], dtype=np.int32)
+        detection = Detection(0, contour, (20.0, 20.0, 10.0), (20.0, 23.0), 200.0, 60.0)
+        for reduction in (1, 2, 4, 8):
+            contours, (scaled,) = scale_detections([contour], [detection], reduction)
+            self.assertEqual(contours[0].dtype, np.int32)
+            self.assertTrue(scaled.contour is contours[0])
+            self.assertEqual(tuple(contours[0][0, 0]), (scaled.circle[0] - 10 * reduction, scaled.circle[1]))
+            self.assertEqual(scaled.circle[2], 10 * reduction)
+            self.assertEqual(scaled.centroid[1] - scaled.circle[1], 3 * reduction)
+
+    def test_kernels_without_numba(self):
+        """Test that --kernels numba is rejected with a usage error when numba is missing"""
+        argv = ['detection-circle', '--image_path', 'dataset', '--kernels', 'numba']
+        with mock.patch('sys.argv', argv), mock.patch('importlib.util.find_spec', return_value=None), \
+                mock.patch('sys.stderr'):
+            with self.assertRaises(SystemExit) as raised:
+                parse_args()
+        self.assertEqual(raised.exception.code, 2)
+        with mock.patch('sys.argv', argv[:3]):
+            self.assertEqual(parse_args().kernels, 'numpy')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+import unittest
+import os
+import json
+import shutil
+import tempfile
+import numpy as np
+import cv2
+import sys
+
+# Add the src directory to the path so we can import our modules
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from detection_circle.metrics import Metrics, null_timer
+from detection_circle.main import create_components, process_image
+
+class TestMetrics(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.metrics = Metrics()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_histograms(self):
+        """Test that records are aggregated into cumulative Prometheus histograms"""
+        for points in (150, 900):
+            self.metrics.begin('a.jpg')
+            with self.metrics.timer('roundness'):
+                pass
+            with self.metrics.timer('roundness'):
+                pass
+            self.metrics.count('contour_points', points)
+            self.metrics.end()
+            self.metrics.add(self.metrics.pop_record())
+
+        self.assertIsNone(self.metrics.pop_record())
+        text = self.metrics.prometheus_text()
+        self.assertIn('detection_circle_items_bucket{item="contour_points",le="100"} 0', text)
+        self.assertIn('detection_circle_items_bucket{item="contour_points",le="200"} 1', text)
+        self.assertIn('detection_circle_items_bucket{item="contour_points",le="+Inf"} 2', text)
+        self.assertIn('detection_circle_items_sum{item="contour_points"} 1050', text)
+        self.assertIn('detection_circle_stage_seconds_count{stage="roundness"} 2', text)
+        self.assertIn('detection_circle_stage_seconds_count{stage="total"} 2', text)
+
+        path = os.path.join(self.temp_dir, 'metrics.jsonl')
+        self.metrics.export(path)
+        with open(path) as f:
+            lines = [json.loads(line) for line in f]
+        self.assertEqual([line['type'] for line in lines[:2]], ['image', 'image'])
+        self.assertEqual(lines[1]['counts'], {'contour_points': [900]})
+        self.assertEqual(len(lines), 2 + 3)
+
+    def test_null_timer(self):
+        """Test that the disabled timer is a shared no-op"""
+        self.assertIs(null_timer('a'), null_timer('b'))
+        with null_timer('a'):
+            pass
+
+    def test_process_image(self):
+        """Test that process_image records its stages and counts"""
+        image = np.full((300, 400, 3), 40, dtype=np.uint8)
+        cv2.circle(image, (120, 150), 60, (200, 200, 200), -1)
+        cv2.circle(image, (290, 150), 50, (200, 200, 200), -1)
+        image_path = os.path.join(self.temp_dir, 'plate.png')
+        cv2.imwrite(image_path, image)
+
+        components = create_components({'metrics_path': os.path.join(self.temp_dir, 'metrics.prom')})
+        process_image(image_path, 'all', self.temp_dir, False, components, 'none')
+        record = components['metrics'].pop_record()
+
+        for stage in ('decode', 'preprocess', 'detect_edges', 'extract_contours', 'filter_contours',
+                      'detect_circles', 'roundness', 'total'):
+            self.assertIn(stage, record['seconds'])
+        self.assertNotIn('render', record['seconds'])
+        self.assertEqual(record['counts']['circles'], [2])
+        self.assertEqual(len(record['counts']['contour_points']), 2)
+        self.assertEqual(len(record['counts']['min_zone_solver_work']), 2)
+
+        # Disabled instrumentation leaves nothing behind
+        self.assertIsNone(create_components()['metrics'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+import unittest
+import os
+import numpy as np
+import sys
+
+# Add the src directory to the path so we can import our modules
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from detection_circle.point_decimator import PointDecimator
+from detection_circle.roundness_calculator import RoundnessCalculator
+
+class TestPointDecimator(unittest.TestCase):
+    def setUp(self):
+        self.calculator = RoundnessCalculator()
+        self.decimator = PointDecimator(budget=0.05, roundness_calculator=self.calculator)
+        # A pixel contour of a lobed part, in contour order
+        theta = np.linspace(0, 2*np.pi, 1500, endpoint=False)
+        radius = 200 + 3 * np.cos(3 * theta) + np.random.default_rng(0).normal(0, 0.3, len(theta))
+        self.points = np.round(np.column_stack((400 + radius * np.cos(theta),
+                                                300 + radius * np.sin(theta))))
+
+    def test_select(self):
+        """Test that the hull vertices and the radial extremes are kept"""
+        kept = self.decimator.select(self.points)
+        self.assertLess(len(kept), len(self.points) // 3)
+        self.assertTrue(np.all(np.diff(kept) > 0))
+
+        center = self.calculator.least_squares_method(self.points)[0]
+        radii = np.hypot(*(self.points - center).T)
+        self.assertIn(np.argmax(radii), kept)
+        self.assertIn(np.argmin(radii), kept)
+        import cv2
+        hull = cv2.convexHull(self.points.astype(np.float32), returnPoints=False).ravel()
+        self.assertTrue(set(hull) <= set(kept))
+
+    def test_measure(self):
+        """Test that decimated measurements stay within the bound they report"""
+        measurements, bounds = self.decimator.measure(self.points, 'all')
+        expected = self.calculator.measure(self.points, 'all')
+        self.assertEqual(set(bounds), set(expected))
+        self.assertLess(self.decimator.stats['kept'], len(self.points))
+
+        for method in ('min_zone', 'min_circumscribed', 'least_squares'):
+            self.assertLessEqual(bounds[method], self.decimator.budget)
+            error = measurements[method][2] - expected[method][2]
+            # cv2 computes the circumscribed circle in single precision
+            self.assertGreaterEqual(error, -1e-4)
+            self.assertLessEqual(error, bounds[method] + 1e-4)
+
+        # The circles of the decimated methods hold all points
+        for method in ('min_zone', 'min_circumscribed', 'max_inscribed'):
+            inner, outer, roundness = measurements[method]
+            radii = np.hypot(self.points[:, 0] - inner[0], self.points[:, 1] - inner[1])
+            self.assertGreaterEqual(np.min(radii), inner[2] - 1e-9)
+            self.assertLessEqual(np.max(radii), outer[2] + 1e-9)
+
+    def test_small_inputs(self):
+        """Test that tiny point sets are measured as they are"""
+        points = np.array([[0, 0], [10, 0], [5, 8]], dtype=np.float64)
+        measurements, bounds = self.decimator.measure(points, 'least_squares')
+        self.assertEqual(bounds, {'least_squares': 0.0})
+        with self.assertRaises(ValueError):
+            self.decimator.measure(points, 'unknown')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+import unittest
+import os
+import numpy as np
+import cv2
+import sys
+
+# Add the src directory to the path so we can import our modules
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from detection_circle.pyramid_detector import PyramidDetector
+from detection_circle.image_processor import ImageProcessor
+from detection_circle.contour_processor import ContourProcessor
+from detection_circle.circle_detector import CircleDetector
+from detection_circle.roundness_calculator import RoundnessCalculator
+
+class TestPyramidDetector(unittest.TestCase):
+    def setUp(self):
+        self.pyramid_detector = PyramidDetector(levels=2, tolerance=1e-9)
+        self.image_processor = ImageProcessor()
+        self.contour_processor = ContourProcessor()
+        self.circle_detector = CircleDetector()
+        self.roundness_calculator = RoundnessCalculator()
+        # Create a large plate image with a few sparse, slightly out-of-round parts
+        self.image = np.full((2000, 2400, 3), 40, dtype=np.uint8)
+        for k in range(8):
+            center = (300 + (k % 4) * 580, 500 + (k // 4) * 1000)
+            axes = (60 + 5 * k, 60 + 5 * k - k % 3)
+            cv2.ellipse(self.image, center, axes, 15 * k, 0, 360, (200, 200, 200), -1)
+            if k % 2 == 0:
+                cv2.circle(self.image, center, 20, (40, 40, 40), -1)
+
+    def measure(self, detection):
+        points = self.contour_processor.single_line_processing(detection.contour)
+        return self.roundness_calculator.measure(points, 'min_zone')['min_zone'][2]
+
+    def test_detect(self):
+        """Test that pyramid detection matches full-frame detection"""
+        detections = self.pyramid_detector.detect(self.image)
+
+        processed_image = self.image_processor.preprocess(self.image)
+        edges = self.image_processor.detect_edges(processed_image)
+        contours = self.contour_processor.filter_contours(self.image_processor.extract_contours(edges))
+        expected = self.circle_detector.detect(contours)
+
+        key = lambda detections: sorted(tuple(d.contour.reshape(-1).tolist()) for d in detections)
+        self.assertEqual(len(detections), 8)
+        self.assertEqual(key(detections), key(expected))
+
+        # Only the regions around the parts are processed at full resolution
+        self.assertLess(self.pyramid_detector.stats['full_res_fraction'], 0.3)
+
+    def test_validate(self):
+        """Test that roundness stays within the tolerance of full-frame processing"""
+        detections = self.pyramid_detector.detect(self.image)
+        stats = dict(self.pyramid_detector.stats)
+        check = self.pyramid_detector.validate(self.image, detections, self.measure)
+
+        self.assertEqual(check['matched'], 8)
+        self.assertEqual(check['missed'], 0)
+        self.assertTrue(check['within_tolerance'])
+        # The detections are checked as given, without detecting again
+        self.assertEqual(self.pyramid_detector.stats, stats)
+        check = self.pyramid_detector.validate(self.image, detections[1:], self.measure)
+        self.assertEqual(check['missed'], 1)
+        self.assertFalse(check['within_tolerance'])
+
+        # Against a full frame filtered with the same size limits
+        detections = self.pyramid_detector.detect(self.image, None, 400, 200)
+        check = self.pyramid_detector.validate(self.image, detections, self.measure, 400, 200)
+        self.assertEqual(check['matched'], len(detections))
+        self.assertTrue(check['within_tolerance'])
+
+    def test_full_frame_fallback(self):
+        """Test that the full frame is processed when the candidates cover most of it"""
+        detector = PyramidDetector(levels=2, max_fraction=0.01)
+        detections = detector.detect(self.image)
+
+        self.assertEqual(len(detections), 8)
+        self.assertEqual(detector.stats['full_res_fraction'], 1.0)
+
+if __name__ == '__main__':
+    unittest.main()
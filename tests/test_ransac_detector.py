@@ -0,0 +1,97 @@
+import unittest
+import os
+import numpy as np
+import cv2
+import sys
+
+# Add the src directory to the path so we can import our modules
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from detection_circle.ransac_detector import RansacCircleDetector
+from detection_circle.circle_detector import CircleDetector
+from detection_circle.image_processor import ImageProcessor
+from detection_circle.contour_processor import ContourProcessor
+
+class TestRansacCircleDetector(unittest.TestCase):
+    def setUp(self):
+        self.detector = RansacCircleDetector()
+        self.image_processor = ImageProcessor()
+        self.contour_processor = ContourProcessor()
+
+    def contours(self, image, min_circularity):
+        edges = self.image_processor.detect_edges(self.image_processor.preprocess(image))
+        contours = self.image_processor.extract_contours(edges)
+        return self.contour_processor.filter_contours(contours, 100, 100, min_circularity)
+
+    def test_touching_parts(self):
+        """Test that two touching parts merged into one contour are both found"""
+        image = np.full((300, 460, 3), 40, dtype=np.uint8)
+        cv2.circle(image, (130, 150), 100, (200, 200, 200), -1)
+        cv2.circle(image, (320, 150), 90, (200, 200, 200), -1)
+
+        self.assertEqual(CircleDetector().detect(self.contours(image, 0.7)), [])
+        detections = self.detector.detect(self.contours(image, self.detector.CONTOUR_CIRCULARITY))
+
+        self.assertEqual(len(detections), 2)
+        circles = sorted(detection.circle for detection in detections)
+        for (center_x, center_y, radius), expected in zip(circles, [(130, 150, 100), (320, 150, 90)]):
+            self.assertAlmostEqual(center_x, expected[0], delta=2)
+            self.assertAlmostEqual(center_y, expected[1], delta=2)
+            self.assertAlmostEqual(radius, expected[2], delta=2)
+        # Each detection keeps only the points of its own part
+        for detection in detections:
+            center_x, center_y, radius = detection.circle
+            distances = np.hypot(*(detection.contour.reshape(-1, 2) - (center_x, center_y)).T)
+            self.assertLess(np.max(np.abs(distances - radius)), 2.5)
+
+    def test_fit_contour(self):
+        """Test that an arc with outliers is fitted and scattered points are rejected"""
+        rng = np.random.default_rng(1)
+        theta = np.linspace(0, 1.5 * np.pi, 400)
+        arc = np.column_stack((200 + 80 * np.cos(theta), 150 + 80 * np.sin(theta)))
+        arc += rng.normal(0, 0.5, arc.shape)
+        outliers = rng.uniform(50, 350, (150, 2))
+        points = np.concatenate((arc, outliers))
+
+        circles = self.detector.fit_contour(points)
+        self.assertEqual(len(circles), 1)
+        (center_x, center_y, radius), inliers = circles[0]
+        self.assertAlmostEqual(center_x, 200, delta=1)
+        self.assertAlmostEqual(center_y, 150, delta=1)
+        self.assertAlmostEqual(radius, 80, delta=1)
+        self.assertGreater(np.count_nonzero(inliers[:400]), 380)
+
+        self.assertEqual(self.detector.fit_contour(outliers), [])
+
+    def test_runs_wrap_around(self):
+        """Test that an inlier run crossing the start of the closed contour is kept whole"""
+        mask = np.zeros(40, dtype=bool)
+        mask[:5] = True
+        mask[-5:] = True
+        mask[20:23] = True
+        kept = self.detector._long_runs(mask)
+        expected = mask.copy()
+        expected[20:23] = False
+        np.testing.assert_array_equal(kept, expected)
+
+        # Shorter than min_run even when joined
+        mask[:] = False
+        mask[:3] = True
+        mask[-3:] = True
+        self.assertFalse(np.any(self.detector._long_runs(mask)))
+        self.assertTrue(np.all(self.detector._long_runs(np.ones(10, dtype=bool))))
+
+    def test_circular_contours(self):
+        """Test that contours passing the circularity test are fitted as before"""
+        image = np.full((300, 400, 3), 40, dtype=np.uint8)
+        cv2.circle(image, (120, 150), 60, (200, 200, 200), -1)
+        cv2.circle(image, (290, 150), 50, (200, 200, 200), -1)
+        contours = self.contours(image, 0.7)
+
+        expected = CircleDetector().detect(contours)
+        detections = self.detector.detect(contours)
+        self.assertEqual([d.circle for d in detections], [d.circle for d in expected])
+        self.assertTrue(all(d.contour is e.contour for d, e in zip(detections, expected)))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,11 +2,12 @@ import unittest
 import os
 import numpy as np
 import sys
+from unittest import mock
 
 # Add the src directory to the path so we can import our modules
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
 
-from roundness_calculator import RoundnessCalculator
+from detection_circle.roundness_calculator import RoundnessCalculator
 
 class TestRoundnessCalculator(unittest.TestCase):
     def setUp(self):
@@ -48,6 +49,30 @@ class TestRoundnessCalculator(unittest.TestCase):
         # Note: The actual value may vary based on the optimization algorithm
         self.assertTrue(roundness > 0)
         self.assertTrue(roundness < 10.0)  # A reasonable upper bound
+
+        # The exact solver can never be worse than the iterative optimizer
+        _, _, optimizer_roundness = self.calculator.min_zone_method(points, solver='nelder-mead')
+        self.assertTrue(roundness <= optimizer_roundness + 1e-9)
+
+    def test_min_zone_method_fallback(self):
+        """Test that degenerate points fall back to the iterative optimizer"""
+        points = np.array([[0.0, 0.0], [1.0, 1.0], [2.0, 2.0]])
+
+        inner_circle, outer_circle, roundness = self.calculator.min_zone_method(points)
+
+        self.assertTrue(isinstance(inner_circle, tuple))
+        self.assertTrue(roundness >= 0)
+
+        with self.assertRaises(ValueError):
+            self.calculator.min_zone_method(points, solver='unknown')
+
+    def test_min_zone_method_sparse_profile(self):
+        """Test that sparse profiles with three outer sites are solved by every method"""
+        points = np.array([[0, 0], [100, 0], [50, 90], [50, 30], [45, 35], [55, 32]], dtype=np.float64)
+        inner_circle, outer_circle, roundness = self.calculator.min_zone_method(points)
+        self.assertAlmostEqual(roundness, outer_circle[2] - inner_circle[2])
+        results = self.calculator.evaluate_all(points)
+        self.assertAlmostEqual(results['min_zone'][2], roundness, places=9)
         
     def test_least_squares_method(self):
         """Test that least squares method works correctly"""
@@ -155,6 +180,108 @@ class TestRoundnessCalculator(unittest.TestCase):
         self.assertTrue(isinstance(roundness, float))
         # The roundness should be positive
         self.assertTrue(roundness > 0)
+
+        # The exact solver can never find a smaller inscribed circle than the optimizer
+        _, optimizer_radius, _, _ = self.calculator.max_inscribed_method(points, solver='nelder-mead')
+        self.assertTrue(radius >= optimizer_radius - 1e-9)
+
+    def test_evaluate_all(self):
+        """Test that evaluating all methods at once matches the individual methods"""
+        # Create integer contour points around a noisy circle
+        rng = np.random.default_rng(0)
+        theta = np.sort(rng.uniform(0, 2*np.pi, 200))
+        radius = 50 + rng.normal(0, 1, len(theta))
+        points = np.round(np.column_stack((100 + radius * np.cos(theta), 100 + radius * np.sin(theta))))
+
+        results = self.calculator.evaluate_all(points)
+
+        self.assertEqual(set(results), {'min_zone', 'least_squares', 'min_circumscribed', 'max_inscribed'})
+        for inner_circle, outer_circle, roundness in results.values():
+            self.assertAlmostEqual(outer_circle[2] - inner_circle[2], roundness, places=9)
+
+        self.assertAlmostEqual(results['min_zone'][2], self.calculator.min_zone_method(points)[2], places=6)
+        self.assertAlmostEqual(results['least_squares'][2], self.calculator.least_squares_method(points)[2], places=6)
+        self.assertAlmostEqual(results['min_circumscribed'][2], self.calculator.min_circumscribed_method(points)[3], places=3)
+        self.assertAlmostEqual(results['max_inscribed'][2], self.calculator.max_inscribed_method(points)[3], places=6)
+
+        # A failed least squares fit falls back to the enclosing circle center, as least_squares_method() does
+        with mock.patch('numpy.linalg.lstsq', side_effect=np.linalg.LinAlgError):
+            (center_x, center_y, _), _, roundness = self.calculator.evaluate_all(points)['least_squares']
+            expected_center, _, expected_roundness = self.calculator.least_squares_method(points)
+        self.assertAlmostEqual(center_x, expected_center[0], places=4)
+        self.assertAlmostEqual(center_y, expected_center[1], places=4)
+        self.assertAlmostEqual(roundness, expected_roundness, places=4)
+        
+    def test_measure_batch(self):
+        """Test that measuring a batch of contours matches measuring each contour"""
+        rng = np.random.default_rng(1)
+        contours = []
+        for k in range(4):
+            theta = np.sort(rng.uniform(0, 2*np.pi, 80 + 10 * k))
+            radius = 40 + 5 * k + rng.normal(0, 1, len(theta))
+            points = np.column_stack((100 + radius * np.cos(theta), 90 + radius * np.sin(theta)))
+            contours.append(np.round(points).astype(np.int32).reshape(-1, 1, 2))
+        
+        for method in ('least_squares', 'min_circumscribed', 'all'):
+            results = self.calculator.measure_batch(contours, method)
+            self.assertEqual(len(results), len(contours))
+            for contour, result in zip(contours, results):
+                expected = self.calculator.measure(contour.reshape(-1, 2).astype(np.float64), method)
+                self.assertEqual(set(result), set(expected))
+                for key in expected:
+                    self.assertAlmostEqual(result[key][2], expected[key][2], places=6)
+                    np.testing.assert_allclose(result[key][0], expected[key][0], atol=1e-6)
+        
+    def test_bootstrap(self):
+        """Test that bootstrap intervals come from batched solvers matching the single methods"""
+        rng = np.random.default_rng(2)
+        theta = np.sort(rng.uniform(0, 2*np.pi, 120))
+        radius = 50 + rng.normal(0, 0.8, len(theta))
+        points = np.column_stack((200 + radius * np.cos(theta), 150 + radius * np.sin(theta)))
+        
+        results = self.calculator.bootstrap(points, resamples=300, seed=3)
+        self.assertEqual(set(results), {'least_squares', 'min_circumscribed'})
+        self.assertAlmostEqual(results['least_squares']['value'],
+                               self.calculator.least_squares_method(points)[2], places=6)
+        self.assertEqual(results['min_circumscribed']['value'],
+                         self.calculator.min_circumscribed_method(points)[3])
+        integer_points = np.round(points).astype(np.int32)
+        integer_results = self.calculator.bootstrap(integer_points, resamples=10)
+        self.assertEqual(integer_results['min_circumscribed']['value'],
+                         self.calculator.min_circumscribed_method(integer_points)[3])
+        self.assertAlmostEqual(integer_results['least_squares']['value'],
+                               self.calculator.least_squares_method(integer_points.astype(np.float64))[2],
+                               places=6)
+        for result in results.values():
+            low, high = result['interval']
+            self.assertLess(low, high)
+            self.assertTrue(low <= result['mean'] <= high)
+            self.assertGreater(result['std'], 0)
+        
+        # Reproducible with a seed, and the classical resampling mode
+        self.assertEqual(results, self.calculator.bootstrap(points, resamples=300, seed=3))
+        resampled = self.calculator.bootstrap(points, methods=('least_squares',), resamples=100, mode='resample')
+        self.assertGreater(resampled['least_squares']['std'], 0)
+        # Resamples of three points often repeat one point, a singular system
+        degenerate = self.calculator.bootstrap(points[:3], resamples=50, mode='resample')
+        self.assertTrue(all(np.isfinite(result['mean']) for result in degenerate.values()))
+        
+        with self.assertRaises(ValueError):
+            self.calculator.bootstrap(points, methods=('min_zone',))
+        with self.assertRaises(ValueError):
+            self.calculator.bootstrap(points, mode='jackknife')
+    
+    def test_enclosing_circles(self):
+        """Test that the batched enclosing circles equal cv2.minEnclosingCircle"""
+        import cv2
+        rng = np.random.default_rng(4)
+        batch = rng.normal(0, 30, (50, 40, 2))
+        batch[0, :, 1] = 0  # collinear points
+        centers, radii = self.calculator._enclosing_circles(batch)
+        for points, center, radius in zip(batch, centers, radii):
+            (x, y), expected = cv2.minEnclosingCircle(points.astype(np.float32))
+            self.assertAlmostEqual(radius, expected, delta=1e-3)
+            np.testing.assert_allclose(center, (x, y), atol=1e-2)
         
 if __name__ == '__main__':
     unittest.main()
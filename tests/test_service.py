@@ -0,0 +1,114 @@
+import unittest
+import os
+import json
+import shutil
+import asyncio
+import tempfile
+import numpy as np
+import cv2
+import sys
+
+# Add the src directory to the path so we can import our modules
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from detection_circle.service import InspectionService
+
+async def http_request(address, verb, target, body=b'', content_type='application/octet-stream'):
+    """Send one HTTP request and return the status and the decoded JSON response."""
+    reader, writer = await asyncio.open_connection(*address)
+    writer.write(f"{verb} {target} HTTP/1.1\r\nContent-Type: {content_type}\r\n"
+                 f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode() + body)
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    head, _, body = response.partition(b"\r\n\r\n")
+    return int(head.split()[1]), json.loads(body)
+
+class TestInspectionService(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        # Create a test image with two circles
+        image = np.full((300, 400, 3), 40, dtype=np.uint8)
+        cv2.circle(image, (120, 150), 60, (200, 200, 200), -1)
+        cv2.circle(image, (290, 150), 50, (200, 200, 200), -1)
+        self.image_path = os.path.join(self.temp_dir, 'plate.png')
+        cv2.imwrite(self.image_path, image)
+        with open(self.image_path, 'rb') as f:
+            self.image_data = f.read()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def run_service(self, test, **kwargs):
+        """Run a test coroutine against a started service."""
+        async def run():
+            service = InspectionService(**kwargs)
+            await service.start(port=0)
+            try:
+                await test(service, service.addresses[0][:2])
+            finally:
+                await service.close()
+        asyncio.run(run())
+
+    def test_inspect(self):
+        """Test image bytes and path requests over HTTP"""
+        async def test(service, address):
+            status, response = await http_request(address, 'POST', '/inspect?method=all', self.image_data)
+            self.assertEqual(status, 200)
+            self.assertEqual(len(response['results']), 8)
+
+            status, response = await http_request(address, 'POST', '/inspect',
+                                                  json.dumps({'path': self.image_path}).encode(),
+                                                  'application/json')
+            self.assertEqual(status, 200)
+            self.assertEqual([result['method'] for result in response['results']], ['min_zone'] * 2)
+
+            status, response = await http_request(address, 'POST', '/inspect', b'not an image')
+            self.assertEqual(status, 422)
+            status, _ = await http_request(address, 'GET', '/missing')
+            self.assertEqual(status, 404)
+
+            status, health = await http_request(address, 'GET', '/health')
+            self.assertEqual(health['requests'], 3)
+            self.assertEqual(health['errors'], 1)
+            self.assertIn('latency_p99_ms', health)
+        self.run_service(test)
+
+    def test_concurrent_requests(self):
+        """Test that queued requests give the same results and are answered one by one"""
+        async def test(service, address):
+            queued = []
+
+            async def inspect():
+                response = await service.inspect({'data': self.image_data})
+                queued.append(service.queue.qsize())
+                return response
+
+            responses = await asyncio.gather(*(inspect() for _ in range(6)))
+            self.assertEqual(len({json.dumps(response['results']) for response in responses}), 1)
+            # The first request is answered while later ones still wait
+            self.assertGreater(queued[0], 0)
+        self.run_service(test)
+
+    def test_malformed_content_length(self):
+        """Test that a malformed Content-Length header is answered with 400"""
+        async def test(service, address):
+            for length in ('abc', '-5'):
+                reader, writer = await asyncio.open_connection(*address)
+                writer.write(f"POST /inspect HTTP/1.1\r\nContent-Length: {length}\r\n\r\n".encode())
+                await writer.drain()
+                response = await reader.read()
+                writer.close()
+                self.assertTrue(response.startswith(b"HTTP/1.1 400 "))
+        self.run_service(test)
+
+    def test_backpressure(self):
+        """Test that requests beyond the in-flight limit are rejected with 503"""
+        async def test(service, address):
+            responses = await asyncio.gather(*(service.inspect({'path': self.image_path}) for _ in range(3)))
+            self.assertEqual(sorted('error' in response for response in responses), [False, False, True])
+            self.assertEqual(service.stats['rejected'], 1)
+        self.run_service(test, max_in_flight=2)
+
+if __name__ == '__main__':
+    unittest.main()
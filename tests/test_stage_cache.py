@@ -0,0 +1,130 @@
+import unittest
+import os
+import json
+import shutil
+import tempfile
+import time
+import numpy as np
+import cv2
+import sys
+
+# Add the src directory to the path so we can import our modules
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from detection_circle.stage_cache import StageCache
+from detection_circle.main import create_components, process_image, stage_params
+from detection_circle.ransac_detector import RansacCircleDetector
+
+class TestStageCache(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.cache_dir = os.path.join(self.temp_dir, 'cache')
+        self.cache = StageCache(self.cache_dir)
+        # Create a test image with two circles
+        self.image = np.full((300, 400, 3), 40, dtype=np.uint8)
+        cv2.circle(self.image, (120, 150), 60, (200, 200, 200), -1)
+        cv2.circle(self.image, (290, 150), 50, (200, 200, 200), -1)
+        self.image_path = os.path.join(self.temp_dir, 'plate.png')
+        cv2.imwrite(self.image_path, self.image)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_stage_keys(self):
+        """Test that a parameter change invalidates only its own and later stages"""
+        image_key = self.cache.image_key(self.image_path)
+        params = {'edges': {'canny': [50, 150]}, 'contours': {}, 'detections': {'circularity': 0.8}}
+        keys = self.cache.stage_keys(image_key, params)
+        changed = self.cache.stage_keys(image_key, dict(params, detections={'circularity': 0.9}))
+
+        self.assertEqual(keys['edges'], changed['edges'])
+        self.assertEqual(keys['contours'], changed['contours'])
+        self.assertNotEqual(keys['detections'], changed['detections'])
+
+    def test_processor_params(self):
+        """Test that the keys follow the constants of the processors"""
+        components = create_components()
+        params = stage_params(components)
+        components['image_processor'].CANNY_THRESHOLDS = (40, 120)
+        changed = stage_params(components)
+        self.assertEqual(changed['edges']['canny'], [40, 120])
+        self.assertNotEqual(changed['edges'], params['edges'])
+        components['circle_detector'].CIRCULARITY = 0.85
+        self.assertEqual(stage_params(components)['detections']['circularity'], 0.85)
+        json.dumps(params)
+
+    def test_ransac_params(self):
+        """Test that every RANSAC parameter is part of the detections key"""
+        components = create_components({'detector': 'ransac'})
+        params = stage_params(components)
+        for name, value in (('batch_size', 32), ('min_run', 4), ('seed', 1)):
+            detector = RansacCircleDetector(**{name: value})
+            changed = stage_params(dict(components, circle_detector=detector))
+            self.assertEqual(changed['edges'], params['edges'])
+            self.assertNotEqual(changed['detections'], params['detections'])
+
+    def test_round_trip(self):
+        """Test that stage outputs are restored exactly"""
+        edges = np.zeros((31, 17), dtype=np.uint8)
+        edges[5:9, 3:12] = 255
+        self.cache.put('edges', 'a', edges)
+        self.assertTrue(np.array_equal(self.cache.get('edges', 'a'), edges))
+
+        contours = [np.array([[[1, 2]], [[3, 4]], [[5, 7]]], dtype=np.int32),
+                    np.array([[[9, 9]]], dtype=np.int32)]
+        self.cache.put('contours', 'b', contours)
+        restored = self.cache.get('contours', 'b')
+        self.assertEqual(len(restored), 2)
+        for contour, expected in zip(restored, contours):
+            self.assertTrue(np.array_equal(contour, expected))
+
+        self.assertIsNone(self.cache.get('detections', 'c'))
+        stats = self.cache.pop_stats()
+        self.assertEqual(stats['edges'], {'hits': 1, 'misses': 0})
+        self.assertEqual(stats['detections'], {'hits': 0, 'misses': 1})
+
+    def test_evict(self):
+        """Test that the least recently used entries are evicted"""
+        edges = np.random.default_rng(0).integers(0, 2, (200, 200), dtype=np.uint8) * 255
+        for key in ('a', 'b', 'c'):
+            self.cache.put('edges', key, edges)
+            time.sleep(0.01)
+        entry_size = os.path.getsize(os.path.join(self.cache_dir, 'a.npz'))
+
+        # Using 'a' makes 'b' the least recently used entry
+        self.assertIsNotNone(self.cache.get('edges', 'a'))
+        self.cache.max_bytes = 3 * entry_size
+        self.cache.put('edges', 'd', edges)
+
+        self.assertIsNone(self.cache.get('edges', 'b'))
+        for key in ('a', 'c', 'd'):
+            self.assertIsNotNone(self.cache.get('edges', key))
+        self.assertEqual(self.cache.stats['evictions'], 1)
+
+    def test_process_image(self):
+        """Test that a cached re-run restarts from the detections and matches"""
+        components = create_components({'cache_dir': self.cache_dir})
+        output_dir = os.path.join(self.temp_dir, 'output')
+        first = process_image(self.image_path, 'min_zone', output_dir, False, components)
+        self.assertEqual(components['stage_cache'].pop_stats()['detections']['misses'], 1)
+
+        second = process_image(self.image_path, 'all', output_dir, False, components)
+        self.assertEqual(components['image_writer'].close(), [])
+        stats = components['stage_cache'].pop_stats()
+        self.assertEqual(stats['detections']['hits'], 1)
+        self.assertEqual(stats['contours'], {'hits': 0, 'misses': 0})
+
+        self.assertEqual(len(first), 2)
+        min_zone = [r for r in second if r['method'] == 'min_zone']
+        self.assertEqual([r['roundness'] for r in first], [r['roundness'] for r in min_zone])
+        self.assertEqual([r['center'] for r in first], [r['center'] for r in min_zone])
+
+        # Nothing is drawn, so the cached edges are not loaded
+        third = process_image(self.image_path, 'min_zone', output_dir, False, components, 'none')
+        stats = components['stage_cache'].pop_stats()
+        self.assertEqual(stats['detections']['hits'], 1)
+        self.assertEqual(stats['edges'], {'hits': 0, 'misses': 0})
+        self.assertEqual([r['roundness'] for r in third], [r['roundness'] for r in first])
+
+if __name__ == '__main__':
+    unittest.main()
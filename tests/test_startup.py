@@ -0,0 +1,51 @@
+import unittest
+import os
+import subprocess
+import sys
+
+# Add the src directory to the path so we can import our modules
+SRC_DIR = os.path.join(os.path.dirname(__file__), '..', 'src')
+sys.path.append(SRC_DIR)
+
+# Import time allowed for main on top of NumPy and OpenCV, in seconds
+STARTUP_BUDGET = 0.15
+
+# Modules that only some code paths need
+LAZY_MODULES = ('matplotlib', 'numba', 'scipy')
+
+def import_time(statement):
+    """
+    Measure the time of an import statement in a fresh interpreter.
+    
+    Args:
+        statement (str): Import statement to time.
+        
+    Returns:
+        tuple: Import time in seconds and the names of the loaded modules.
+    """
+    code = ("import sys, time\n"
+            "start = time.perf_counter()\n"
+            f"{statement}\n"
+            "print(time.perf_counter() - start)\n"
+            "print(' '.join(sys.modules))\n")
+    output = subprocess.run([sys.executable, '-c', code], cwd=SRC_DIR, capture_output=True,
+                            text=True, check=True).stdout.splitlines()
+    return float(output[0]), set(output[1].split())
+
+class TestStartup(unittest.TestCase):
+    def test_lazy_imports(self):
+        """Test that importing main does not load optional heavy dependencies"""
+        _, modules = import_time('import detection_circle.main')
+        for name in LAZY_MODULES:
+            self.assertNotIn(name, modules)
+            
+    def test_startup_budget(self):
+        """Test that main imports within the start-up budget"""
+        # Take the best of a few runs to reduce noise from other processes
+        base = min(import_time('import numpy, cv2')[0] for _ in range(3))
+        total = min(import_time('import detection_circle.main')[0] for _ in range(3))
+        self.assertLess(total - base, STARTUP_BUDGET,
+                        f"import main took {total:.3f} s, {total - base:.3f} s more than NumPy and OpenCV")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+import unittest
+import os
+import shutil
+import tempfile
+import numpy as np
+import cv2
+import sys
+
+# Add the src directory to the path so we can import our modules
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from detection_circle.stream_pipeline import FrameSource, StreamPipeline
+
+class TestStreamPipeline(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.image = cv2.imread(os.path.join(os.path.dirname(__file__), '..', 'dataset', '0.jpg'))
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_run(self):
+        """Test that frames flow through all stages in order"""
+        frames = [(i, self.image) for i in range(6)]
+        # A frame that fails in the edge stage must not stop the stream
+        frames.insert(3, ('bad', np.zeros((10, 10, 5), dtype=np.uint8)))
+        results = []
+
+        pipeline = StreamPipeline(queue_size=1)
+        report = pipeline.run(frames, results.append)
+
+        self.assertEqual([r['frame'] for r in results], [0, 1, 2, 'bad', 3, 4, 5])
+        self.assertIn('error', results[3])
+        self.assertEqual(report['frames'], 7)
+        self.assertEqual(set(report['stages']), set(StreamPipeline.STAGES))
+        for stats in report['stages'].values():
+            self.assertTrue(stats['max_depth'] <= 1)
+        # Identical frames give identical measurements
+        self.assertEqual(results[0]['results'], results[1]['results'])
+
+    def test_run_tracked(self):
+        """Test that tracking reuses the measurements of unchanged frames"""
+        image = cv2.imread(os.path.join(os.path.dirname(__file__), '..', 'dataset', '9.jpg'))
+        frames = [(i, image) for i in range(3)]
+        results = []
+
+        untracked = []
+        StreamPipeline().run(frames, untracked.append)
+        report = StreamPipeline(track=True).run(frames, results.append)
+
+        tracking = report['tracking']
+        self.assertEqual(tracking['frames'], 3)
+        self.assertGreater(tracking['cold'], 0)
+        self.assertEqual(tracking['reused'], 2 * tracking['cold'])
+        self.assertEqual(tracking['evaluations_saved'], 2 * tracking['evaluations'])
+        for result, expected in zip(results, untracked):
+            self.assertEqual([r['roundness'] for r in result['results']], [r['roundness'] for r in expected['results']])
+            self.assertTrue(all('track_id' in r for r in result['results']))
+
+    def test_frame_source_directory(self):
+        """Test that a directory source yields its images in name order"""
+        for name in ['b.jpg', 'a.jpg']:
+            cv2.imwrite(os.path.join(self.temp_dir, name), self.image)
+        with open(os.path.join(self.temp_dir, 'broken.jpg'), 'wb') as f:
+            f.write(b'not an image')
+
+        source = FrameSource(self.temp_dir, poll_interval=0.01, idle_timeout=0.05)
+        frames = list(source)
+
+        self.assertEqual([frame_id for frame_id, _ in frames], ['a.jpg', 'b.jpg'])
+
+    def test_frame_source_video(self):
+        """Test that a video source yields every frame"""
+        video_path = os.path.join(self.temp_dir, 'video.avi')
+        writer = cv2.VideoWriter(video_path, cv2.VideoWriter_fourcc(*'MJPG'), 5,
+                                 (self.image.shape[1], self.image.shape[0]))
+        if not writer.isOpened():
+            self.skipTest("No video encoder available")
+        for _ in range(3):
+            writer.write(self.image)
+        writer.release()
+
+        frames = list(FrameSource(video_path))
+
+        self.assertEqual([frame_id for frame_id, _ in frames], [0, 1, 2])
+        self.assertEqual(frames[0][1].shape, self.image.shape)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,50 @@
+import unittest
+import os
+import numpy as np
+import cv2
+import sys
+
+# Add the src directory to the path so we can import our modules
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from detection_circle.tiled_processor import TiledProcessor
+from detection_circle.image_processor import ImageProcessor
+
+class TestTiledProcessor(unittest.TestCase):
+    def setUp(self):
+        self.tiled_processor = TiledProcessor(tile_size=300, overlap=100, workers=2)
+        self.image_processor = ImageProcessor()
+        # Create a plate image with many small parts, some with holes
+        rng = np.random.default_rng(0)
+        self.image = np.full((900, 1200, 3), 40, dtype=np.uint8)
+        for k in range(80):
+            center = (int(rng.uniform(0, 1200)), int(rng.uniform(0, 900)))
+            radius = int(rng.uniform(8, 40))
+            cv2.circle(self.image, center, radius, (200, 200, 200), -1)
+            if k % 3 == 0:
+                cv2.circle(self.image, center, radius // 2, (40, 40, 40), -1)
+        
+    def test_tiles(self):
+        """Test that tile cores cover the image exactly once"""
+        coverage = np.zeros(self.image.shape[:2], dtype=np.int32)
+        for core, extended in self.tiled_processor.tiles(self.image.shape):
+            coverage[core[1]:core[3], core[0]:core[2]] += 1
+            self.assertTrue(extended[0] <= core[0] and extended[2] >= core[2])
+        
+        self.assertTrue(np.all(coverage == 1))
+        
+    def test_extract_contours(self):
+        """Test that tiled extraction matches full-frame extraction"""
+        edges = np.zeros(self.image.shape[:2], dtype=np.uint8)
+        tiled = self.tiled_processor.extract_contours(self.image, edges)
+        
+        processed_image = self.image_processor.preprocess(self.image)
+        full_edges = self.image_processor.detect_edges(processed_image)
+        full = self.image_processor.extract_contours(full_edges)
+        
+        key = lambda contours: sorted(tuple(c.reshape(-1).tolist()) for c in contours)
+        self.assertEqual(key(tiled), key(full))
+        self.assertTrue(np.array_equal(edges, full_edges))
+        
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,51 @@
+import unittest
+import os
+import numpy as np
+import cv2
+import sys
+
+# Add the src directory to the path so we can import our modules
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from detection_circle.visualizer import Visualizer
+
+class TestVisualizer(unittest.TestCase):
+    def setUp(self):
+        self.visualizer = Visualizer(preview_scale=0.5)
+        # Create a test image with two parts
+        self.image = np.full((400, 600, 3), 40, dtype=np.uint8)
+        self.circles = [(150.0, 200.0, 80.0), (450.0, 200.0, 60.0)]
+        for center_x, center_y, radius in self.circles:
+            cv2.circle(self.image, (int(center_x), int(center_y)), int(radius), (200, 200, 200), -1)
+        self.contours = [cv2.ellipse2Poly((int(x), int(y)), (int(r), int(r)), 0, 0, 360, 5).reshape(-1, 1, 2)
+                         for x, y, r in self.circles]
+        self.measurements = [((x, y, r - 2), (x, y, r + 2), f"#{i} min_zone: 4.00")
+                             for i, (x, y, r) in enumerate(self.circles)]
+
+    def test_render_overlay(self):
+        """Test that everything is drawn onto one copy of the image"""
+        original = self.image.copy()
+        canvas = self.visualizer.render_overlay(self.image, self.contours, self.circles, self.measurements)
+
+        self.assertTrue(np.array_equal(self.image, original))
+        self.assertEqual(canvas.shape, self.image.shape)
+        # The outer roundness circle of the second part is drawn in red
+        self.assertTrue(np.array_equal(canvas[200, 450 + 62], [0, 0, 255]))
+
+        # Previews are downscaled before drawing, and grayscale input is accepted
+        gray = cv2.cvtColor(self.image, cv2.COLOR_BGR2GRAY)
+        preview = self.visualizer.render_overlay(gray, self.contours, self.circles, self.measurements,
+                                                 self.visualizer.preview_scale)
+        self.assertEqual(preview.shape, (200, 300, 3))
+
+    def test_thumbnails(self):
+        """Test that thumbnails are views around each part"""
+        canvas = self.visualizer.render_overlay(self.image, self.contours, self.circles, self.measurements)
+        thumbnails = self.visualizer.thumbnails(canvas, self.circles)
+
+        self.assertEqual(len(thumbnails), 2)
+        self.assertEqual(thumbnails[0].shape[:2], (192, 192))
+        self.assertTrue(np.shares_memory(thumbnails[1], canvas))
+
+if __name__ == '__main__':
+    unittest.main()
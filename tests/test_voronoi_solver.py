@@ -0,0 +1,114 @@
+import unittest
+import os
+import numpy as np
+import sys
+from scipy.optimize import minimize
+
+# Add the src directory to the path so we can import our modules
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from detection_circle.voronoi_solver import VoronoiSolver
+
+class TestVoronoiSolver(unittest.TestCase):
+    def setUp(self):
+        self.solver = VoronoiSolver()
+        # Create a noisy, slightly lobed circular profile
+        rng = np.random.default_rng(0)
+        theta = np.sort(rng.uniform(0, 2*np.pi, 500))
+        radius = 50 + 2 * np.cos(3 * theta) + rng.normal(0, 0.5, len(theta))
+        self.points = np.column_stack((100 + radius * np.cos(theta), 100 + radius * np.sin(theta)))
+
+    def zone_width(self, center):
+        distances = np.sqrt((self.points[:, 0] - center[0])**2 + (self.points[:, 1] - center[1])**2)
+        return np.max(distances) - np.min(distances)
+
+    def test_min_zone(self):
+        """Test that the minimum zone annulus is optimal"""
+        center, inner_radius, outer_radius = self.solver.min_zone(self.points)
+
+        self.assertTrue(isinstance(center, tuple))
+        self.assertTrue(inner_radius < outer_radius)
+        self.assertAlmostEqual(outer_radius - inner_radius, self.zone_width(center), places=9)
+
+        # A tightly converged optimizer started at the solution cannot improve it
+        result = minimize(self.zone_width, np.array(center) + 0.5, method='Nelder-Mead',
+                          options={'xatol': 1e-10, 'fatol': 1e-12})
+        self.assertLessEqual(outer_radius - inner_radius, result.fun + 1e-9)
+
+    def test_min_zone_is_deterministic(self):
+        """Test that repeated runs give the same annulus"""
+        first = self.solver.min_zone(self.points)
+        second = self.solver.min_zone(self.points[::-1])
+
+        self.assertAlmostEqual(first[0][0], second[0][0], places=9)
+        self.assertAlmostEqual(first[0][1], second[0][1], places=9)
+        self.assertAlmostEqual(first[2] - first[1], second[2] - second[1], places=9)
+        self.assertTrue(self.solver.stats['candidates'] > 0)
+
+    def test_max_inscribed(self):
+        """Test that the maximum inscribed circle is optimal"""
+        center, inner_radius, outer_radius = self.solver.max_inscribed(self.points)
+
+        distances = np.sqrt((self.points[:, 0] - center[0])**2 + (self.points[:, 1] - center[1])**2)
+        self.assertAlmostEqual(inner_radius, np.min(distances), places=9)
+        self.assertAlmostEqual(outer_radius, np.max(distances), places=9)
+
+        # A tightly converged optimizer started at the solution cannot improve it
+        objective = lambda c: -np.min(np.sqrt((self.points[:, 0] - c[0])**2 + (self.points[:, 1] - c[1])**2))
+        result = minimize(objective, np.array(center) + 0.5, method='Nelder-Mead',
+                          options={'xatol': 1e-10, 'fatol': 1e-12})
+        self.assertGreaterEqual(inner_radius, -result.fun - 1e-9)
+
+        self.assertTrue(self.solver.stats['candidates'] > 0)
+        self.assertTrue(self.solver.stats['candidates'] <= self.solver.stats['vertices'])
+        self.assertTrue(self.solver.stats['elapsed'] >= 0)
+
+    def test_max_inscribed_concave(self):
+        """Test that the inscribed circle center stays inside a concave profile"""
+        # C-shaped profile: the largest empty circle overall would sit in the hollow middle
+        theta = np.linspace(0.3, 2*np.pi - 0.3, 200)
+        outer = np.column_stack((100 * np.cos(theta), 100 * np.sin(theta)))
+        inner = np.column_stack((60 * np.cos(theta[::-1]), 60 * np.sin(theta[::-1])))
+        points = np.vstack((outer, inner))
+
+        center, inner_radius, _ = self.solver.max_inscribed(points)
+
+        self.assertTrue(60 < np.hypot(center[0], center[1]) < 100)
+        self.assertAlmostEqual(inner_radius, 20, delta=0.1)
+
+    def test_min_zone_degenerate(self):
+        """Test that degenerate point sets are rejected"""
+        line = np.column_stack((np.arange(10), np.arange(10)))
+
+        with self.assertRaises(ValueError):
+            self.solver.min_zone(line)
+        with self.assertRaises(ValueError):
+            self.solver.min_zone(line[:3])
+
+    def test_min_zone_few_inner_sites(self):
+        """Test a sparse profile whose pruned cells keep too few nearest sites for a diagram"""
+        points = np.array([[692, 739], [670, 754], [661, 776], [663, 797], [682, 819], [704, 825],
+                           [702, 822], [745, 765], [744, 799], [733, 813], [715, 823], [747, 788],
+                           [744, 763], [738, 755], [693, 742], [702, 737], [709, 738]], dtype=np.float64)
+        self.points = points
+        center, inner_radius, outer_radius = self.solver.min_zone(points)
+
+        self.assertAlmostEqual(outer_radius - inner_radius, self.zone_width(center), places=9)
+        result = minimize(self.zone_width, np.array(center) + 0.5, method='Nelder-Mead',
+                          options={'xatol': 1e-10, 'fatol': 1e-12})
+        self.assertLessEqual(outer_radius - inner_radius, result.fun + 1e-9)
+
+    def test_min_zone_three_outer_sites(self):
+        """Test a profile whose pruned farthest-point diagram has three sites, too few for Qhull"""
+        points = np.array([[0, 0], [100, 0], [50, 90], [50, 30], [45, 35], [55, 32]], dtype=np.float64)
+        self.points = points
+        center, inner_radius, outer_radius = self.solver.min_zone(points)
+        self.assertEqual(self.solver.stats['outer_sites'], 3)
+
+        self.assertAlmostEqual(outer_radius - inner_radius, self.zone_width(center), places=9)
+        result = minimize(self.zone_width, np.array(center) + 0.5, method='Nelder-Mead',
+                          options={'xatol': 1e-10, 'fatol': 1e-12})
+        self.assertLessEqual(outer_radius - inner_radius, result.fun + 1e-9)
+
+if __name__ == '__main__':
+    unittest.main()